@@ -0,0 +1,83 @@
+"""
+Parse tree memory benchmark
+
+Compares the memory retained by the slide trees of a deck built from the slotted
+SlideElement against the original per-instance-dict element class, measured with
+tracemalloc, along with parse time.
+
+Usage:
+    python benchmarks/parse_memory.py [deck.html ...]
+"""
+
+import os
+import sys
+import time
+import tracemalloc
+from contextlib import contextmanager
+from typing import Any, Dict, List, Tuple
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, REPO_ROOT)
+
+from html_to_pptx.parsers import html_parser  # noqa: E402
+
+DEFAULT_DECKS = [os.path.join(REPO_ROOT, 'patterns', 'slide_patterns.html')]
+
+
+class LegacySlideElement:
+    """The element class before slotted nodes: a dict, attributes dict and children list per element"""
+
+    def __init__(self, element_type: str, content: str = "", attributes: Dict[str, Any] = None, **_):
+        self.type = element_type
+        self.content = content
+        self.attributes = attributes or {}
+        self.children = []
+        self.style = {}
+
+    def add_child(self, child: 'LegacySlideElement'):
+        self.children.append(child)
+
+
+@contextmanager
+def legacy_elements():
+    """Make the parser build LegacySlideElement trees"""
+    current = html_parser.SlideElement
+    html_parser.SlideElement = LegacySlideElement
+    try:
+        yield
+    finally:
+        html_parser.SlideElement = current
+
+
+def measure(html: str) -> Tuple[int, float]:
+    """Return the bytes retained by the parsed slides and the parse time in seconds"""
+    parser = html_parser.SlideHTMLParser()
+    tracemalloc.start()
+    try:
+        before = tracemalloc.get_traced_memory()[0]
+        started = time.perf_counter()
+        slides: List[Dict[str, Any]] = parser.parse(html)
+        seconds = time.perf_counter() - started
+        # Drop parser state that is not part of the result
+        parser.reset()
+        retained = tracemalloc.get_traced_memory()[0] - before
+    finally:
+        tracemalloc.stop()
+    del slides
+    return retained, seconds
+
+
+def main(paths: List[str]):
+    print(f"{'deck':40s} {'legacy KiB':>11s} {'slotted KiB':>12s} {'saved':>6s} {'legacy ms':>10s} {'slotted ms':>11s}")
+    for path in paths:
+        with open(path, encoding='utf-8') as f:
+            html = f.read()
+        with legacy_elements():
+            legacy, legacy_time = measure(html)
+        slotted, slotted_time = measure(html)
+        print(f"{os.path.basename(path)[:40]:40s} {legacy / 1024:11.0f} {slotted / 1024:12.0f} "
+              f"{1 - slotted / legacy:6.0%} {legacy_time * 1000:10.1f} {slotted_time * 1000:11.1f}")
+
+
+if __name__ == '__main__':
+    main(sys.argv[1:] or DEFAULT_DECKS)
@@ -0,0 +1,68 @@
+"""
+Parser backend throughput benchmark
+
+Parses each deck repeatedly with every installed parser backend and reports
+throughput in MB/s, with the speed-up of each backend over ``html.parser``.
+
+Usage:
+    python benchmarks/parser_throughput.py [--repeat N] [deck.html ...]
+"""
+
+import glob
+import os
+import sys
+import time
+from typing import Dict, List
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, REPO_ROOT)
+
+from html_to_pptx.parsers.backends import DEFAULT_BACKEND, available_backends, create_parser  # noqa: E402
+
+DEFAULT_DECKS = sorted(glob.glob(os.path.join(REPO_ROOT, 'pjt', '*', 'slides', '*.html')))
+
+
+def measure(html: str, backend: str, repeat: int = 5) -> float:
+    """Return the best parse time of a document in seconds over ``repeat`` runs"""
+    parser = create_parser(backend)
+    best = float('inf')
+    for _ in range(repeat):
+        started = time.perf_counter()
+        parser.parse(html)
+        best = min(best, time.perf_counter() - started)
+    return best
+
+
+def throughput(paths: List[str], repeat: int = 5) -> Dict[str, float]:
+    """Return the parse throughput of every installed backend over the decks, in MB/s"""
+    documents = []
+    for path in paths:
+        with open(path, encoding='utf-8') as f:
+            documents.append(f.read())
+    size = sum(len(html.encode('utf-8')) for html in documents)
+    results = {}
+    for backend, installed in available_backends().items():
+        if installed:
+            seconds = sum(measure(html, backend, repeat) for html in documents)
+            results[backend] = size / 1e6 / seconds
+    return results
+
+
+def main(argv: List[str]):
+    repeat = 5
+    if argv[:1] == ['--repeat']:
+        repeat, argv = int(argv[1]), argv[2:]
+    paths = argv or DEFAULT_DECKS
+    results = throughput(paths, repeat)
+    baseline = results[DEFAULT_BACKEND]
+    print(f"{len(paths)} decks, best of {repeat}")
+    print(f"{'backend':12s} {'MB/s':>8s} {'speed-up':>9s}")
+    for backend, rate in results.items():
+        print(f"{backend:12s} {rate:8.2f} {rate / baseline:8.2f}x")
+    missing = [backend for backend, installed in available_backends().items() if not installed]
+    if missing:
+        print(f"not installed: {', '.join(missing)}")
+
+
+if __name__ == '__main__':
+    main(sys.argv[1:])
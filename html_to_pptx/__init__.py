@@ -7,12 +7,32 @@ A comprehensive module for converting HTML presentations to PowerPoint (PPTX) fo
 __version__ = "1.0.0"
 __author__ = "HTML to PPTX Converter"
 
-from .core.converter import HTMLtoPPTXConverter
-from .parsers.html_parser import SlideHTMLParser
-from .builders.pptx_builder import PPTXBuilder
+# Public classes and their modules, imported on first access so that importing
+# the package (or running the CLI for --version or a daemon hand-off) stays cheap
+_LAZY_EXPORTS = {
+    "HTMLtoPPTXConverter": ".core.converter",
+    "ConversionError": ".core.converter",
+    "SlideHTMLParser": ".parsers.html_parser",
+    "PPTXBuilder": ".builders.pptx_builder",
+}
 
 __all__ = [
     "HTMLtoPPTXConverter",
+    "ConversionError",
     "SlideHTMLParser", 
     "PPTXBuilder"
-]
\ No newline at end of file
+]
+
+
+def __getattr__(name):
+    module = _LAZY_EXPORTS.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    from importlib import import_module
+    value = getattr(import_module(module, __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(_LAZY_EXPORTS))
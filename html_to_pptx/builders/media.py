@@ -0,0 +1,482 @@
+"""
+Media Module
+
+Resolves the images of parsed slides for embedding into packages. Images are
+identified by the SHA-256 of their content: each distinct image becomes a single
+``ppt/media`` part named after its digest, shared by the relationships of every
+slide that shows it, however many times the deck repeats it.
+
+Image sources may be blob handles, ``data:`` URIs or, when a base directory is
+given, local file paths (relative to it); without a base directory no local file
+is read. Images can optionally be downscaled to twice their rendered
+size; the results are filed in a persistent cache keyed by source digest and target
+size, so an image is resized once rather than once per deck.
+"""
+
+import hashlib
+import importlib.util
+import io
+import os
+import re
+import shutil
+import struct
+import tempfile
+import weakref
+from typing import Any, BinaryIO, Callable, Dict, Iterable, List, NamedTuple, Optional, Tuple
+from urllib.parse import unquote, urlparse
+from ..utils.blobs import BlobStore, is_blob_handle, parse_blob_handle
+
+# Pillow is needed for downscaling only, and imported on the first resize
+PIL_AVAILABLE = importlib.util.find_spec('PIL') is not None
+
+# CSS pixels are 1/96 inch
+EMU_PER_PX = 9525
+EMU_PER_PT = 12700
+
+# Slide size of native packages (16:9, 13.33 x 7.5 in)
+SLIDE_WIDTH = 12192000
+SLIDE_HEIGHT = 6858000
+
+# Images are kept at up to this multiple of their rendered pixel size
+RESIZE_SCALE = 2
+
+# Bump when the resizing output changes for the same input
+RESIZE_VERSION = 1
+
+# Media types that can be embedded, with their part extensions
+IMAGE_EXTENSIONS = {
+    'image/png': 'png',
+    'image/jpeg': 'jpeg',
+    'image/gif': 'gif',
+    'image/bmp': 'bmp',
+}
+
+# Pillow format names of the media types that are resized (GIFs may be animated)
+_RESIZE_FORMATS = {'image/png': 'PNG', 'image/jpeg': 'JPEG'}
+
+# Where images without an explicit position are laid out, left to right, on a
+# native slide; other slide sizes scale these. A row too tall to start at
+# _FLOW_TOP moves up, and one too large for the slide is scaled down.
+_FLOW_LEFT = 685800
+_FLOW_TOP = 5400000
+_FLOW_GAP = 127000
+_FLOW_BOTTOM = 228600
+
+_LENGTH_RE = re.compile(r'\s*(-?\d+(?:\.\d+)?)\s*(px|pt|%)?\s*\Z')
+
+
+class Picture(NamedTuple):
+    """An image placed on a slide; position and size are in EMU"""
+    digest: str
+    media_type: str
+    x: int
+    y: int
+    cx: int
+    cy: int
+    description: str
+
+    @property
+    def part_name(self) -> str:
+        """Name of the media part holding the image"""
+        return media_part_name(self.digest, self.media_type)
+
+
+class ImageInfo(NamedTuple):
+    """A resolved image: content digest, type, pixel size and file or blob handle holding it"""
+    digest: str
+    media_type: str
+    width: int
+    height: int
+    path: str
+
+
+def _open_file(path: str) -> BinaryIO:
+    """Open an image file for reading"""
+    return open(path, 'rb')
+
+
+def media_part_name(digest: str, media_type: str) -> str:
+    """Return the content-addressed part name of an image"""
+    return f"ppt/media/image-{digest[:32]}.{IMAGE_EXTENSIONS[media_type]}"
+
+
+def sniff_image(head: bytes) -> Optional[Tuple[str, int, int]]:
+    """
+    Identify an image from the start of its data
+
+    Args:
+        head: Leading bytes of the image; 64 KiB is enough for JPEGs with large
+            metadata segments
+
+    Returns:
+        (media type, width, height) in pixels, or None if it is not a supported image
+    """
+    if head[:8] == b'\x89PNG\r\n\x1a\n' and head[12:16] == b'IHDR':
+        width, height = struct.unpack('>2L', head[16:24])
+        return 'image/png', width, height
+    if head[:6] in (b'GIF87a', b'GIF89a'):
+        width, height = struct.unpack('<2H', head[6:10])
+        return 'image/gif', width, height
+    if head[:2] == b'BM' and len(head) >= 26:
+        width, height = struct.unpack('<2l', head[18:26])
+        return 'image/bmp', width, abs(height)
+    if head[:2] == b'\xff\xd8':
+        pos = 2
+        while pos + 9 < len(head):
+            if head[pos] != 0xFF:
+                return None
+            marker = head[pos + 1]
+            if marker == 0xFF:
+                pos += 1
+                continue
+            length = struct.unpack('>H', head[pos + 2:pos + 4])[0]
+            # Start of frame markers, excluding DHT, JPG and DAC
+            if 0xC0 <= marker <= 0xCF and marker not in (0xC4, 0xC8, 0xCC):
+                height, width = struct.unpack('>2H', head[pos + 5:pos + 9])
+                return 'image/jpeg', width, height
+            pos += 2 + length
+    return None
+
+
+def css_length(value: Any, reference: int) -> Optional[int]:
+    """
+    Convert a CSS length to EMU
+
+    Args:
+        value: Length such as ``"120px"``, ``"10pt"``, ``"50%"`` or a bare number of pixels
+        reference: Length in EMU that percentages refer to
+
+    Returns:
+        Length in EMU, or None if the value is missing or not understood
+    """
+    if value is None:
+        return None
+    match = _LENGTH_RE.match(str(value))
+    if not match:
+        return None
+    number = float(match.group(1))
+    unit = match.group(2)
+    if unit == '%':
+        return round(reference * number / 100)
+    if unit == 'pt':
+        return round(number * EMU_PER_PT)
+    return round(number * EMU_PER_PX)
+
+
+def _iter_images(elements: Iterable[Any]) -> Iterable[Any]:
+    """Yield the ``<img>`` elements of a slide tree in document order"""
+    stack = list(reversed(list(elements)))
+    while stack:
+        element = stack.pop()
+        if getattr(element, 'type', None) == 'img':
+            yield element
+        stack.extend(reversed(getattr(element, 'children', ())))
+
+
+class ResizeCache:
+    """On-disk cache of downscaled images keyed by source digest and target size"""
+
+    def __init__(self, directory: Optional[str] = None):
+        """
+        Initialize the cache
+
+        Args:
+            directory: Directory holding resized images (created if missing). When
+                None, a temporary directory is used and removed with the cache.
+        """
+        if directory is None:
+            directory = tempfile.mkdtemp(prefix='html_to_pptx_resized_')
+            self._cleanup = weakref.finalize(self, shutil.rmtree, directory, True)
+        else:
+            os.makedirs(directory, exist_ok=True)
+            self._cleanup = None
+        self.directory = directory
+        self.hits = 0
+        self.misses = 0
+
+    def path(self, image: ImageInfo, width: int, height: int) -> str:
+        """Return the file path of a resized image"""
+        key = hashlib.sha256(f"{RESIZE_VERSION}:{image.digest}:{width}x{height}".encode('ascii')).hexdigest()
+        return os.path.join(self.directory, key[:2], key)
+
+    def resized(self, image: ImageInfo, width: int, height: int,
+                open_image: Callable[[str], BinaryIO] = _open_file) -> str:
+        """
+        Return the path of the image scaled to width x height pixels, resizing it on a miss
+
+        Args:
+            image: Image to resize
+            width: Target width in pixels
+            height: Target height in pixels
+            open_image: Opens ``image.path`` for reading (a file path by default)
+        """
+        path = self.path(image, width, height)
+        try:
+            # Touched so that parse cache eviction sees it as recently used
+            os.utime(path)
+            self.hits += 1
+            return path
+        except OSError:
+            pass
+        self.misses += 1
+        from PIL import Image
+        with open_image(image.path) as f, Image.open(f) as source:
+            if source.mode not in ('RGB', 'RGBA', 'L', 'LA'):
+                source = source.convert('RGBA' if image.media_type == 'image/png' else 'RGB')
+            result = source.resize((width, height), Image.LANCZOS)
+        output = io.BytesIO()
+        if image.media_type == 'image/jpeg':
+            result.convert('RGB').save(output, 'JPEG', quality=90)
+        else:
+            result.save(output, _RESIZE_FORMATS[image.media_type])
+
+        # Write under a temporary name so readers never see a partial image
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        fd, temp_path = tempfile.mkstemp(dir=os.path.dirname(path), suffix='.tmp')
+        try:
+            with os.fdopen(fd, 'wb') as f:
+                f.write(output.getvalue())
+            os.replace(temp_path, path)
+        except BaseException:
+            if os.path.exists(temp_path):
+                os.unlink(temp_path)
+            raise
+        return path
+
+    def cleanup(self):
+        """Remove a temporary cache's directory now"""
+        if self._cleanup is not None:
+            self._cleanup()
+
+
+class MediaResolver:
+    """Resolve and place the images of slides"""
+
+    def __init__(self, blob_store: Optional[BlobStore] = None, base_dir: Optional[str] = None,
+                 downscale: bool = False, cache_dir: Optional[str] = None):
+        """
+        Initialize the resolver
+
+        Args:
+            blob_store: Store that blob handles in ``src`` attributes refer to; inline
+                data URIs are spilled into it as well (a temporary store when None)
+            base_dir: Directory that relative image paths are resolved against; local
+                files are never read when None
+            downscale: Downscale images larger than twice their rendered size
+                (requires Pillow; ignored without it)
+            cache_dir: Directory of the persistent resize cache (temporary when None)
+        """
+        self.blob_store = blob_store
+        self.base_dir = base_dir
+        self.downscale = downscale and PIL_AVAILABLE
+        self.cache_dir = cache_dir
+        self._resize_cache: Optional[ResizeCache] = None
+        # Whether the blob store was created here for inline data URIs
+        self._own_blob_store = False
+        # Resolved sources; file entries are keyed by path, size and mtime
+        self._images: Dict[Any, Optional[ImageInfo]] = {}
+
+    @property
+    def resize_cache(self) -> ResizeCache:
+        """Cache of downscaled images, created on first use"""
+        if self._resize_cache is None:
+            self._resize_cache = ResizeCache(self.cache_dir)
+        return self._resize_cache
+
+    def slide_pictures(self, slide_data: Dict[str, Any],
+                       slide_size: Tuple[int, int] = (SLIDE_WIDTH, SLIDE_HEIGHT)) -> List[Tuple[Picture, str]]:
+        """
+        Resolve and place every image of a slide
+
+        Images that cannot be resolved (remote URLs, missing files, unsupported
+        formats) are skipped. Every picture is placed inside the slide: positioned
+        images are moved in from the edges, and images without a position share a
+        row near the bottom that is moved up or scaled down to fit.
+
+        Args:
+            slide_data: Parsed slide
+            slide_size: Width and height of the slide in EMU
+
+        Returns:
+            (picture, source of its content for ``open``) pairs in document order
+        """
+        width, height = slide_size
+        placed = []
+        flowed = []
+        for element in _iter_images(slide_data.get('elements', ())):
+            attributes = element.attributes
+            image = self.resolve(attributes.get('src', ''))
+            if image is None:
+                continue
+            style = getattr(element, 'style', None) or {}
+            cx, cy = self._rendered_size(image, style, attributes, slide_size)
+            x = css_length(style.get('left'), width)
+            y = css_length(style.get('top'), height)
+            if x is None or y is None:
+                flowed.append(len(placed))
+            else:
+                x, y = min(max(x, 0), width - cx), min(max(y, 0), height - cy)
+            placed.append([image, x, y, cx, cy, attributes.get('alt') or ''])
+        if flowed:
+            self._flow([placed[index] for index in flowed], slide_size)
+
+        pictures = []
+        for image, x, y, cx, cy, description in placed:
+            if self.downscale and image.media_type in _RESIZE_FORMATS:
+                image = self._downscaled(image, cx, cy)
+            pictures.append((Picture(image.digest, image.media_type, x, y, cx, cy, description), image.path))
+        return pictures
+
+    @staticmethod
+    def _flow(row: List[list], slide_size: Tuple[int, int]):
+        """Lay out [image, x, y, cx, cy, description] entries left to right in one row inside the slide"""
+        width, height = slide_size
+        left = round(_FLOW_LEFT * width / SLIDE_WIDTH)
+        top = round(_FLOW_TOP * height / SLIDE_HEIGHT)
+        bottom = round(_FLOW_BOTTOM * height / SLIDE_HEIGHT)
+        # Gaps never take more than half of the row
+        gap = min(_FLOW_GAP, (width - 2 * left) // (2 * len(row)))
+
+        # Shrink the row to the width between the side margins and the height between the bottom margins
+        total = sum(entry[3] for entry in row)
+        tallest = max(entry[4] for entry in row)
+        scale = min(1.0, (width - 2 * left - gap * (len(row) - 1)) / total, (height - 2 * bottom) / tallest)
+        if scale < 1.0:
+            for entry in row:
+                entry[3] = max(1, int(entry[3] * scale))
+                entry[4] = max(1, int(entry[4] * scale))
+            tallest = max(entry[4] for entry in row)
+
+        y = min(top, height - bottom - tallest)
+        x = left
+        for entry in row:
+            entry[1], entry[2] = x, y
+            x += entry[3] + gap
+
+    def resolve(self, src: str) -> Optional[ImageInfo]:
+        """Resolve an image source to its content, or None if it cannot be embedded"""
+        src = (src or '').strip()
+        if not src:
+            return None
+        if src[:5].lower() == 'data:':
+            if self.blob_store is None:
+                self.blob_store = BlobStore()
+                self._own_blob_store = True
+            src = self.blob_store.put_data_uri(src) or ''
+        if is_blob_handle(src):
+            key = src
+            if key not in self._images:
+                self._images[key] = self._identify(src, parse_blob_handle(src).digest) \
+                    if self.blob_store is not None and src in self.blob_store else None
+            return self._images[key]
+
+        path = self._local_path(src)
+        return self._file_image(path) if path is not None else None
+
+    def open(self, source: str) -> BinaryIO:
+        """Open the content of a resolved image (``ImageInfo.path``) for reading"""
+        if is_blob_handle(source):
+            return self.blob_store.open(source)
+        return open(source, 'rb')
+
+    def release(self):
+        """Forget the images resolved so far, dropping the blobs of a store created here"""
+        self._images.clear()
+        if self._own_blob_store:
+            self.blob_store.cleanup()
+
+    def cleanup(self):
+        """Forget resolved images and remove a temporary resize cache now"""
+        self.release()
+        if self._resize_cache is not None:
+            self._resize_cache.cleanup()
+            self._resize_cache = None
+
+    def _file_image(self, path: str) -> Optional[ImageInfo]:
+        """Resolve an image file, hashing it only when it is new or has changed"""
+        try:
+            stat = os.stat(path)
+        except OSError:
+            return None
+        key = (path, stat.st_size, stat.st_mtime_ns)
+        if key not in self._images:
+            self._images[key] = self._identify(path)
+        return self._images[key]
+
+    def _local_path(self, src: str) -> Optional[str]:
+        """
+        Map a relative, absolute or ``file:`` URL to a file path inside the base directory
+
+        Returns None for remote URLs, without a base directory, and for paths that
+        lead outside it (through ``..``, symlinks or an absolute path).
+        """
+        if self.base_dir is None:
+            # HTML from an untrusted caller must not embed arbitrary local files
+            return None
+        url = urlparse(src)
+        if url.scheme == 'file':
+            path = unquote(url.path)
+        elif url.scheme and len(url.scheme) > 1:
+            # http:, https: and other remote schemes (single letters are drive names)
+            return None
+        else:
+            path = unquote(url.path) if not url.scheme else src
+        base = os.path.realpath(self.base_dir)
+        path = os.path.realpath(os.path.join(base, path))
+        try:
+            inside = os.path.commonpath([base, path]) == base
+        except ValueError:
+            # Different drives
+            inside = False
+        return path if inside else None
+
+    def _identify(self, path: str, digest: Optional[str] = None) -> Optional[ImageInfo]:
+        """Sniff an image's type and size and hash it if needed"""
+        try:
+            with self.open(path) as f:
+                head = f.read(1 << 16)
+                info = sniff_image(head)
+                if info is None:
+                    return None
+                if digest is None:
+                    hasher = hashlib.sha256(head)
+                    for chunk in iter(lambda: f.read(1 << 20), b''):
+                        hasher.update(chunk)
+                    digest = hasher.hexdigest()
+        except OSError:
+            return None
+        media_type, width, height = info
+        if width <= 0 or height <= 0:
+            return None
+        return ImageInfo(digest, media_type, width, height, path)
+
+    @staticmethod
+    def _rendered_size(image: ImageInfo, style: Dict[str, Any], attributes: Dict[str, Any],
+                       slide_size: Tuple[int, int] = (SLIDE_WIDTH, SLIDE_HEIGHT)) -> Tuple[int, int]:
+        """Return the displayed size in EMU, keeping the aspect ratio when one side is missing"""
+        width, height = slide_size
+        cx = css_length(style.get('width') or attributes.get('width'), width)
+        cy = css_length(style.get('height') or attributes.get('height'), height)
+        if cx is None and cy is None:
+            cx, cy = image.width * EMU_PER_PX, image.height * EMU_PER_PX
+        elif cx is None:
+            cx = round(cy * image.width / image.height)
+        elif cy is None:
+            cy = round(cx * image.height / image.width)
+
+        # Never larger than the slide itself
+        scale = min(1.0, width / max(cx, 1), height / max(cy, 1))
+        return max(1, min(width, round(cx * scale))), max(1, min(height, round(cy * scale)))
+
+    def _downscaled(self, image: ImageInfo, cx: int, cy: int) -> ImageInfo:
+        """Return the image scaled down to RESIZE_SCALE times its rendered pixel size, if larger"""
+        width = max(1, -(-cx * RESIZE_SCALE // EMU_PER_PX))
+        height = max(1, -(-cy * RESIZE_SCALE // EMU_PER_PX))
+        if image.width <= width or image.height <= height:
+            return image
+        try:
+            path = self.resize_cache.resized(image, width, height, self.open)
+        except (OSError, ValueError):
+            # Pillow could not decode it; embed the original
+            return image
+        return self._file_image(path) or image
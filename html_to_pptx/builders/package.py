@@ -0,0 +1,301 @@
+"""
+Package Writer Module
+
+Minimal ZIP writer for OPC packages. Every part is compressed in memory before its
+local header is written, so sizes and CRC are always known up front: the archive is
+written strictly sequentially (no seeking or data descriptors) to any object with a
+``write`` method, and parts compressed earlier can be spliced in as raw deflate
+streams without recompression.
+PackageReader goes the other way, returning a part's raw compressed data from an
+existing archive so it can be copied into a new one as is.
+
+How hard parts are compressed is chosen by a compression profile, per part type:
+XML parts use the profile's deflate level, while formats that are already
+compressed (PNG, JPEG, ...) are always stored.
+"""
+
+import os
+import struct
+import time
+import zipfile
+import zlib
+from typing import BinaryIO, Dict, List, Mapping, NamedTuple, Optional, Tuple
+
+ZIP_STORED = 0
+ZIP_DEFLATED = 8
+
+# Deflate level of each compression profile; None stores parts uncompressed
+COMPRESSION_PROFILES: Dict[str, Optional[int]] = {
+    'fast': zlib.Z_BEST_SPEED,
+    'balanced': zlib.Z_DEFAULT_COMPRESSION,
+    'smallest': zlib.Z_BEST_COMPRESSION,
+    'stored': None,
+}
+DEFAULT_COMPRESSION = 'balanced'
+
+# Entry timestamp of deterministic packages: 1980-01-01 00:00 UTC, the earliest a ZIP can store
+DETERMINISTIC_TIMESTAMP = 315532800
+
+# Media formats that deflate cannot shrink meaningfully
+PRECOMPRESSED_EXTENSIONS = frozenset({
+    '.png', '.jpg', '.jpeg', '.gif', '.webp', '.mp3', '.mp4', '.m4a', '.wdp', '.zip'
+})
+
+# Highest entry count and offset a ZIP without ZIP64 extensions can describe
+_ZIP_MAX_ENTRIES = 0xFFFF
+_ZIP_MAX_OFFSET = 0xFFFFFFFF
+
+_LOCAL_HEADER = struct.Struct('<4s5H3L2H')
+_CENTRAL_HEADER = struct.Struct('<4s6H3L5H2L')
+_END_RECORD = struct.Struct('<4s4H2LH')
+_VERSION = 20
+_MADE_BY = (3 << 8) | _VERSION
+_EXTERNAL_ATTR = 0o600 << 16
+
+
+class CompressedPart(NamedTuple):
+    """A part's payload, compressed and ready to be copied into an archive"""
+    method: int
+    crc: int
+    size: int
+    data: bytes
+
+
+def check_compression(profile: str):
+    """Raise ValueError for an unknown compression profile"""
+    if profile not in COMPRESSION_PROFILES:
+        raise ValueError(f"Unknown compression profile: {profile} (choose from {', '.join(COMPRESSION_PROFILES)})")
+
+
+def compression_level(name: str, profile: str = DEFAULT_COMPRESSION) -> Optional[int]:
+    """
+    Choose the deflate level for a part
+
+    Args:
+        name: Part name inside the package
+        profile: Compression profile, one of COMPRESSION_PROFILES
+
+    Returns:
+        Deflate level, or None to store the part uncompressed
+    """
+    check_compression(profile)
+    if os.path.splitext(name)[1].lower() in PRECOMPRESSED_EXTENSIONS:
+        return None
+    return COMPRESSION_PROFILES[profile]
+
+
+def compress_part(data: bytes, level: Optional[int] = zlib.Z_DEFAULT_COMPRESSION) -> CompressedPart:
+    """Deflate a part's content into a raw deflate stream, or store it when level is None"""
+    if level is None:
+        return CompressedPart(ZIP_STORED, zlib.crc32(data), len(data), data)
+    compressor = zlib.compressobj(level, zlib.DEFLATED, -15)
+    compressed = compressor.compress(data) + compressor.flush()
+    return CompressedPart(ZIP_DEFLATED, zlib.crc32(data), len(data), compressed)
+
+
+# Process-wide cache of compressed parts whose content is the same in every package
+_SHARED_PARTS: Dict[Tuple[bytes, Optional[int]], CompressedPart] = {}
+_MAX_SHARED_PARTS = 256
+
+
+def shared_part(data: bytes, level: Optional[int] = zlib.Z_DEFAULT_COMPRESSION) -> CompressedPart:
+    """Return the compressed form of a part that is identical across packages"""
+    key = (data, level)
+    try:
+        return _SHARED_PARTS[key]
+    except KeyError:
+        pass
+    part = compress_part(data, level)
+    if len(_SHARED_PARTS) < _MAX_SHARED_PARTS:
+        _SHARED_PARTS[key] = part
+    return part
+
+
+def deterministic_timestamp(environ: Optional[Mapping[str, str]] = None) -> float:
+    """
+    Return the entry timestamp of deterministic packages
+
+    Follows the reproducible builds convention: ``SOURCE_DATE_EPOCH`` when it is
+    set to a valid number of seconds, DETERMINISTIC_TIMESTAMP otherwise.
+
+    Args:
+        environ: Environment to read ``SOURCE_DATE_EPOCH`` from (defaults to this process's)
+    """
+    try:
+        return max(float((os.environ if environ is None else environ)['SOURCE_DATE_EPOCH']),
+                   DETERMINISTIC_TIMESTAMP)
+    except (KeyError, ValueError):
+        return DETERMINISTIC_TIMESTAMP
+
+
+def _dos_datetime(timestamp: float, utc: bool = False) -> tuple:
+    """Return (date, time) fields in MS-DOS format for a timestamp, in local time or UTC"""
+    year, month, day, hour, minute, second = (time.gmtime if utc else time.localtime)(timestamp)[:6]
+    if year < 1980:
+        year, month, day, hour, minute, second = 1980, 1, 1, 0, 0, 0
+    return ((year - 1980) << 9) | (month << 5) | day, (hour << 11) | (minute << 5) | (second // 2)
+
+
+class _Entry(NamedTuple):
+    """What the central directory needs of a written part; its payload is not kept"""
+    name: bytes
+    flags: int
+    method: int
+    crc: int
+    compressed_size: int
+    size: int
+    offset: int
+
+
+class PackageWriter:
+    """Write ZIP entries sequentially to a binary file object"""
+
+    def __init__(self, fileobj: BinaryIO, timestamp: Optional[float] = None,
+                 compression: str = DEFAULT_COMPRESSION):
+        """
+        Initialize the writer
+
+        Args:
+            fileobj: Object with a ``write`` method; it is not closed by the writer
+            timestamp: Modification time stamped on every entry. An explicit timestamp is
+                stored in UTC, so the same timestamp gives the same bytes on any machine;
+                the default is the current local time, as ZIP tools expect.
+            compression: Compression profile, one of COMPRESSION_PROFILES
+        """
+        check_compression(compression)
+        self.fileobj = fileobj
+        self.compression = compression
+        self.offset = 0
+        self.entries: List[_Entry] = []
+        if timestamp is None:
+            self._date, self._time = _dos_datetime(time.time())
+        else:
+            self._date, self._time = _dos_datetime(timestamp, utc=True)
+        self._closed = False
+
+    def __enter__(self) -> 'PackageWriter':
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        if exc_type is None:
+            self.close()
+
+    def write(self, name: str, data: bytes):
+        """Compress and add a part"""
+        self.write_compressed(name, compress_part(data, compression_level(name, self.compression)))
+
+    def write_shared(self, name: str, data: bytes):
+        """Add a part whose content is the same in every package, compressing it at most once"""
+        self.write_compressed(name, shared_part(data, compression_level(name, self.compression)))
+
+    def write_compressed(self, name: str, part: CompressedPart):
+        """Copy an already compressed part into the archive as is"""
+        if len(self.entries) >= _ZIP_MAX_ENTRIES or self.offset > _ZIP_MAX_OFFSET:
+            raise ValueError("Package too large: ZIP64 archives are not supported")
+        encoded = name.encode('utf-8')
+        # Bit 11 marks UTF-8 names
+        flags = 0 if name.isascii() else 0x800
+        self.entries.append(_Entry(encoded, flags, part.method, part.crc, len(part.data), part.size, self.offset))
+        header = _LOCAL_HEADER.pack(
+            b'PK\x03\x04', _VERSION, flags, part.method, self._time, self._date,
+            part.crc, len(part.data), part.size, len(encoded), 0
+        )
+        self._write(header + encoded)
+        self._write(part.data)
+
+    def close(self):
+        """Write the central directory; the file object is left open"""
+        if self._closed:
+            return
+        self._closed = True
+        start = self.offset
+        directory = []
+        for entry in self.entries:
+            directory.append(_CENTRAL_HEADER.pack(
+                b'PK\x01\x02', _MADE_BY, _VERSION, entry.flags, entry.method, self._time, self._date,
+                entry.crc, entry.compressed_size, entry.size, len(entry.name), 0, 0, 0, 0,
+                _EXTERNAL_ATTR, entry.offset
+            ))
+            directory.append(entry.name)
+        self._write(b''.join(directory))
+        self._write(_END_RECORD.pack(
+            b'PK\x05\x06', 0, 0, len(self.entries), len(self.entries),
+            self.offset - start, start, 0
+        ))
+        if hasattr(self.fileobj, 'flush'):
+            self.fileobj.flush()
+
+    def _write(self, data: bytes):
+        self.fileobj.write(data)
+        self.offset += len(data)
+
+
+class PackageReader:
+    """Read parts of an existing ZIP package, including their raw compressed data"""
+
+    def __init__(self, path: str):
+        """
+        Open a package
+
+        Args:
+            path: Path of the ZIP archive
+
+        Raises:
+            zipfile.BadZipFile: If the file is not a ZIP archive
+        """
+        self._file = open(path, 'rb')
+        try:
+            self._zip = zipfile.ZipFile(self._file)
+        except BaseException:
+            self._file.close()
+            raise
+
+    def __enter__(self) -> 'PackageReader':
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def __contains__(self, name: str) -> bool:
+        try:
+            self._zip.getinfo(name)
+        except KeyError:
+            return False
+        return True
+
+    def crc(self, name: str) -> int:
+        """Return the CRC-32 of a part's uncompressed content"""
+        return self._zip.getinfo(name).CRC
+
+    def read(self, name: str) -> bytes:
+        """Return a part's uncompressed content"""
+        return self._zip.read(name)
+
+    def compressed(self, name: str) -> CompressedPart:
+        """
+        Return a part exactly as it is stored in the archive
+
+        Raises:
+            KeyError: If the part does not exist
+            ValueError: If the part is encrypted or uses a compression method
+                other than stored or deflate
+        """
+        info = self._zip.getinfo(name)
+        if info.flag_bits & 0x1 or info.compress_type not in (ZIP_STORED, ZIP_DEFLATED):
+            raise ValueError(f"Cannot copy part {name}: unsupported encoding")
+        self._file.seek(info.header_offset)
+        header = self._file.read(_LOCAL_HEADER.size)
+        fields = _LOCAL_HEADER.unpack(header) if len(header) == _LOCAL_HEADER.size else None
+        if fields is None or fields[0] != b'PK\x03\x04':
+            raise ValueError(f"Bad local header for part {name}")
+        # The local name and extra field lengths may differ from the central directory's
+        self._file.seek(info.header_offset + _LOCAL_HEADER.size + fields[-2] + fields[-1])
+        data = self._file.read(info.compress_size)
+        if len(data) != info.compress_size:
+            raise ValueError(f"Truncated part {name}")
+        return CompressedPart(info.compress_type, info.CRC, info.file_size, data)
+
+    def close(self):
+        """Close the archive"""
+        self._zip.close()
+        self._file.close()
@@ -3,45 +3,211 @@ PPTX Builder Module
 
 Builds PowerPoint presentations from parsed slide data.
 Supports both python-pptx library and native XML generation.
+
+Native packages carry a manifest part listing a digest of what each slide was
+rendered from, so ``PPTXBuilder.update`` can rebuild a package re-rendering only
+the slides that changed and copying the others over as raw compressed data.
 """
 
+import hashlib
+import importlib.util
+import io
+import json
 import os
-import sys
-import zipfile
+import shutil
 import tempfile
-from typing import Dict, List, Any, Optional
-from ..utils.xml_templates import XMLTemplates
+import zipfile
+import zlib
+from collections import deque
+from typing import TYPE_CHECKING, Callable, Dict, List, Any, Optional, Iterable, BinaryIO, Mapping, Sequence, Tuple, Union
+from ..utils.blobs import BlobStore
+from ..utils.xml_templates import MANIFEST_PART, TEMPLATE_VERSION, XMLTemplates
+from .media import SLIDE_HEIGHT, SLIDE_WIDTH, MediaResolver, Picture
+from .package import (
+    DEFAULT_COMPRESSION, CompressedPart, PackageReader, PackageWriter, check_compression, compress_part,
+    compression_level, deterministic_timestamp
+)
+
+if TYPE_CHECKING:
+    from concurrent.futures import Future, ProcessPoolExecutor
+
+# python-pptx is imported by the library code path only, so native builds never load it;
+# _import_library clears this if the installed package turns out not to import
+PPTX_AVAILABLE = importlib.util.find_spec('pptx') is not None
+
+
+def _import_library() -> bool:
+    """Import python-pptx on first use; False if it is missing or cannot be imported"""
+    global PPTX_AVAILABLE
+    if PPTX_AVAILABLE:
+        try:
+            import pptx  # noqa: F401
+        except ImportError:
+            # A broken install, such as one whose lxml is missing
+            PPTX_AVAILABLE = False
+    return PPTX_AVAILABLE
+
+
+# Permission mask applied to new output files, read once since reading it means setting it
+_UMASK = os.umask(0o022)
+os.umask(_UMASK)
+
+# Slides handed to a worker per task; rendering one slide costs less than a round trip
+_SLIDES_PER_TASK = 32
+
+# Format of the manifest part
+MANIFEST_VERSION = 1
+
+# Title, subtitle, period and pictures of a slide
+SlideFields = Tuple[str, str, str, Tuple[Picture, ...]]
+
+# Slide layout used for every slide built with python-pptx ("Title Only")
+_LIBRARY_LAYOUT = 5
+
+# python-pptx base presentation, sized 16:9 and saved once per process
+_library_prototype: Optional[bytes] = None
+
+
+def _load_library_prototype() -> bytes:
+    """Return the package bytes that every python-pptx presentation is opened from"""
+    global _library_prototype
+    if _library_prototype is None:
+        from pptx import Presentation
+        from pptx.util import Inches
+        
+        prs = Presentation()
+        
+        # Set slide size to 16:9
+        prs.slide_width = Inches(10)
+        prs.slide_height = Inches(5.625)
+        
+        saved = io.BytesIO()
+        prs.save(saved)
+        # Re-store the parts uncompressed so opening a copy skips inflating them
+        stored = io.BytesIO()
+        with zipfile.ZipFile(saved) as source, zipfile.ZipFile(stored, 'w', zipfile.ZIP_STORED) as target:
+            for info in source.infolist():
+                target.writestr(info.filename, source.read(info))
+        _library_prototype = stored.getvalue()
+    return _library_prototype
+
+
+def _picture_rids(pictures: Sequence[Picture]) -> Dict[str, int]:
+    """Number the slide relationship of each distinct image; rId1 is the slide layout"""
+    rids: Dict[str, int] = {}
+    for picture in pictures:
+        rids.setdefault(picture.digest, len(rids) + 2)
+    return rids
+
+
+def _slide_xml(fields: SlideFields) -> bytes:
+    """Render a slide's XML, pointing its pictures at the slide's image relationships"""
+    title, subtitle, period, pictures = fields
+    rids = _picture_rids(pictures)
+    return XMLTemplates.get_slide(title, subtitle, period, [
+        (rids[picture.digest], picture.x, picture.y, picture.cx, picture.cy, picture.description)
+        for picture in pictures
+    ])
 
-# Try to import python-pptx
-try:
-    from pptx import Presentation
-    from pptx.util import Inches, Pt
-    from pptx.dml.color import RGBColor
-    from pptx.enum.text import PP_ALIGN
-    PPTX_AVAILABLE = True
-except ImportError:
-    PPTX_AVAILABLE = False
+
+def _render_slides(fields: List[SlideFields], level: Optional[int]) -> List[CompressedPart]:
+    """Worker task: render a batch of slides' XML and deflate it"""
+    return [compress_part(_slide_xml(slide_fields), level) for slide_fields in fields]
+
+
+def _slide_digest(fields: SlideFields) -> str:
+    """Digest of everything a slide's XML is rendered from"""
+    digest = hashlib.sha256(f"slide:{TEMPLATE_VERSION}".encode('ascii'))
+    for field in fields:
+        digest.update(b'\0')
+        digest.update(str(field).encode('utf-8'))
+    return digest.hexdigest()
+
+
+class _PreviousSlides:
+    """Slides of an existing package, looked up by the digest of their content"""
+    
+    def __init__(self, reader: PackageReader, slides: Dict[str, Tuple[str, int]]):
+        self.reader = reader
+        self.slides = slides
+        
+    def __enter__(self) -> '_PreviousSlides':
+        return self
+        
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.reader.close()
+        
+    def get(self, digest: str) -> Optional[CompressedPart]:
+        """Return the compressed part of a slide with this digest, if there is an intact one"""
+        entry = self.slides.get(digest)
+        if entry is None:
+            return None
+        name, crc = entry
+        # A part edited by another application no longer matches the manifest
+        if name not in self.reader or self.reader.crc(name) != crc:
+            return None
+        try:
+            return self.reader.compressed(name)
+        except ValueError:
+            return None
 
 
 class PPTXBuilder:
     """Build PPTX presentations from structured data"""
     
-    def __init__(self, use_native: bool = False):
+    def __init__(self, use_native: bool = False, workers: int = 1, compression: str = DEFAULT_COMPRESSION,
+                 blob_store: Optional[BlobStore] = None, base_dir: Optional[str] = None,
+                 downscale_images: bool = False, media_cache_dir: Optional[str] = None,
+                 deterministic: bool = False):
         """
         Initialize the builder
         
         Args:
             use_native: Force native XML generation even if python-pptx is available
+            workers: Number of processes rendering and compressing slide XML in
+                native mode; parts are still written to the package in order
+            compression: Compression profile for native packages: 'fast', 'balanced',
+                'smallest' or 'stored'. Already compressed media is always stored.
+            blob_store: Store that blob handles in image sources refer to
+            base_dir: Directory that relative image paths are resolved against (local
+                image files are not embedded when None)
+            downscale_images: Downscale images to twice their rendered size (requires Pillow)
+            media_cache_dir: Directory of the persistent cache of downscaled images
+            deterministic: Make identical inputs produce byte-identical files by stamping
+                every entry with a fixed time (``SOURCE_DATE_EPOCH`` if set, else
+                1980-01-01); entry order and relationship IDs depend only on the input
         """
+        check_compression(compression)
         self.use_native = use_native or not PPTX_AVAILABLE
         self.templates = XMLTemplates()
+        self.workers = workers
+        self.compression = compression
+        self.media = MediaResolver(blob_store, base_dir, downscale_images, media_cache_dir)
+        self.deterministic = deterministic
+        # Environment SOURCE_DATE_EPOCH is read from; None reads this process's
+        self.environ: Optional[Mapping[str, str]] = None
+        # Media parts written to the package being built, with their content types
+        self._media_parts: Dict[str, str] = {}
+        self.rendered_slides = 0
+        self.reused_slides = 0
+        self._executor: Optional['ProcessPoolExecutor'] = None
+        
+    def shutdown(self):
+        """Stop the slide rendering worker processes"""
+        if self._executor is not None:
+            self._executor.shutdown()
+            self._executor = None
         
-    def build(self, slides: List[Dict[str, Any]], output_path: str, metadata: Dict[str, str] = None):
+    def build(self, slides: Iterable[Dict[str, Any]], output_path: str, metadata: Dict[str, str] = None):
         """
         Build PPTX file from slides data
         
+        Slides are consumed one at a time, so ``slides`` may be a generator such as
+        ``SlideHTMLParser.iter_slides``. Metadata is only read after the last slide
+        has been consumed, so a streaming caller may fill it in as it goes.
+        
         Args:
-            slides: List of slide data dictionaries
+            slides: Iterable of slide data dictionaries
             output_path: Path to save the PPTX file
             metadata: Document metadata (title, subtitle, etc.)
         """
@@ -50,25 +216,141 @@ class PPTXBuilder:
         else:
             self._build_with_library(slides, output_path, metadata)
             
-    def _build_with_library(self, slides: List[Dict[str, Any]], output_path: str, metadata: Dict[str, str] = None):
-        """Build using python-pptx library"""
-        prs = Presentation()
+    def build_to(self, slides: Iterable[Dict[str, Any]], fileobj: BinaryIO, metadata: Dict[str, str] = None):
+        """
+        Build a PPTX package into a binary file object
         
-        # Set slide size to 16:9
-        prs.slide_width = Inches(10)
-        prs.slide_height = Inches(5.625)
+        With native generation each part is written to ``fileobj`` as soon as it is
+        rendered, starting with the first slide, so a consumer such as an HTTP
+        response can send data before the last slide is built. The archive is
+        written strictly sequentially, so ``fileobj`` does not need to be seekable
+        (sockets, pipes, response streams); only ``write`` is required. The file
+        object is left open.
+        
+        Args:
+            slides: Iterable of slide data dictionaries
+            fileobj: Writable binary file object
+            metadata: Document metadata (title, subtitle, etc.)
+        """
+        if not self.use_native:
+            # python-pptx assembles the whole package before writing it
+            self._build_with_library(slides, fileobj, metadata)
+            return
+        with self._package_writer(fileobj) as package:
+            self._write_package(package, slides, metadata)
+            
+    def update(self, slides: Iterable[Dict[str, Any]], output_path: str, metadata: Dict[str, str] = None):
+        """
+        Rebuild an existing PPTX file, re-rendering only the slides that changed
+        
+        The file must have been built by this builder in native mode. Its manifest
+        lists a digest of each slide's content; slides whose digest is still in the
+        deck are copied over as their raw compressed data, even if they moved, and
+        only the others are rendered. Relationship, content type and other parts
+        that depend on the slide list are regenerated. The updated package replaces
+        the old one once it is complete.
+        
+        A full build is done instead when ``output_path`` does not exist or has no
+        usable manifest, was built with another compression profile, or when
+        python-pptx is used.
+        
+        Args:
+            slides: Iterable of slide data dictionaries
+            output_path: Path of the PPTX file to update
+            metadata: Document metadata (title, subtitle, etc.)
+        """
+        previous = self._open_previous(output_path) if self.use_native else None
+        if previous is None:
+            self.build(slides, output_path, metadata)
+            return
+            
+        with previous:
+            self._write_replacing(output_path, lambda package: self._write_package(package, slides, metadata, previous))
+            
+    def _package_writer(self, fileobj: BinaryIO) -> PackageWriter:
+        """Create the writer of a native package"""
+        timestamp = deterministic_timestamp(self.environ) if self.deterministic else None
+        return PackageWriter(fileobj, timestamp=timestamp, compression=self.compression)
+        
+    def _open_previous(self, path: str) -> Optional[_PreviousSlides]:
+        """Open the slides of an existing package for reuse; None if they cannot be reused"""
+        if not os.path.isfile(path):
+            return None
+        try:
+            reader = PackageReader(path)
+        except (OSError, zipfile.BadZipFile):
+            return None
+        try:
+            manifest = json.loads(reader.read(MANIFEST_PART))
+            if manifest['version'] != MANIFEST_VERSION or manifest['compression'] != self.compression:
+                raise ValueError("Manifest does not match this builder")
+            slides = {
+                entry['digest']: (f"ppt/slides/slide{slide_num}.xml", entry['crc'])
+                for slide_num, entry in enumerate(manifest['slides'], 1)
+            }
+        except (KeyError, TypeError, ValueError, zipfile.BadZipFile, zlib.error):
+            reader.close()
+            return None
+        return _PreviousSlides(reader, slides)
+            
+    def _build_with_library(self, slides: Iterable[Dict[str, Any]], output: Union[str, BinaryIO],
+                            metadata: Dict[str, str] = None):
+        """Build using python-pptx library, saving to a path or binary file object"""
+        if not _import_library():
+            # Fall back to native output, as when python-pptx is not installed
+            self.use_native = True
+            if isinstance(output, str):
+                self._build_native(slides, output, metadata)
+            else:
+                self.build_to(slides, output, metadata)
+            return
+        from pptx import Presentation
+        
+        # Open a copy of the cached 16:9 prototype rather than loading the default template
+        prs = Presentation(io.BytesIO(_load_library_prototype()))
+        slide_layout = prs.slide_layouts[_LIBRARY_LAYOUT]
         
         # Process each slide
         for slide_data in slides:
-            self._add_slide_with_library(prs, slide_data, metadata)
+            slide = self._add_slide_with_library(prs, slide_layout, slide_data, metadata)
+            
+            # python-pptx stores each distinct image once per package
+            for picture, path in self.media.slide_pictures(slide_data, (prs.slide_width, prs.slide_height)):
+                with self.media.open(path) as image:
+                    slide.shapes.add_picture(image, picture.x, picture.y, picture.cx, picture.cy)
             
         # Save presentation
-        prs.save(output_path)
+        if not self.deterministic:
+            if isinstance(output, str):
+                prs.save(output)
+                return
+            # zipfile needs tell() and flush(); sinks such as sockets only guarantee write()
+            saved = io.BytesIO()
+            prs.save(saved)
+            output.write(saved.getbuffer())
+            return
+            
+        # python-pptx stamps entries with the current time; copy them into a package with fixed times
+        saved = io.BytesIO()
+        prs.save(saved)
+        if isinstance(output, str):
+            with open(output, 'wb') as f:
+                self._repack(saved, f)
+        else:
+            self._repack(saved, output)
+            
+    def _repack(self, saved: BinaryIO, fileobj: BinaryIO):
+        """Copy the entries of a saved package into a new package, in the same order"""
+        with zipfile.ZipFile(saved) as source, self._package_writer(fileobj) as package:
+            for info in source.infolist():
+                package.write(info.filename, source.read(info))
         
-    def _add_slide_with_library(self, prs, slide_data: Dict[str, Any], metadata: Dict[str, str] = None):
+    def _add_slide_with_library(self, prs, slide_layout, slide_data: Dict[str, Any], metadata: Dict[str, str] = None):
         """Add a single slide using python-pptx"""
-        # Use blank layout
-        slide_layout = prs.slide_layouts[5]
+        from pptx.util import Inches, Pt
+        from pptx.dml.color import RGBColor
+        from pptx.enum.text import PP_ALIGN
+        
         slide = prs.slides.add_slide(slide_layout)
         
         # Extract metadata from slide
@@ -130,107 +412,176 @@ class PPTXBuilder:
         gradient_shape.fill.solid()
         gradient_shape.fill.fore_color.rgb = RGBColor(138, 43, 226)
         gradient_shape.line.fill.background()
+        return slide
         
-    def _build_native(self, slides: List[Dict[str, Any]], output_path: str, metadata: Dict[str, str] = None):
-        """Build using native XML generation"""
-        with tempfile.TemporaryDirectory() as temp_dir:
-            # Create directory structure
-            self._create_directory_structure(temp_dir)
-            
-            # Create XML files
-            self._create_content_types(temp_dir)
-            self._create_relationships(temp_dir)
-            self._create_document_properties(temp_dir, metadata)
-            self._create_presentation(temp_dir, len(slides))
-            self._create_theme(temp_dir)
-            self._create_slide_master(temp_dir)
-            self._create_slide_layout(temp_dir)
+    def _build_native(self, slides: Iterable[Dict[str, Any]], output_path: str, metadata: Dict[str, str] = None):
+        """Build using native XML generation, writing every part straight into the package"""
+        self._write_replacing(output_path, lambda package: self._write_package(package, slides, metadata))
+        
+    def _write_replacing(self, output_path: str, write: Callable[[PackageWriter], None]):
+        """
+        Write a native package next to ``output_path`` and move it into place once complete
+        
+        A failed build leaves no partial package behind and keeps any previous file.
+        """
+        fd, temp_path = tempfile.mkstemp(dir=os.path.dirname(os.path.abspath(output_path)), suffix='.tmp')
+        try:
+            with os.fdopen(fd, 'wb') as f:
+                with self._package_writer(f) as package:
+                    write(package)
+            if os.path.exists(output_path):
+                shutil.copymode(output_path, temp_path)
+            else:
+                # mkstemp creates the file private to its owner
+                os.chmod(temp_path, 0o666 & ~_UMASK)
+            os.replace(temp_path, output_path)
+        except BaseException:
+            if os.path.exists(temp_path):
+                os.unlink(temp_path)
+            raise
             
-            # Create slides
+    def _write_package(self, package: PackageWriter, slides: Iterable[Dict[str, Any]], metadata: Dict[str, str] = None,
+                       previous: Optional[_PreviousSlides] = None):
+        """Write all presentation parts into an open ZIP package, reusing unchanged slides of ``previous``"""
+        self.rendered_slides = 0
+        self.reused_slides = 0
+        self._media_parts = {}
+        manifest: List[Dict[str, Any]] = []
+        
+        # Create slides first so each one can be released as soon as it is written
+        if self.workers > 1:
+            self._create_slides_parallel(package, slides, manifest, previous)
+        else:
             for idx, slide_data in enumerate(slides, 1):
-                self._create_slide(temp_dir, idx, slide_data)
-                
-            # Package as PPTX
-            self._create_pptx_package(temp_dir, output_path)
+                self._create_slide(package, idx, slide_data, manifest, previous)
+        slide_count = len(manifest)
             
-    def _create_directory_structure(self, base_path: str):
-        """Create required directory structure"""
-        dirs = [
-            "_rels",
-            "docProps",
-            "ppt",
-            "ppt/_rels",
-            "ppt/slides",
-            "ppt/slides/_rels",
-            "ppt/slideLayouts",
-            "ppt/slideLayouts/_rels",
-            "ppt/slideMasters",
-            "ppt/slideMasters/_rels",
-            "ppt/theme"
-        ]
-        for dir_path in dirs:
-            os.makedirs(os.path.join(base_path, dir_path), exist_ok=True)
+        # Create XML files
+        self._create_content_types(package, slide_count)
+        self._create_relationships(package, slide_count)
+        self._create_document_properties(package, slide_count, metadata)
+        self._create_presentation(package, slide_count)
+        self._create_theme(package)
+        self._create_slide_master(package)
+        self._create_slide_layout(package)
+        self._create_manifest(package, manifest)
             
-    def _create_content_types(self, base_path: str):
+    def _create_content_types(self, package: PackageWriter, slide_count: int):
         """Create [Content_Types].xml"""
-        with open(os.path.join(base_path, "[Content_Types].xml"), "w", encoding="utf-8") as f:
-            f.write(self.templates.get_content_types())
+        media_types = {name.rsplit('.', 1)[1]: media_type for name, media_type in self._media_parts.items()}
+        package.write("[Content_Types].xml", self.templates.get_content_types(slide_count, media_types))
             
-    def _create_relationships(self, base_path: str):
+    def _create_relationships(self, package: PackageWriter, slide_count: int):
         """Create relationship files"""
         # Root relationships
-        with open(os.path.join(base_path, "_rels", ".rels"), "w", encoding="utf-8") as f:
-            f.write(self.templates.get_root_relationships())
+        package.write_shared("_rels/.rels", self.templates.get_root_relationships())
             
         # Presentation relationships
-        with open(os.path.join(base_path, "ppt", "_rels", "presentation.xml.rels"), "w", encoding="utf-8") as f:
-            f.write(self.templates.get_presentation_relationships(1))  # 1 slide for now
+        package.write("ppt/_rels/presentation.xml.rels", self.templates.get_presentation_relationships(slide_count))
             
-    def _create_document_properties(self, base_path: str, metadata: Dict[str, str] = None):
+    def _create_document_properties(self, package: PackageWriter, slide_count: int, metadata: Dict[str, str] = None):
         """Create document properties"""
         metadata = metadata or {}
         
         # Core properties
-        with open(os.path.join(base_path, "docProps", "core.xml"), "w", encoding="utf-8") as f:
-            f.write(self.templates.get_core_properties(
-                metadata.get('title', 'Presentation'),
-                metadata.get('creator', 'HTML to PPTX Converter')
-            ))
+        package.write("docProps/core.xml", self.templates.get_core_properties(
+            metadata.get('title', 'Presentation'),
+            metadata.get('creator', 'HTML to PPTX Converter')
+        ))
             
         # App properties
-        with open(os.path.join(base_path, "docProps", "app.xml"), "w", encoding="utf-8") as f:
-            f.write(self.templates.get_app_properties())
+        package.write("docProps/app.xml", self.templates.get_app_properties(slide_count))
             
-    def _create_presentation(self, base_path: str, slide_count: int):
+    def _create_presentation(self, package: PackageWriter, slide_count: int):
         """Create presentation.xml"""
-        with open(os.path.join(base_path, "ppt", "presentation.xml"), "w", encoding="utf-8") as f:
-            f.write(self.templates.get_presentation(slide_count))
+        package.write("ppt/presentation.xml", self.templates.get_presentation(slide_count))
             
-    def _create_theme(self, base_path: str):
+    def _create_theme(self, package: PackageWriter):
         """Create theme file"""
-        with open(os.path.join(base_path, "ppt", "theme", "theme1.xml"), "w", encoding="utf-8") as f:
-            f.write(self.templates.get_theme())
+        package.write_shared("ppt/theme/theme1.xml", self.templates.get_theme())
             
-    def _create_slide_master(self, base_path: str):
+    def _create_slide_master(self, package: PackageWriter):
         """Create slide master"""
-        with open(os.path.join(base_path, "ppt", "slideMasters", "slideMaster1.xml"), "w", encoding="utf-8") as f:
-            f.write(self.templates.get_slide_master())
+        package.write_shared("ppt/slideMasters/slideMaster1.xml", self.templates.get_slide_master())
             
         # Master relationships
-        with open(os.path.join(base_path, "ppt", "slideMasters", "_rels", "slideMaster1.xml.rels"), "w", encoding="utf-8") as f:
-            f.write(self.templates.get_slide_master_relationships())
+        package.write_shared("ppt/slideMasters/_rels/slideMaster1.xml.rels", self.templates.get_slide_master_relationships())
             
-    def _create_slide_layout(self, base_path: str):
+    def _create_slide_layout(self, package: PackageWriter):
         """Create slide layout"""
-        with open(os.path.join(base_path, "ppt", "slideLayouts", "slideLayout1.xml"), "w", encoding="utf-8") as f:
-            f.write(self.templates.get_slide_layout())
+        package.write_shared("ppt/slideLayouts/slideLayout1.xml", self.templates.get_slide_layout())
             
         # Layout relationships
-        with open(os.path.join(base_path, "ppt", "slideLayouts", "_rels", "slideLayout1.xml.rels"), "w", encoding="utf-8") as f:
-            f.write(self.templates.get_slide_layout_relationships())
+        package.write_shared("ppt/slideLayouts/_rels/slideLayout1.xml.rels", self.templates.get_slide_layout_relationships())
+            
+    def _create_manifest(self, package: PackageWriter, manifest: List[Dict[str, Any]]):
+        """Create the manifest of slide digests read back by ``update``"""
+        package.write(MANIFEST_PART, json.dumps({
+            'version': MANIFEST_VERSION,
+            'compression': self.compression,
+            'slides': manifest
+        }, separators=(',', ':')).encode('utf-8'))
+            
+    def _create_slides_parallel(self, package: PackageWriter, slides: Iterable[Dict[str, Any]],
+                                manifest: List[Dict[str, Any]], previous: Optional[_PreviousSlides] = None):
+        """Render and compress slides in worker processes, writing them in order as they finish"""
+        if self._executor is None:
+            # Imported here: multiprocessing is only needed with more than one worker
+            from concurrent.futures import ProcessPoolExecutor
+            self._executor = ProcessPoolExecutor(max_workers=self.workers)
             
-    def _create_slide(self, base_path: str, slide_num: int, slide_data: Dict[str, Any]):
-        """Create individual slide"""
+        # Bound the batches in flight so a streamed deck is never held whole
+        pending: deque = deque()
+        max_pending = self.workers * 2
+        level = compression_level("ppt/slides/slide.xml", self.compression)
+        batch = []
+        first_slide = 1
+        for idx, slide_data in enumerate(slides, 1):
+            fields = self._slide_content(package, idx, slide_data)
+            digest = _slide_digest(fields)
+            batch.append((digest, previous.get(digest) if previous is not None else None, fields))
+            if len(batch) == _SLIDES_PER_TASK:
+                pending.append((first_slide, batch, self._submit_slides(batch, level)))
+                first_slide += len(batch)
+                batch = []
+                if len(pending) >= max_pending:
+                    self._write_rendered_slides(package, manifest, *pending.popleft())
+        if batch:
+            pending.append((first_slide, batch, self._submit_slides(batch, level)))
+        while pending:
+            self._write_rendered_slides(package, manifest, *pending.popleft())
+            
+    def _submit_slides(self, batch: List[tuple], level: Optional[int]) -> Optional['Future']:
+        """Hand the slides of a batch that have no reusable part to a worker"""
+        fields = [slide_fields for _, reused, slide_fields in batch if reused is None]
+        return self._executor.submit(_render_slides, fields, level) if fields else None
+        
+    def _write_rendered_slides(self, package: PackageWriter, manifest: List[Dict[str, Any]], first_slide: int,
+                               batch: List[tuple], rendered: Optional['Future']):
+        """Write a batch of slides, taking those not reused from the worker's result"""
+        parts = iter(rendered.result() if rendered is not None else ())
+        for slide_num, (digest, part, fields) in enumerate(batch, first_slide):
+            if part is None:
+                part = next(parts)
+                self.rendered_slides += 1
+            else:
+                self.reused_slides += 1
+            self._write_slide(package, manifest, slide_num, digest, part, fields[3])
+        
+    def _slide_content(self, package: PackageWriter, slide_num: int, slide_data: Dict[str, Any]) -> SlideFields:
+        """Return everything a slide is rendered from, writing images new to the package"""
+        pictures = []
+        for picture, path in self.media.slide_pictures(slide_data, (SLIDE_WIDTH, SLIDE_HEIGHT)):
+            name = picture.part_name
+            if name not in self._media_parts:
+                with self.media.open(path) as f:
+                    package.write(name, f.read())
+                self._media_parts[name] = picture.media_type
+            pictures.append(picture)
+        return self._slide_fields(slide_num, slide_data) + (tuple(pictures),)
+        
+    def _slide_fields(self, slide_num: int, slide_data: Dict[str, Any]) -> Tuple[str, str, str]:
+        """Return the title, subtitle and period shown on a slide"""
         slide_meta = slide_data.get('metadata', {})
         
         # Extract text content from elements if metadata is empty
@@ -240,24 +591,42 @@ class PPTXBuilder:
                 if hasattr(element, 'type') and element.type == 'h1' and hasattr(element, 'content'):
                     slide_meta['title'] = element.content
                     break
+                    
+        return (
+            slide_meta.get('title', 'Slide ' + str(slide_num)),
+            slide_meta.get('subtitle', ''),
+            slide_meta.get('period', '')
+        )
         
-        # Create slide XML
-        with open(os.path.join(base_path, "ppt", "slides", f"slide{slide_num}.xml"), "w", encoding="utf-8") as f:
-            f.write(self.templates.get_slide(
-                slide_meta.get('title', 'Slide ' + str(slide_num)),
-                slide_meta.get('subtitle', ''),
-                slide_meta.get('period', '')
-            ))
-            
-        # Create slide relationships
-        with open(os.path.join(base_path, "ppt", "slides", "_rels", f"slide{slide_num}.xml.rels"), "w", encoding="utf-8") as f:
-            f.write(self.templates.get_slide_relationships())
+    def _create_slide(self, package: PackageWriter, slide_num: int, slide_data: Dict[str, Any],
+                      manifest: List[Dict[str, Any]], previous: Optional[_PreviousSlides] = None):
+        """Create individual slide, copying it from ``previous`` when its content is unchanged"""
+        fields = self._slide_content(package, slide_num, slide_data)
+        digest = _slide_digest(fields)
+        part = previous.get(digest) if previous is not None else None
+        if part is None:
+            # Create slide XML
+            part = compress_part(
+                _slide_xml(fields),
+                compression_level(f"ppt/slides/slide{slide_num}.xml", self.compression)
+            )
+            self.rendered_slides += 1
+        else:
+            self.reused_slides += 1
+        self._write_slide(package, manifest, slide_num, digest, part, fields[3])
+        
+    def _write_slide(self, package: PackageWriter, manifest: List[Dict[str, Any]], slide_num: int, digest: str,
+                     part: CompressedPart, pictures: Sequence[Picture] = ()):
+        """Write a slide part and its relationships, recording it in the manifest"""
+        package.write_compressed(f"ppt/slides/slide{slide_num}.xml", part)
             
-    def _create_pptx_package(self, temp_dir: str, output_path: str):
-        """Package all files into PPTX"""
-        with zipfile.ZipFile(output_path, 'w', zipfile.ZIP_DEFLATED) as zipf:
-            for root, _, files in os.walk(temp_dir):
-                for file in files:
-                    file_path = os.path.join(root, file)
-                    arc_name = os.path.relpath(file_path, temp_dir)
-                    zipf.write(file_path, arc_name)
\ No newline at end of file
+        # Create slide relationships; every slide without images has the same ones
+        rels_name = f"ppt/slides/_rels/slide{slide_num}.xml.rels"
+        if pictures:
+            by_digest = {picture.digest: picture for picture in pictures}
+            package.write(rels_name, self.templates.get_slide_relationships([
+                (rid, by_digest[digest].part_name.rsplit('/', 1)[1]) for digest, rid in _picture_rids(pictures).items()
+            ]))
+        else:
+            package.write_shared(rels_name, self.templates.get_slide_relationships())
+        manifest.append({'digest': digest, 'crc': part.crc})
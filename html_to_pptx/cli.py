@@ -3,12 +3,22 @@
 Command Line Interface for HTML to PPTX Converter
 
 Usage:
-    python -m html_to_pptx.cli input.html [output.pptx] [--native]
+    python -m html_to_pptx.cli input.html [output.pptx] [--native] [--stream] [--parser BACKEND]
+    python -m html_to_pptx.cli --batch DIR_OR_GLOB [--jobs N] [--output-dir DIR]
+    python -m html_to_pptx.cli (input.html | --batch DIR_OR_GLOB) --watch
+    python -m html_to_pptx.cli --daemon [--socket PATH] | --stop-daemon
 """
 
+import json
+import os
+import signal
 import sys
+import time
 import argparse
-from .core.converter import HTMLtoPPTXConverter
+from typing import List, Optional
+from .core.daemon_client import DaemonClient, DaemonUnavailable
+from .parsers.backends import DEFAULT_BACKEND, PARSER_BACKENDS, available_backends
+from .builders.package import COMPRESSION_PROFILES, DEFAULT_COMPRESSION
 
 
 def main():
@@ -21,12 +31,23 @@ Examples:
   python -m html_to_pptx.cli input.html
   python -m html_to_pptx.cli input.html output.pptx
   python -m html_to_pptx.cli input.html --native
+  python -m html_to_pptx.cli input.html --stream
+  python -m html_to_pptx.cli input.html --parser lxml
+  python -m html_to_pptx.cli input.html --mmap
+  python -m html_to_pptx.cli input.html --native --compression fast
+  python -m html_to_pptx.cli input.html output.pptx --native --update
+  python -m html_to_pptx.cli --batch pjt/softbank_ai_agents/slides --jobs 4
+  python -m html_to_pptx.cli --batch "pjt/**/*.html" --output-dir out
+  python -m html_to_pptx.cli --batch "pjt/*/slides" --watch --native --update
+  python -m html_to_pptx.cli --daemon &
+  python -m html_to_pptx.cli --stop-daemon
         '''
     )
     
     parser.add_argument(
         'input',
-        help='Input HTML file path'
+        nargs='?',
+        help='Input HTML file path (omit with --batch)'
     )
     
     parser.add_argument(
@@ -41,6 +62,143 @@ Examples:
         help='Use native XML generation instead of python-pptx library'
     )
     
+    parser.add_argument(
+        '--stream',
+        action='store_true',
+        help='Parse and build one slide at a time to keep memory usage low'
+    )
+    
+    parser.add_argument(
+        '--parser',
+        choices=sorted(PARSER_BACKENDS),
+        default=DEFAULT_BACKEND,
+        help=f'HTML parser backend (default: {DEFAULT_BACKEND}; lxml requires the lxml package)'
+    )
+    
+    parser.add_argument(
+        '--cache-dir',
+        metavar='DIR',
+        help='Reuse parsed slides from an on-disk cache in DIR when the HTML is unchanged'
+    )
+    
+    parser.add_argument(
+        '--incremental',
+        action='store_true',
+        help='With --cache-dir, reparse only the slides that changed since the last run'
+    )
+    
+    parser.add_argument(
+        '--workers',
+        type=int,
+        default=1,
+        metavar='N',
+        help='Parse slides in N worker processes (default: 1)'
+    )
+    
+    parser.add_argument(
+        '--mmap',
+        action='store_true',
+        help='Memory-map the input file and decode it one slide at a time'
+    )
+    
+    parser.add_argument(
+        '--compression',
+        choices=list(COMPRESSION_PROFILES),
+        default=DEFAULT_COMPRESSION,
+        help=f'Compression profile for native output (default: {DEFAULT_COMPRESSION}); '
+             'images are always stored uncompressed'
+    )
+    
+    parser.add_argument(
+        '--update',
+        action='store_true',
+        help='With --native, re-render only the slides that changed since OUTPUT was built'
+    )
+    
+    parser.add_argument(
+        '--downscale-images',
+        action='store_true',
+        help='Downscale embedded images to twice their rendered size (requires Pillow); '
+             'with --cache-dir, resized images are kept for later runs'
+    )
+    
+    parser.add_argument(
+        '--deterministic',
+        action='store_true',
+        help='Produce byte-identical output for identical input (fixed timestamps; '
+             'honours SOURCE_DATE_EPOCH)'
+    )
+    
+    parser.add_argument(
+        '--batch',
+        metavar='DIR_OR_GLOB',
+        help='Convert every *.html file in a directory, or every file matching a glob '
+             '("**" matches subdirectories), printing one JSON status line per file'
+    )
+    
+    parser.add_argument(
+        '--jobs',
+        type=int,
+        default=os.cpu_count() or 1,
+        metavar='N',
+        help='With --batch, convert files in N worker processes (default: number of CPUs)'
+    )
+    
+    parser.add_argument(
+        '--output-dir',
+        metavar='DIR',
+        help='With --batch, write PPTX files to DIR instead of next to their inputs'
+    )
+    
+    parser.add_argument(
+        '--watch',
+        action='store_true',
+        help='Keep running and reconvert the input (or --batch decks) whenever it is saved, '
+             'printing one JSON status line per reconverted deck'
+    )
+    
+    parser.add_argument(
+        '--debounce',
+        type=float,
+        default=0.3,
+        metavar='SECONDS',
+        help='With --watch, wait until saves pause for SECONDS before reconverting (default: 0.3)'
+    )
+    
+    parser.add_argument(
+        '--daemon',
+        action='store_true',
+        help='Run a conversion daemon in the foreground; later single-file runs forward '
+             'their conversions to it while it is running'
+    )
+    
+    parser.add_argument(
+        '--socket',
+        metavar='PATH',
+        help='Unix socket of the daemon (default: $HTML_TO_PPTX_SOCKET, else a per-user path)'
+    )
+    
+    parser.add_argument(
+        '--queue-size',
+        type=int,
+        default=64,
+        metavar='N',
+        help='With --daemon, reject conversions beyond N waiting jobs (default: 64); '
+             'rejected files are converted by the client'
+    )
+    
+    parser.add_argument(
+        '--no-daemon',
+        action='store_true',
+        help='Convert in this process even when a daemon is running'
+    )
+    
+    parser.add_argument(
+        '--stop-daemon',
+        action='store_true',
+        help='Stop the running daemon'
+    )
+    
     parser.add_argument(
         '--version',
         action='version',
@@ -48,16 +206,168 @@ Examples:
     )
     
     args = parser.parse_args()
+    if args.incremental and not args.cache_dir:
+        parser.error('--incremental requires --cache-dir')
+    if args.daemon or args.stop_daemon:
+        if args.input is not None or args.batch is not None or args.watch:
+            parser.error('--daemon and --stop-daemon do not take inputs')
+    elif args.batch is None and args.input is None:
+        parser.error('an input file or --batch is required')
+    if args.batch is not None and (args.input is not None or args.output is not None):
+        parser.error('--batch does not take input or output file arguments')
+    if args.jobs < 1:
+        parser.error('--jobs must be at least 1')
+    if args.queue_size < 1:
+        parser.error('--queue-size must be at least 1')
+    if not available_backends()[args.parser]:
+        parser.error(f'--parser {args.parser} requires the {args.parser} package: pip install {args.parser}')
+    
+    options = dict(
+        use_native=args.native,
+        streaming=args.stream,
+        parser=args.parser,
+        cache_dir=args.cache_dir,
+        incremental=args.incremental,
+        workers=args.workers,
+        mmap_input=args.mmap,
+        compression=args.compression,
+        update=args.update,
+        downscale_images=args.downscale_images,
+        deterministic=args.deterministic
+    )
+    
+    if args.daemon:
+        sys.exit(run_daemon(args))
+    if args.stop_daemon:
+        stopped = DaemonClient(args.socket).shutdown()
+        print("Daemon stopped" if stopped else "No daemon is running", file=sys.stderr)
+        sys.exit(0 if stopped else 1)
+    if args.watch:
+        sys.exit(run_watch(args, options))
+    if args.batch is not None:
+        sys.exit(run_batch(parser, args, options))
+        
+    # Hand the file to a running daemon
+    output = args.output or os.path.splitext(args.input)[0] + '.pptx'
+    results = forward_to_daemon(args, [(args.input, output)], options)
+    if results and not results[0].get('rejected'):
+        if results[0]['ok']:
+            print(f"Successfully created: {output}")
+        else:
+            # Same message as a local conversion, without the exception type
+            print(f"Error during conversion: {results[0]['error'].split(': ', 1)[-1]}")
+        sys.exit(0 if results[0]['ok'] else 1)
+        
+    # Imported only now: --version, --help and daemon hand-offs never load the converter
+    from .core.converter import HTMLtoPPTXConverter
     
     # Create converter
-    converter = HTMLtoPPTXConverter(use_native=args.native)
+    converter = HTMLtoPPTXConverter(**options)
     
     # Convert file
-    success = converter.convert_file(args.input, args.output)
+    try:
+        success = converter.convert_file(args.input, args.output)
+    finally:
+        converter.close()
     
     # Exit with appropriate code
     sys.exit(0 if success else 1)
 
 
+def run_batch(parser: argparse.ArgumentParser, args: argparse.Namespace, options: dict) -> int:
+    """Convert the files selected by --batch, printing a JSON line per file; returns the exit code"""
+    from .core.batch import batch_outputs, convert_batch, find_batch_inputs
+    
+    inputs = find_batch_inputs(args.batch)
+    if not inputs:
+        parser.error(f'--batch matched no files: {args.batch}')
+        
+    # Batches are never forwarded: the daemon converts on a single thread, while
+    # --jobs spreads the files over as many processes here
+    jobs = batch_outputs(inputs, args.output_dir)
+    failed = 0
+    for result in convert_batch(jobs, args.jobs, options):
+        failed += not result['ok']
+        print(json.dumps(result, ensure_ascii=False), flush=True)
+    return 1 if failed else 0
+
+
+def forward_to_daemon(args: argparse.Namespace, jobs: list, options: dict) -> Optional[List[dict]]:
+    """Convert jobs in the running daemon; returns their records, or None if no daemon is running"""
+    if args.no_daemon:
+        return None
+    # The daemon resolves paths from its own working directory
+    options = dict(options, cache_dir=os.path.abspath(args.cache_dir) if args.cache_dir else None)
+    try:
+        results = DaemonClient(args.socket).convert(jobs, options)
+    except DaemonUnavailable:
+        return None
+    for result in results:
+        result.pop('id', None)
+    return results
+
+
+def run_daemon(args: argparse.Namespace) -> int:
+    """Serve conversions until stopped; returns the exit code"""
+    from .core.daemon import ConversionDaemon
+    
+    daemon = ConversionDaemon(args.socket, max_queue=args.queue_size)
+    signal.signal(signal.SIGTERM, lambda signum, frame: daemon.shutdown())
+    print(f"Starting conversion daemon on {daemon.path} (pid {os.getpid()})", file=sys.stderr, flush=True)
+    try:
+        daemon.serve_forever()
+    except RuntimeError as e:
+        print(f"Error: {e}", file=sys.stderr)
+        return 1
+    except KeyboardInterrupt:
+        pass
+    finally:
+        daemon.shutdown()
+    return 0
+
+
+def run_watch(args: argparse.Namespace, options: dict) -> int:
+    """Reconvert watched decks as they change until interrupted; returns the exit code"""
+    from .core.batch import batch_outputs, convert_one
+    from .core.converter import HTMLtoPPTXConverter
+    from .core.watch import DeckWatcher
+    
+    target = args.batch if args.batch is not None else args.input
+    watcher = DeckWatcher(target, debounce=args.debounce)
+    # One warm converter serves every reconversion
+    converter = HTMLtoPPTXConverter(**options)
+    
+    def outputs(decks):
+        if args.batch is None:
+            return [(args.input, args.output or os.path.splitext(args.input)[0] + '.pptx')]
+        return batch_outputs(decks, args.output_dir)
+        
+    def convert(jobs):
+        for html_file, output_file in jobs:
+            result = convert_one(converter, html_file, output_file)
+            try:
+                # Time from the save to the finished output
+                result['latency'] = round(time.time() - os.stat(html_file).st_mtime, 3)
+            except OSError:
+                result['latency'] = None
+            print(json.dumps(result, ensure_ascii=False), flush=True)
+            
+    print(f"Watching {target} ({watcher.backend}), press Ctrl+C to stop", file=sys.stderr, flush=True)
+    try:
+        # Bring stale or missing outputs up to date first
+        convert([
+            (html_file, output_file) for html_file, output_file in outputs(watcher.decks())
+            if not os.path.exists(output_file) or os.path.getmtime(output_file) < os.path.getmtime(html_file)
+        ])
+        for changed in watcher.changes():
+            convert([job for job in outputs(watcher.decks()) if job[0] in changed])
+    except KeyboardInterrupt:
+        pass
+    finally:
+        watcher.close()
+        converter.close()
+    return 0
+
+
 if __name__ == '__main__':
-    main()
\ No newline at end of file
+    main()
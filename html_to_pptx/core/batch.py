@@ -0,0 +1,120 @@
+"""
+Batch Conversion Module
+
+Converts many HTML decks in one process launch. Files are spread over a pool of
+worker processes, each of which keeps a single converter for all the files it is
+given, so interpreter startup, imports and per-process caches (template
+prototypes, compressed shared parts) are paid once per worker rather than once
+per deck. Results are reported per file as soon as each one finishes.
+"""
+
+import glob
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+from .converter import HTMLtoPPTXConverter
+
+# Converter reused by every file converted in a worker process
+_worker_converter: Optional[HTMLtoPPTXConverter] = None
+
+
+def find_batch_inputs(pattern: str) -> List[str]:
+    """
+    Expand a batch input into HTML files
+
+    Args:
+        pattern: Directory (its ``*.html`` files are converted) or glob pattern;
+            ``**`` matches subdirectories
+
+    Returns:
+        Sorted file paths
+    """
+    if os.path.isdir(pattern):
+        pattern = os.path.join(pattern, '*.html')
+    return sorted(path for path in glob.glob(pattern, recursive=True) if os.path.isfile(path))
+
+
+def batch_outputs(inputs: List[str], output_dir: Optional[str] = None) -> List[Tuple[str, str]]:
+    """
+    Pair each input with its output path
+
+    Args:
+        inputs: HTML file paths
+        output_dir: Directory for the PPTX files, mirroring the inputs' layout below
+            their common directory; when None, each file is written next to its input
+
+    Returns:
+        (input, output) pairs
+    """
+    if output_dir is None or not inputs:
+        return [(path, os.path.splitext(path)[0] + '.pptx') for path in inputs]
+    base = os.path.commonpath([os.path.dirname(os.path.abspath(path)) for path in inputs])
+    return [
+        (path, os.path.join(output_dir, os.path.splitext(os.path.relpath(os.path.abspath(path), base))[0] + '.pptx'))
+        for path in inputs
+    ]
+
+
+def _init_worker(options: Dict[str, Any]):
+    """Worker initializer: create the converter shared by the worker's files"""
+    global _worker_converter
+    _worker_converter = HTMLtoPPTXConverter(**options)
+
+
+def convert_one(converter: HTMLtoPPTXConverter, html_file: str, output_file: str) -> Dict[str, Any]:
+    """
+    Convert one file and describe the outcome
+
+    Returns:
+        Record with ``input``, ``output``, ``ok``, ``error`` (exception type and
+        message, or None) and ``seconds`` keys
+    """
+    started = time.perf_counter()
+    result = {'input': html_file, 'output': output_file, 'ok': True, 'error': None}
+    try:
+        output_dir = os.path.dirname(output_file)
+        if output_dir:
+            os.makedirs(output_dir, exist_ok=True)
+        converter._convert(html_file, output_file)
+    except Exception as e:
+        result['ok'] = False
+        result['error'] = f"{type(e).__name__}: {e}"
+    result['seconds'] = round(time.perf_counter() - started, 3)
+    return result
+
+
+def _convert_in_worker(html_file: str, output_file: str) -> Dict[str, Any]:
+    """Worker task: convert one file with the worker's converter"""
+    return convert_one(_worker_converter, html_file, output_file)
+
+
+def convert_batch(jobs: List[Tuple[str, str]], workers: int = 1,
+                  options: Optional[Dict[str, Any]] = None) -> Iterator[Dict[str, Any]]:
+    """
+    Convert many files, yielding a status record for each as it finishes
+
+    Args:
+        jobs: (input, output) path pairs
+        workers: Number of worker processes; 1 converts in this process
+        options: Keyword arguments for the HTMLtoPPTXConverter of each worker
+
+    Returns:
+        Iterator of records with ``input``, ``output``, ``ok``, ``error`` and
+        ``seconds`` keys, in completion order
+    """
+    options = options or {}
+    if workers <= 1 or len(jobs) <= 1:
+        _init_worker(options)
+        try:
+            for html_file, output_file in jobs:
+                yield _convert_in_worker(html_file, output_file)
+        finally:
+            _worker_converter.close()
+        return
+
+    with ProcessPoolExecutor(max_workers=min(workers, len(jobs)), initializer=_init_worker,
+                             initargs=(options,)) as executor:
+        futures = [executor.submit(_convert_in_worker, html_file, output_file) for html_file, output_file in jobs]
+        for future in as_completed(futures):
+            yield future.result()
@@ -0,0 +1,250 @@
+"""
+Parse Cache Module
+
+On-disk cache of parsed slides keyed by a hash of the HTML and the parser version.
+Entries are zlib-compressed node arrays and are evicted least-recently-used once
+the cache exceeds its size budget. The blobs that cached slides refer to and
+resized media count toward the same budget and are evicted alongside the entries;
+an entry whose blobs are gone is treated as a miss.
+
+The total size is measured by walking the directories once and then kept up to
+date as entries are written, so a put costs no directory walk; the walk is
+repeated only when the running total exceeds the budget, or once RESCAN_SECONDS
+have passed, to pick up resized media and files written by other processes.
+Eviction never removes the entries and blobs of the document being stored.
+"""
+
+import hashlib
+import os
+import tempfile
+import time
+import zlib
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Set, Tuple
+from ..parsers import serialization
+from ..parsers.html_parser import PARSER_VERSION
+from ..utils.blobs import BLOB_SCHEME, BlobStore
+
+# Longest time the running size total is trusted before the directories are walked again
+RESCAN_SECONDS = 60.0
+
+
+class ParseCache:
+    """Size-bounded LRU cache of parsed slides stored as files in a directory"""
+
+    SUFFIX = '.slides'
+
+    def __init__(self, directory: str, max_bytes: int = 256 * 1024 * 1024,
+                 blob_store: Optional[BlobStore] = None, media_dir: Optional[str] = None):
+        """
+        Initialize the cache
+
+        Args:
+            directory: Directory holding cache entries (created if missing)
+            max_bytes: Total size budget of the entries, blobs and media; the least
+                recently used files are evicted beyond it
+            blob_store: Store that cached slides refer to for inline images
+            media_dir: Directory of resized images (see ``ResizeCache``)
+        """
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self.blob_store = blob_store
+        self.media_dir = media_dir
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        os.makedirs(directory, exist_ok=True)
+        # Running size of entries, blobs and media; None until first measured
+        self._total: Optional[int] = None
+        self._measured_at = 0.0
+
+    @staticmethod
+    def key_for(html_bytes: bytes) -> str:
+        """Return the cache key for an HTML document"""
+        digest = hashlib.sha256()
+        digest.update(f"{PARSER_VERSION}:{serialization.FORMAT_VERSION}\0".encode('ascii'))
+        digest.update(html_bytes)
+        return digest.hexdigest()
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.directory, key + self.SUFFIX)
+
+    def get(self, key: str) -> Optional[Tuple[List[Dict[str, Any]], Dict[str, str]]]:
+        """
+        Look up parsed slides
+
+        Returns:
+            (slides, metadata) on a hit, None on a miss
+        """
+        path = self._path(key)
+        try:
+            with open(path, 'rb') as f:
+                data = f.read()
+            result = serialization.loads(zlib.decompress(data))
+        except (OSError, ValueError, EOFError, TypeError, zlib.error):
+            self.misses += 1
+            return None
+        if not self._touch_blobs(result[0]):
+            # A blob the slides refer to was evicted
+            self.misses += 1
+            return None
+
+        # Touch the entry so eviction sees it as recently used
+        try:
+            os.utime(path)
+        except OSError:
+            pass
+        self.hits += 1
+        return result
+
+    def put(self, key: str, slides: List[Dict[str, Any]], metadata: Dict[str, str], evict: bool = True):
+        """
+        Store parsed slides, evicting old files if over budget
+
+        Args:
+            key: Cache key
+            slides: Parsed slides
+            metadata: Document metadata
+            evict: Evict right away; pass False when storing several entries for one
+                document and call ``evict`` once at the end
+        """
+        data = zlib.compress(serialization.dumps(slides, metadata), 1)
+        path = self._path(key)
+        fd, temp_path = tempfile.mkstemp(dir=self.directory, suffix='.tmp')
+        try:
+            with os.fdopen(fd, 'wb') as f:
+                f.write(data)
+            try:
+                replaced = os.path.getsize(path)
+            except OSError:
+                replaced = 0
+            os.replace(temp_path, path)
+        except OSError:
+            if os.path.exists(temp_path):
+                os.unlink(temp_path)
+            return
+        if self._total is not None:
+            # Blobs shared with other entries are counted again; the next walk corrects it
+            self._total += len(data) - replaced + sum(self._sizes(self._blob_paths(slides)))
+        if evict:
+            self.evict([key], slides)
+
+    def evict(self, keys: Iterable[str] = (), slides: Iterable[Dict[str, Any]] = ()):
+        """
+        Remove least recently used files until the cache fits its budget
+
+        Args:
+            keys: Entries that must be kept (those of the document being stored)
+            slides: Slides whose blobs must be kept
+        """
+        if (self._total is not None and self._total <= self.max_bytes
+                and time.monotonic() - self._measured_at < RESCAN_SECONDS):
+            return
+        entries = self._files()
+        total = sum(size for _, size, _ in entries)
+        self._measured_at = time.monotonic()
+        if total > self.max_bytes:
+            keep = {self._path(key) for key in keys} | set(self._blob_paths(slides))
+            entries.sort()
+            for _, size, path in entries:
+                if total <= self.max_bytes:
+                    break
+                if path in keep:
+                    continue
+                try:
+                    os.unlink(path)
+                except OSError:
+                    continue
+                total -= size
+                self.evictions += 1
+        self._total = total
+
+    def _blob_handles(self, slides: Iterable[Dict[str, Any]]) -> Iterator[str]:
+        """Yield the blob handles that slides refer to"""
+        stack = [element for slide in slides for element in slide['elements']]
+        while stack:
+            element = stack.pop()
+            for _, value in element.attribute_items():
+                if value and value.startswith(BLOB_SCHEME):
+                    yield value
+            stack.extend(element.children)
+
+    def _blob_paths(self, slides: Iterable[Dict[str, Any]]) -> Set[str]:
+        """Return the files of the blobs that slides refer to"""
+        if self.blob_store is None or self.blob_store.directory is None:
+            return set()
+        paths = set()
+        for handle in self._blob_handles(slides):
+            try:
+                paths.add(self.blob_store.path(handle))
+            except ValueError:
+                continue
+        return paths
+
+    @staticmethod
+    def _sizes(paths: Iterable[str]) -> Iterator[int]:
+        """Yield the sizes of the files that still exist"""
+        for path in paths:
+            try:
+                yield os.path.getsize(path)
+            except OSError:
+                continue
+
+    def _touch_blobs(self, slides: List[Dict[str, Any]]) -> bool:
+        """Mark the blobs of cached slides as used; False if any of them is missing"""
+        if self.blob_store is None:
+            return True
+        return all(self.blob_store.touch(handle) for handle in self._blob_handles(slides))
+
+    def _entries(self) -> List[Tuple[float, int, str]]:
+        """List cache entries as (mtime, size, path)"""
+        entries = []
+        with os.scandir(self.directory) as it:
+            for entry in it:
+                if entry.name.endswith(self.SUFFIX):
+                    try:
+                        stat = entry.stat()
+                    except OSError:
+                        continue
+                    entries.append((stat.st_mtime, stat.st_size, entry.path))
+        return entries
+
+    def _files(self) -> List[Tuple[float, int, str]]:
+        """List entries, blobs and resized media as (mtime, size, path)"""
+        files = self._entries()
+        shared = [self.media_dir]
+        if self.blob_store is not None:
+            shared.append(self.blob_store.directory)
+        for directory in shared:
+            if not directory or not os.path.isdir(directory):
+                continue
+            # Both stores file data as <directory>/<hex[:2]>/<hex>
+            for root, _, names in os.walk(directory):
+                for name in names:
+                    if name.endswith('.tmp'):
+                        continue
+                    path = os.path.join(root, name)
+                    try:
+                        stat = os.stat(path)
+                    except OSError:
+                        continue
+                    files.append((stat.st_mtime, stat.st_size, path))
+        return files
+
+    def clear(self):
+        """Remove every cache entry"""
+        for _, _, path in self._entries():
+            try:
+                os.unlink(path)
+            except OSError:
+                pass
+        self._total = None
+
+    def stats(self) -> Dict[str, int]:
+        """Return hit/miss/eviction counters, the entry count and the size including blobs and media"""
+        return {
+            'hits': self.hits,
+            'misses': self.misses,
+            'evictions': self.evictions,
+            'entries': len(self._entries()),
+            'bytes': sum(size for _, size, _ in self._files())
+        }
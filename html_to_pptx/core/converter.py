@@ -4,26 +4,133 @@ Main Converter Module
 Orchestrates the HTML to PPTX conversion process.
 """
 
+import io
+import mmap
 import os
-from typing import Optional
-from ..parsers.html_parser import SlideHTMLParser
+import threading
+from typing import TYPE_CHECKING, Dict, Iterable, Iterator, Any, BinaryIO, Optional, TextIO, Tuple, Union
+from ..parsers.backends import DEFAULT_BACKEND, create_parser
+from ..parsers.prescan import Source, find_slide_spans, iter_source_text
 from ..builders.pptx_builder import PPTXBuilder
+from ..builders.package import DEFAULT_COMPRESSION
+from ..utils.blobs import BlobStore
+from .cache import ParseCache
+from .incremental import IncrementalParser
+from .parallel import ParallelParser
+
+if TYPE_CHECKING:
+    from concurrent.futures import Executor
+
+
+# Exceptions lxml raises on HTML it cannot parse, matched by name so lxml is not imported
+_LXML_PARSE_ERRORS = frozenset({'ParserError', 'ParseError', 'XMLSyntaxError'})
+
+
+def _is_parse_error(error: Exception) -> bool:
+    """Return whether an exception was raised by a parser rejecting its input"""
+    return type(error).__module__.startswith('lxml') and type(error).__name__ in _LXML_PARSE_ERRORS
+
+
+class ConversionError(Exception):
+    """
+    Conversion failure described in structured form
+    
+    Attributes:
+        kind: Category of the failure: 'not_found' (input file missing), 'invalid_input'
+            (the input could not be decoded or parsed), 'io' (reading or writing
+            failed) or 'internal' (anything else)
+        error_type: Name of the exception that caused the failure
+        message: Human-readable description
+        source: Input file path, or None when converting an HTML string
+    """
+    
+    def __init__(self, kind: str, error_type: str, message: str, source: Optional[str] = None):
+        super().__init__(message)
+        self.kind = kind
+        self.error_type = error_type
+        self.message = message
+        self.source = source
+        
+    @classmethod
+    def from_exception(cls, error: Exception, source: Optional[str] = None) -> 'ConversionError':
+        """Describe the exception a conversion raised"""
+        if isinstance(error, ConversionError):
+            return error
+        if isinstance(error, FileNotFoundError):
+            kind = 'not_found'
+        elif isinstance(error, UnicodeError) or _is_parse_error(error):
+            kind = 'invalid_input'
+        elif isinstance(error, OSError):
+            kind = 'io'
+        else:
+            kind = 'internal'
+        return cls(kind, type(error).__name__, str(error), source)
+        
+    def to_dict(self) -> Dict[str, Optional[str]]:
+        """Return the failure as a JSON-serializable dict"""
+        return {'kind': self.kind, 'error_type': self.error_type, 'message': self.message, 'source': self.source}
 
 
 class HTMLtoPPTXConverter:
     """Main converter class for HTML to PPTX conversion"""
     
-    def __init__(self, use_native: bool = False):
+    def __init__(self, use_native: bool = False, streaming: bool = False, parser: str = DEFAULT_BACKEND,
+                 cache_dir: Optional[str] = None, incremental: bool = False, workers: int = 1,
+                 mmap_input: bool = False, blob_dir: Optional[str] = None,
+                 compression: str = DEFAULT_COMPRESSION, update: bool = False, downscale_images: bool = False,
+                 deterministic: bool = False):
         """
         Initialize the converter
         
         Args:
             use_native: Force native XML generation even if python-pptx is available
+            streaming: Parse input files slide by slide instead of reading them whole
+            parser: HTML parser backend ('html.parser' or 'lxml')
+            cache_dir: Directory for the on-disk parse cache (disabled when None);
+                not used in streaming mode
+            incremental: Cache individual slides and reparse only the changed ones
+                (requires cache_dir)
+            workers: Number of processes used to parse the slides of a document
+            mmap_input: Memory-map input files and decode them one slide span at a
+                time instead of reading them into a single string
+            blob_dir: Directory of the content-addressed store that inline data URIs
+                are spilled to (defaults to a "blobs" directory inside cache_dir, or
+                a temporary directory)
+            compression: Compression profile of native packages ('fast', 'balanced',
+                'smallest' or 'stored')
+            update: Update an existing output file built in native mode, re-rendering
+                only the slides that changed (see ``PPTXBuilder.update``)
+            downscale_images: Downscale embedded images to twice their rendered size
+                (requires Pillow); resized images are cached in a "media" directory
+                inside cache_dir when it is set
+            deterministic: Produce byte-identical output for identical input (fixed
+                ZIP timestamps, see ``PPTXBuilder``)
         """
-        self.parser = SlideHTMLParser()
-        self.builder = PPTXBuilder(use_native=use_native)
+        if blob_dir is None and cache_dir:
+            # Cached slides refer to blobs, so they must outlive this converter
+            blob_dir = os.path.join(cache_dir, 'blobs')
+        self.blob_store = BlobStore(blob_dir)
+        self.parser = create_parser(parser, self.blob_store)
+        media_dir = os.path.join(cache_dir, 'media') if cache_dir else None
+        self.builder = PPTXBuilder(
+            use_native=use_native, compression=compression, blob_store=self.blob_store,
+            downscale_images=downscale_images, media_cache_dir=media_dir,
+            deterministic=deterministic
+        )
+        self.streaming = streaming
+        # Blobs and resized media live in the cache directory and share its size budget
+        self.cache = ParseCache(cache_dir, blob_store=self.blob_store, media_dir=media_dir) if cache_dir else None
+        self.incremental = IncrementalParser(self.parser, self.cache) if incremental and self.cache else None
+        self.parallel = ParallelParser(workers, parser, self.blob_store) if workers > 1 else None
+        self.mmap_input = mmap_input
+        self.update = update
+        # Failure of the last ``convert`` call, or None if it succeeded
+        self.last_error: Optional[ConversionError] = None
+        # The parser and builder hold per-document state, so conversions take turns
+        self._lock = threading.Lock()
         
-    def convert(self, html_input: str, output_path: str, is_file: bool = True) -> bool:
+    def convert(self, html_input: str, output_path: str, is_file: bool = True,
+                base_dir: Optional[str] = None) -> bool:
         """
         Convert HTML to PPTX
         
@@ -31,34 +138,188 @@ class HTMLtoPPTXConverter:
             html_input: Path to HTML file or HTML content string
             output_path: Path to save the PPTX file
             is_file: Whether html_input is a file path (True) or content string (False)
+            base_dir: Directory that local image paths are resolved against (defaults
+                to the HTML file's directory; local images of an HTML string are not
+                embedded unless it is given)
             
         Returns:
             bool: True if conversion successful, False otherwise
         """
+        self.last_error = None
         try:
-            # Get HTML content
-            if is_file:
-                if not os.path.exists(html_input):
-                    raise FileNotFoundError(f"HTML file not found: {html_input}")
-                with open(html_input, 'r', encoding='utf-8') as f:
-                    html_content = f.read()
-            else:
-                html_content = html_input
-                
-            # Parse HTML
-            slides = self.parser.parse(html_content)
-            metadata = self.parser.get_metadata()
-            
-            # Build PPTX
-            self.builder.build(slides, output_path, metadata)
-            
+            self._convert(html_input, output_path, is_file, base_dir)
             print(f"Successfully created: {output_path}")
             return True
             
         except Exception as e:
+            self.last_error = ConversionError.from_exception(e, html_input if is_file else None)
             print(f"Error during conversion: {str(e)}")
             return False
             
+    def convert_to_bytes(self, html_content: str, base_dir: Optional[str] = None) -> bytes:
+        """
+        Convert an HTML string to a PPTX package in memory
+        
+        Nothing is printed and no output file is written; the package is assembled
+        in a buffer and inline images are kept in memory. Local image files are
+        only embedded when ``base_dir`` is given, and ``update`` does not apply.
+        
+        Args:
+            html_content: HTML content as string
+            base_dir: Directory that local image paths are resolved against
+            
+        Returns:
+            bytes: The PPTX package
+            
+        Raises:
+            ConversionError: If the conversion fails
+        """
+        output = io.BytesIO()
+        try:
+            self._convert(html_content, output, is_file=False, base_dir=base_dir)
+        except Exception as e:
+            raise ConversionError.from_exception(e) from e
+        return output.getvalue()
+        
+    async def convert_to_bytes_async(self, html_content: str, executor: Optional['Executor'] = None,
+                                     base_dir: Optional[str] = None) -> bytes:
+        """
+        Convert an HTML string to PPTX bytes without blocking the event loop
+        
+        Runs ``convert_to_bytes`` in a thread pool. Conversions on one converter run
+        one at a time; use a converter per concurrent request to overlap them.
+        
+        Args:
+            html_content: HTML content as string
+            executor: Executor to run the conversion in (defaults to the event loop's
+                default thread pool)
+            base_dir: Directory that local image paths are resolved against
+            
+        Returns:
+            bytes: The PPTX package
+            
+        Raises:
+            ConversionError: If the conversion fails
+        """
+        import asyncio
+        
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(executor, self.convert_to_bytes, html_content, base_dir)
+            
+    def close(self):
+        """Stop the worker processes of the parser and builder and remove temporary files"""
+        if self.parallel is not None:
+            self.parallel.shutdown()
+        self.builder.shutdown()
+        self.builder.media.cleanup()
+        self.blob_store.cleanup()
+        
+    def _convert(self, html_input: str, output: Union[str, BinaryIO], is_file: bool = True,
+                 base_dir: Optional[str] = None):
+        """Convert HTML to PPTX, raising on failure"""
+        with self._lock:
+            try:
+                self._convert_input(html_input, output, is_file, base_dir)
+            finally:
+                # Nothing refers to this document's images any more; blobs that
+                # cached slides refer to live in the cache directory and are kept
+                self.builder.media.release()
+                self.blob_store.cleanup()
+            
+    def _convert_input(self, html_input: str, output_path: Union[str, BinaryIO], is_file: bool,
+                       base_dir: Optional[str] = None):
+        """Convert a file or HTML string to a path or binary file object"""
+        # Relative image paths are resolved against the HTML file's directory
+        if base_dir is None and is_file:
+            base_dir = os.path.dirname(os.path.abspath(html_input))
+        self.builder.media.base_dir = base_dir
+        
+        # Stream slides straight from the file into the builder
+        if is_file and self.streaming:
+            if not os.path.exists(html_input):
+                raise FileNotFoundError(f"HTML file not found: {html_input}")
+            metadata = {}
+            with open(html_input, 'r', encoding='utf-8') as f:
+                self._build(self._stream_slides(f, metadata), output_path, metadata)
+            return
+            
+        # Parse straight from the mapped file; it must stay mapped until built
+        if is_file and self.mmap_input:
+            if not os.path.exists(html_input):
+                raise FileNotFoundError(f"HTML file not found: {html_input}")
+            with open(html_input, 'rb') as f:
+                if os.fstat(f.fileno()).st_size == 0:
+                    buffer = b''
+                else:
+                    buffer = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+                try:
+                    slides, metadata = self._parse(buffer)
+                    self._build(slides, output_path, metadata)
+                finally:
+                    if isinstance(buffer, mmap.mmap):
+                        buffer.close()
+            return
+            
+        # Get HTML content
+        if is_file:
+            if not os.path.exists(html_input):
+                raise FileNotFoundError(f"HTML file not found: {html_input}")
+            with open(html_input, 'r', encoding='utf-8') as f:
+                html_content = f.read()
+        else:
+            html_content = html_input
+            
+        # Parse HTML
+        slides, metadata = self._parse(html_content)
+        
+        # Build PPTX
+        self._build(slides, output_path, metadata)
+            
+    def _build(self, slides: Iterable[Dict[str, Any]], output_path: Union[str, BinaryIO], metadata: Dict[str, str]):
+        """Build the output file (or write to a file object), updating a file in place when requested"""
+        if not isinstance(output_path, str):
+            self.builder.build_to(slides, output_path, metadata)
+        elif self.update:
+            self.builder.update(slides, output_path, metadata)
+        else:
+            self.builder.build(slides, output_path, metadata)
+            
+    def _parse(self, html_content: Source) -> Tuple[Iterable[Dict[str, Any]], Dict[str, str]]:
+        """Parse HTML text or a UTF-8 buffer, going through the parse cache when enabled"""
+        if self.cache is None:
+            return self._parse_uncached(html_content)
+            
+        key = self.cache.key_for(html_content.encode('utf-8') if isinstance(html_content, str) else html_content)
+        cached = self.cache.get(key)
+        if cached is not None:
+            return cached
+            
+        slides, metadata = self._parse_uncached(html_content)
+        slides = list(slides)
+        self.cache.put(key, slides, metadata)
+        return slides, metadata
+        
+    def _parse_uncached(self, html_content: Source) -> Tuple[Iterable[Dict[str, Any]], Dict[str, str]]:
+        """Parse HTML with the configured parser; metadata is complete once slides are consumed"""
+        parser = self.incremental or self.parallel
+        if parser is None and not isinstance(html_content, str):
+            metadata = {}
+            return self._buffer_slides(html_content, metadata), metadata
+            
+        parser = parser or self.parser
+        slides = parser.parse(html_content)
+        return slides, parser.get_metadata()
+        
+    def _buffer_slides(self, buffer: Source, metadata: Dict[str, str]) -> Iterator[Dict[str, Any]]:
+        """Yield slides from a UTF-8 buffer decoded one span at a time, then fill in metadata"""
+        yield from self.parser.iter_chunks(iter_source_text(buffer, find_slide_spans(buffer)))
+        metadata.update(self.parser.get_metadata())
+        
+    def _stream_slides(self, fileobj: TextIO, metadata: Dict[str, str]) -> Iterator[Dict[str, Any]]:
+        """Yield slides from the parser, then fill in document metadata"""
+        yield from self.parser.iter_slides(fileobj)
+        metadata.update(self.parser.get_metadata())
+            
     def convert_file(self, html_file: str, output_file: Optional[str] = None) -> bool:
         """
         Convert HTML file to PPTX
@@ -75,15 +336,17 @@ class HTMLtoPPTXConverter:
             
         return self.convert(html_file, output_file, is_file=True)
         
-    def convert_string(self, html_content: str, output_file: str) -> bool:
+    def convert_string(self, html_content: str, output_file: str, base_dir: Optional[str] = None) -> bool:
         """
         Convert HTML string to PPTX
         
         Args:
             html_content: HTML content as string
             output_file: Output file path
+            base_dir: Directory that local image paths are resolved against (local
+                images are not embedded when None)
             
         Returns:
             bool: True if conversion successful, False otherwise
         """
-        return self.convert(html_content, output_file, is_file=False)
\ No newline at end of file
+        return self.convert(html_content, output_file, is_file=False, base_dir=base_dir)
\ No newline at end of file
@@ -0,0 +1,210 @@
+"""
+Conversion Daemon Module
+
+Long-lived process that keeps converters warm and converts files on request over
+a Unix domain socket (protocol described in ``daemon_client.py``). Imports,
+templates, prototypes, caches and worker pools are set up once and reused by
+every request.
+
+Each connection has a reader thread that queues its requests as they arrive and
+a writer thread that sends the responses back in request order, so requests on a
+connection are pipelined. Conversions run one at a time on a single worker
+thread, taking jobs from a bounded queue; requests arriving while the queue is
+full are rejected at once rather than left waiting, and the client converts them
+itself. One converter is kept per distinct set of options, least recently used
+first out.
+"""
+
+import json
+import os
+import queue
+import socket
+import stat
+import threading
+from collections import OrderedDict
+from concurrent.futures import Future
+from typing import Any, Dict, Optional
+from .batch import convert_one
+from .converter import HTMLtoPPTXConverter
+from .daemon_client import DaemonClient, default_socket_path
+
+
+class ConversionDaemon:
+    """Serve conversion requests on a Unix domain socket"""
+
+    def __init__(self, path: Optional[str] = None, max_queue: int = 64, max_converters: int = 4):
+        """
+        Initialize the daemon
+
+        Args:
+            path: Socket path (defaults to ``default_socket_path()``)
+            max_queue: Jobs that may wait for the worker; further requests are rejected
+            max_converters: Warm converters kept for different option sets
+        """
+        self.path = path or default_socket_path()
+        self.max_converters = max_converters
+        self.jobs: queue.Queue = queue.Queue(maxsize=max_queue)
+        self.converted = 0
+        self.rejected = 0
+        self._converters: 'OrderedDict[str, HTMLtoPPTXConverter]' = OrderedDict()
+        self._socket: Optional[socket.socket] = None
+        self._stopping = threading.Event()
+
+    def serve_forever(self):
+        """
+        Listen and serve until ``shutdown`` is called or a shutdown request arrives
+
+        Raises:
+            RuntimeError: If another daemon is already listening on the socket
+        """
+        self._bind()
+        worker = threading.Thread(target=self._work, name='html_to_pptx-worker', daemon=True)
+        worker.start()
+        try:
+            listener = self._socket
+            while not self._stopping.is_set():
+                try:
+                    connection, _ = listener.accept()
+                except OSError:
+                    # The listening socket was closed by shutdown
+                    break
+                threading.Thread(target=self._serve_connection, args=(connection,), daemon=True).start()
+        finally:
+            self.shutdown()
+            self.jobs.put(None)
+            worker.join()
+            for converter in self._converters.values():
+                converter.close()
+            self._converters.clear()
+
+    def shutdown(self):
+        """Stop accepting connections and remove the socket"""
+        if self._stopping.is_set() and self._socket is None:
+            return
+        self._stopping.set()
+        sock, self._socket = self._socket, None
+        if sock is not None:
+            # Closing alone does not wake an accept blocked in another thread
+            try:
+                sock.shutdown(socket.SHUT_RDWR)
+            except OSError:
+                pass
+            sock.close()
+            try:
+                os.unlink(self.path)
+            except OSError:
+                pass
+
+    def _bind(self):
+        """Create the listening socket, replacing a stale socket file"""
+        if os.path.lexists(self.path):
+            if not stat.S_ISSOCK(os.lstat(self.path).st_mode):
+                raise RuntimeError(f"Not a socket: {self.path}")
+            if DaemonClient(self.path, timeout=5).ping() is not None:
+                raise RuntimeError(f"A daemon is already listening on {self.path}")
+            os.unlink(self.path)
+        sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        # Only the owner may connect: requests read and write files as this user
+        umask = os.umask(0o177)
+        try:
+            sock.bind(self.path)
+        finally:
+            os.umask(umask)
+        sock.listen()
+        self._socket = sock
+
+    def _serve_connection(self, connection: socket.socket):
+        """Queue a connection's requests as they arrive; responses go out in order"""
+        responses: queue.Queue = queue.Queue()
+        writer = threading.Thread(target=self._write_responses, args=(connection, responses), daemon=True)
+        writer.start()
+        try:
+            with connection.makefile('rb') as stream:
+                for line in stream:
+                    if line.strip():
+                        responses.put(self._submit(line))
+        except OSError:
+            pass
+        finally:
+            responses.put(None)
+            writer.join()
+            connection.close()
+
+    def _write_responses(self, connection: socket.socket, responses: queue.Queue):
+        """Send each response once it is ready, in request order"""
+        while True:
+            future = responses.get()
+            if future is None:
+                break
+            try:
+                connection.sendall(json.dumps(future.result(), ensure_ascii=False).encode('utf-8') + b'\n')
+            except OSError:
+                # The client went away; let the remaining jobs finish unobserved
+                pass
+
+    def _submit(self, line: bytes) -> Future:
+        """Handle one request line, returning the future of its response"""
+        future: Future = Future()
+        try:
+            request = json.loads(line)
+            request_id = request.get('id')
+            op = request.get('op', 'convert')
+        except (ValueError, AttributeError) as e:
+            future.set_result({'id': None, 'ok': False, 'error': f"Bad request: {e}"})
+            return future
+
+        if op == 'ping':
+            future.set_result({
+                'id': request_id, 'ok': True, 'pid': os.getpid(), 'queued': self.jobs.qsize(),
+                'converted': self.converted, 'rejected': self.rejected
+            })
+        elif op == 'shutdown':
+            future.set_result({'id': request_id, 'ok': True})
+            self.shutdown()
+        elif op == 'convert':
+            try:
+                self.jobs.put_nowait((request, future))
+            except queue.Full:
+                self.rejected += 1
+                future.set_result({
+                    'id': request_id, 'input': request.get('input'), 'output': request.get('output'),
+                    'ok': False, 'rejected': True, 'error': "Daemon job queue is full"
+                })
+        else:
+            future.set_result({'id': request_id, 'ok': False, 'error': f"Unknown operation: {op}"})
+        return future
+
+    def _work(self):
+        """Worker thread: run queued conversions one at a time"""
+        while True:
+            job = self.jobs.get()
+            if job is None:
+                break
+            request, future = job
+            try:
+                converter = self._converter(request.get('options') or {})
+                # Convert in the client's environment, not the daemon's
+                converter.builder.environ = request.get('environ') or {}
+                result = convert_one(converter, request['input'], request['output'])
+                self.converted += 1
+            except Exception as e:
+                result = {
+                    'input': request.get('input'), 'output': request.get('output'),
+                    'ok': False, 'error': f"{type(e).__name__}: {e}"
+                }
+            result['id'] = request.get('id')
+            future.set_result(result)
+
+    def _converter(self, options: Dict[str, Any]) -> HTMLtoPPTXConverter:
+        """Return the warm converter for a set of options, creating it if needed"""
+        key = json.dumps(options, sort_keys=True)
+        converter = self._converters.get(key)
+        if converter is not None:
+            self._converters.move_to_end(key)
+            return converter
+        converter = HTMLtoPPTXConverter(**options)
+        self._converters[key] = converter
+        if len(self._converters) > self.max_converters:
+            _, evicted = self._converters.popitem(last=False)
+            evicted.close()
+        return converter
@@ -0,0 +1,136 @@
+"""
+Daemon Client Module
+
+Forwards conversions to a running conversion daemon (see ``daemon.py``) over its
+Unix domain socket. Only the standard library is imported here, so forwarding a
+conversion does not load the parser or builders.
+
+The protocol is newline-delimited JSON over one stream connection. A request is
+``{"id": ..., "op": "convert", "input": path, "output": path, "options": {...},
+"environ": {...}}`` with absolute paths, where ``options`` are HTMLtoPPTXConverter
+keyword arguments and ``environ`` holds the client's values of the environment
+variables that affect the output (FORWARDED_ENVIRON), so the daemon converts as
+the client would.
+Responses come back in request order carrying the request id, so a client may
+pipeline any number of requests before reading the first response. Other
+operations are ``ping`` and ``shutdown``.
+"""
+
+import json
+import os
+import socket
+import stat
+import tempfile
+from typing import Any, Dict, List, Optional, Tuple
+
+SOCKET_ENV = 'HTML_TO_PPTX_SOCKET'
+
+# Environment variables the output depends on, sent with every conversion
+FORWARDED_ENVIRON = ('SOURCE_DATE_EPOCH',)
+
+
+class DaemonUnavailable(Exception):
+    """No daemon is listening on the socket"""
+
+
+def default_socket_path() -> str:
+    """Return the daemon socket path: $HTML_TO_PPTX_SOCKET, else a per-user path"""
+    path = os.environ.get(SOCKET_ENV)
+    if path:
+        return path
+    runtime_dir = os.environ.get('XDG_RUNTIME_DIR')
+    if runtime_dir and os.path.isdir(runtime_dir):
+        return os.path.join(runtime_dir, 'html_to_pptx.sock')
+    user = os.getuid() if hasattr(os, 'getuid') else os.environ.get('USERNAME', 'user')
+    return os.path.join(tempfile.gettempdir(), f'html_to_pptx-{user}.sock')
+
+
+class DaemonClient:
+    """Send requests to the conversion daemon"""
+
+    def __init__(self, path: Optional[str] = None, timeout: Optional[float] = None):
+        """
+        Initialize the client
+
+        Args:
+            path: Socket path (defaults to ``default_socket_path()``)
+            timeout: Socket timeout in seconds for each send and receive (None waits)
+        """
+        self.path = path or default_socket_path()
+        self.timeout = timeout
+
+    def convert(self, jobs: List[Tuple[str, str]], options: Optional[Dict[str, Any]] = None) -> List[Dict[str, Any]]:
+        """
+        Convert files in the daemon, pipelining all requests on one connection
+
+        Args:
+            jobs: (input, output) path pairs; relative paths are made absolute
+            options: HTMLtoPPTXConverter keyword arguments (must be JSON-serializable)
+
+        Returns:
+            One record per job, in order, as returned by ``batch.convert_one``. Jobs the
+            daemon could not queue have ``ok`` False and ``rejected`` True, and may
+            be converted locally instead.
+
+        Raises:
+            DaemonUnavailable: If no daemon of this user is listening
+        """
+        environ = {name: os.environ[name] for name in FORWARDED_ENVIRON if name in os.environ}
+        requests = [
+            {'id': index, 'op': 'convert', 'input': os.path.abspath(html_file),
+             'output': os.path.abspath(output_file), 'options': options or {}, 'environ': environ}
+            for index, (html_file, output_file) in enumerate(jobs)
+        ]
+        responses = self._exchange(requests)
+        for job, response in zip(jobs, responses):
+            # Report the paths as the caller gave them
+            response['input'], response['output'] = job
+        return responses
+
+    def ping(self) -> Optional[Dict[str, Any]]:
+        """Return the daemon's status, or None if no daemon is listening"""
+        try:
+            return self._exchange([{'id': 0, 'op': 'ping'}])[0]
+        except DaemonUnavailable:
+            return None
+
+    def shutdown(self) -> bool:
+        """Ask the daemon to stop; return whether one was running"""
+        try:
+            self._exchange([{'id': 0, 'op': 'shutdown'}])
+        except DaemonUnavailable:
+            return False
+        return True
+
+    def _exchange(self, requests: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """Send every request, then read one response line per request"""
+        if not hasattr(socket, 'AF_UNIX'):
+            raise DaemonUnavailable("Unix domain sockets are not supported on this platform")
+        self._check_owner()
+        sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        sock.settimeout(self.timeout)
+        try:
+            sock.connect(self.path)
+            sock.sendall(b''.join(json.dumps(request).encode('utf-8') + b'\n' for request in requests))
+            sock.shutdown(socket.SHUT_WR)
+            with sock.makefile('rb') as stream:
+                responses = [json.loads(line) for line in stream]
+        except OSError as e:
+            raise DaemonUnavailable(str(e)) from None
+        finally:
+            sock.close()
+        if len(responses) != len(requests):
+            raise DaemonUnavailable("Daemon closed the connection early")
+        return responses
+
+    def _check_owner(self):
+        """Refuse a socket path that is not a socket owned by this user"""
+        try:
+            info = os.lstat(self.path)
+        except OSError as e:
+            raise DaemonUnavailable(str(e)) from None
+        if not stat.S_ISSOCK(info.st_mode):
+            raise DaemonUnavailable(f"Not a socket: {self.path}")
+        # Anyone can create the fallback path in the shared temporary directory
+        if hasattr(os, 'getuid') and info.st_uid != os.getuid():
+            raise DaemonUnavailable(f"Socket is owned by another user: {self.path}")
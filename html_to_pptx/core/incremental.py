@@ -0,0 +1,113 @@
+"""
+Incremental Parse Module
+
+Reparses only the slides whose source changed since the last run.
+The document is split into slide spans and the gaps between them. Gaps are
+always fed to the parser, since they hold the stylesheets and wrapper elements
+that later slides depend on, while unchanged slide spans are skipped and their
+parsed form is loaded from the store instead.
+
+Documents may be given as text or as a bytes-like buffer such as an ``mmap``;
+with a buffer, unchanged slides are fingerprinted without ever being decoded.
+"""
+
+import hashlib
+from typing import Any, Dict, List, Optional
+from ..parsers.html_parser import SlideHTMLParser, document_metadata
+from ..parsers.prescan import Source, find_slide_spans, has_style_block, slide_fingerprint, source_bytes, source_text
+from .cache import ParseCache
+
+
+class IncrementalParser:
+    """Parse documents slide by slide, reusing slides with unchanged fingerprints"""
+
+    def __init__(self, parser: SlideHTMLParser, store: ParseCache):
+        """
+        Initialize the incremental parser
+
+        Args:
+            parser: Parser used for changed slides and the text between slides
+            store: Persistent store of parsed slides keyed by fingerprint
+        """
+        self.parser = parser
+        self.store = store
+        self.metadata: Dict[str, str] = {}
+        self.reparsed = 0
+        self.reused = 0
+
+    def parse(self, html_content: Source) -> List[Dict[str, Any]]:
+        """
+        Parse HTML content, reparsing only slides whose fingerprint changed
+
+        Args:
+            html_content: HTML document as text or UTF-8 bytes
+
+        Returns:
+            List of slides, identical to ``SlideHTMLParser.parse``
+        """
+        self.reparsed = 0
+        self.reused = 0
+        spans = find_slide_spans(html_content)
+        keys: List[str] = []
+        slides = self._parse_spans(html_content, spans, keys)
+        if slides is None:
+            # The pre-scan disagreed with the parser; fall back to a full parse
+            slides = self.parser.parse(source_text(html_content, 0, len(html_content)))
+            self.reparsed = len(slides)
+            self.reused = 0
+            self.metadata = self.parser.get_metadata()
+        else:
+            self.metadata = document_metadata(slides)
+        if self.reparsed:
+            # Evict once per document, keeping the entries and blobs it uses
+            self.store.evict(keys, slides)
+        return slides
+
+    def get_metadata(self) -> Dict[str, str]:
+        """Get overall document metadata of the last parsed document"""
+        return self.metadata
+
+    def _parse_spans(self, html_content: Source, spans,
+                     keys: Optional[List[str]] = None) -> Optional[List[Dict[str, Any]]]:
+        """Feed gaps and changed slides to the parser, appending slide keys to ``keys``; None if the spans are unusable"""
+        if keys is None:
+            keys = []
+        parser = self.parser
+        parser.reset()
+        context = hashlib.sha256()
+        slides = []
+        pos = 0
+
+        for span in spans:
+            parser.feed(source_text(html_content, pos, span.start))
+            context.update(source_bytes(html_content, pos, span.start))
+            if parser.in_slide:
+                return None
+
+            source = source_bytes(html_content, span.start, span.end)
+            key = slide_fingerprint(context.digest(), source)
+            keys.append(key)
+            # Slides carrying their own <style> affect later slides and cannot be skipped
+            cacheable = not has_style_block(html_content, span)
+            cached = self.store.get(key) if cacheable else None
+
+            if cached is not None:
+                slides.append(cached[0][0])
+                self.reused += 1
+            else:
+                first = len(parser.slides)
+                parser.feed(source_text(html_content, span.start, span.end))
+                parsed = parser.slides[first:]
+                if len(parsed) != 1 or parser.in_slide:
+                    return None
+                if cacheable:
+                    self.store.put(key, parsed, {}, evict=False)
+                slides.append(parsed[0])
+                self.reparsed += 1
+            pos = span.end
+
+        parser.feed(source_text(html_content, pos, len(html_content)))
+        parser.close()
+        if len(parser.slides) != self.reparsed:
+            return None
+        return slides
@@ -0,0 +1,139 @@
+"""
+Parallel Parse Module
+
+Parses the slides of one document across worker processes.
+The pre-scan splits the document into slide spans; each worker is given a slide
+span plus the document text preceding it outside other slides (stylesheets and
+wrapper elements), and returns the slide packed as flat node arrays.
+Buffer input is handed to the workers as raw UTF-8 bytes and decoded there.
+"""
+
+from typing import TYPE_CHECKING, Any, Dict, Iterator, List, Optional, Union
+from ..parsers.backends import DEFAULT_BACKEND, create_parser
+from ..parsers.html_parser import SlideHTMLParser, document_metadata
+from ..parsers.prescan import Source, find_slide_spans, has_style_block, source_text
+from ..parsers.serialization import PackedSlide, pack_slide, unpack_slide
+from ..utils.blobs import BlobStore
+
+if TYPE_CHECKING:
+    from concurrent.futures import ProcessPoolExecutor
+
+# Parser reused by every task run in a worker process
+_worker_parser: Optional[SlideHTMLParser] = None
+
+
+def _parse_slide_span(backend: str, blob_store: Optional[BlobStore], context: Union[str, bytes],
+                      source: Union[str, bytes]) -> Optional[PackedSlide]:
+    """Worker task: parse one slide span after replaying its document context"""
+    if isinstance(context, bytes):
+        context = source_text(context, 0, len(context))
+        source = source_text(source, 0, len(source))
+    global _worker_parser
+    if _worker_parser is None:
+        _worker_parser = create_parser(backend)
+    parser = _worker_parser
+    parser.blob_store = blob_store
+
+    parser.reset()
+    parser.feed(context)
+    if parser.in_slide:
+        return None
+    parser.feed(source)
+    if len(parser.slides) != 1 or parser.in_slide:
+        return None
+    return pack_slide(parser.slides[0])
+
+
+class ParallelParser:
+    """Parse the slides of a document in parallel worker processes"""
+
+    def __init__(self, workers: int, backend: str = DEFAULT_BACKEND, blob_store: Optional[BlobStore] = None):
+        """
+        Initialize the parallel parser
+
+        Args:
+            workers: Number of worker processes
+            backend: Parser backend used by the workers and for fallback parsing
+            blob_store: Store that inline data URIs are spilled to; shared with the
+                workers through its directory
+        """
+        self.workers = workers
+        self.backend = backend
+        self.blob_store = blob_store
+        self.parser = create_parser(backend, blob_store)
+        self.metadata: Dict[str, str] = {}
+        self._executor: Optional['ProcessPoolExecutor'] = None
+
+    def parse(self, html_content: Source) -> Iterator[Dict[str, Any]]:
+        """
+        Parse HTML content in parallel
+
+        Args:
+            html_content: HTML document as text or UTF-8 bytes
+
+        Returns:
+            Iterator of slides in document order. Slides are unpacked as they are
+            consumed, and document metadata is available once it is exhausted.
+        """
+        tasks = self._split(html_content)
+        if tasks is None:
+            return self._parse_whole(html_content)
+
+        if self._executor is None:
+            # Imported here: the converter only creates a ParallelParser for several workers
+            from concurrent.futures import ProcessPoolExecutor
+            self._executor = ProcessPoolExecutor(max_workers=self.workers)
+        contexts, sources = zip(*tasks)
+        chunksize = max(1, len(tasks) // (self.workers * 4))
+        packed = list(self._executor.map(
+            _parse_slide_span, [self.backend] * len(tasks), [self.blob_store] * len(tasks),
+            contexts, sources, chunksize=chunksize
+        ))
+        if any(slide is None for slide in packed):
+            # A span did not parse as exactly one slide; fall back to a full parse
+            return self._parse_whole(html_content)
+
+        self.metadata = document_metadata([{'metadata': slide[0]} for slide in packed])
+        return (unpack_slide(slide) for slide in packed)
+
+    def _parse_whole(self, html_content: Source) -> Iterator[Dict[str, Any]]:
+        """Parse a document in this process"""
+        slides = self.parser.parse(source_text(html_content, 0, len(html_content)))
+        self.metadata = self.parser.get_metadata()
+        return iter(slides)
+
+    def get_metadata(self) -> Dict[str, str]:
+        """Get overall document metadata of the last parsed document"""
+        return self.metadata
+
+    def shutdown(self):
+        """Stop the worker processes"""
+        if self._executor is not None:
+            self._executor.shutdown()
+            self._executor = None
+
+    @staticmethod
+    def _split(html_content: Source) -> Optional[List[tuple]]:
+        """Split a document into (context, slide source) tasks; None if it cannot be split"""
+        spans = find_slide_spans(html_content)
+        if len(spans) < 2:
+            return None
+
+        # Text stays text; buffers are sliced to bytes, which the workers decode
+        is_text = isinstance(html_content, str)
+        view = html_content if is_text else memoryview(html_content)
+        tasks = []
+        context = []
+        pos = 0
+        for span in spans:
+            # A slide with its own <style> changes the context of the slides after it
+            if has_style_block(html_content, span):
+                return None
+            context.append(view[pos:span.start])
+            source = view[span.start:span.end]
+            if is_text:
+                tasks.append((''.join(context), source))
+            else:
+                tasks.append((b''.join(context), bytes(source)))
+            pos = span.end
+        return tasks
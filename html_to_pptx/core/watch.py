@@ -0,0 +1,191 @@
+"""
+Watch Module
+
+Reconverts decks as their HTML is saved. The directories holding the decks are
+watched with inotify where available (Linux, through ctypes) and polled otherwise.
+Either way an event only prompts a rescan: decks are compared by modification
+time and size against the last scan, so only decks whose file actually changed
+are reported, and writes of the converter's own output are ignored. A burst of
+saves is debounced into a single rescan once the directories have been quiet
+for a moment.
+"""
+
+import ctypes
+import ctypes.util
+import glob
+import os
+import select
+import time
+from typing import Callable, Dict, Iterator, List, Optional, Tuple
+from .batch import find_batch_inputs
+
+# Modification time and size of a file, as compared between scans
+Signature = Tuple[int, int]
+
+# inotify events that may mean a deck was written, replaced, created or removed
+_IN_MODIFY = 0x002
+_IN_ATTRIB = 0x004
+_IN_CLOSE_WRITE = 0x008
+_IN_MOVED_FROM = 0x040
+_IN_MOVED_TO = 0x080
+_IN_CREATE = 0x100
+_IN_DELETE = 0x200
+_WATCH_MASK = _IN_MODIFY | _IN_ATTRIB | _IN_CLOSE_WRITE | _IN_MOVED_FROM | _IN_MOVED_TO | _IN_CREATE | _IN_DELETE
+
+
+class _InotifyEvents:
+    """Wake-ups from inotify watches on directories"""
+
+    def __init__(self):
+        """
+        Raises:
+            OSError: If inotify is not available
+        """
+        libc_name = ctypes.util.find_library('c')
+        try:
+            libc = ctypes.CDLL(libc_name, use_errno=True)
+            init = libc.inotify_init1
+            self._add_watch = libc.inotify_add_watch
+        except (OSError, AttributeError, TypeError):
+            raise OSError("inotify is not available") from None
+        self._add_watch.argtypes = [ctypes.c_int, ctypes.c_char_p, ctypes.c_uint32]
+        fd = init(os.O_NONBLOCK | os.O_CLOEXEC)
+        if fd < 0:
+            errno = ctypes.get_errno()
+            raise OSError(errno, os.strerror(errno))
+        self._fd = fd
+        self._watched = set()
+
+    def watch(self, directories: List[str]):
+        """Add watches for directories not watched yet"""
+        for directory in directories:
+            if directory in self._watched:
+                continue
+            if self._add_watch(self._fd, os.fsencode(directory), _WATCH_MASK) >= 0:
+                self._watched.add(directory)
+
+    def wait(self, timeout: float) -> bool:
+        """Wait up to timeout seconds for events; return whether any arrived"""
+        readable, _, _ = select.select([self._fd], [], [], timeout)
+        if not readable:
+            return False
+        # Only the wake-up matters; the scan works out what changed
+        try:
+            while os.read(self._fd, 65536):
+                pass
+        except BlockingIOError:
+            pass
+        return True
+
+    def close(self):
+        os.close(self._fd)
+
+
+class _PollingEvents:
+    """Wake-ups from comparing snapshots of the watched files"""
+
+    def __init__(self, snapshot: Callable[[], Dict[str, Signature]]):
+        self._snapshot = snapshot
+        self._last = snapshot()
+
+    def watch(self, directories: List[str]):
+        pass
+
+    def wait(self, timeout: float) -> bool:
+        """Sleep for timeout seconds; return whether the files changed meanwhile"""
+        time.sleep(timeout)
+        current = self._snapshot()
+        changed = current != self._last
+        self._last = current
+        return changed
+
+    def close(self):
+        pass
+
+
+class DeckWatcher:
+    """Report HTML decks whose files changed, one debounced batch at a time"""
+
+    def __init__(self, target: str, debounce: float = 0.3, poll_interval: float = 1.0,
+                 use_inotify: bool = True):
+        """
+        Initialize the watcher
+
+        Args:
+            target: HTML file, directory (its ``*.html`` files) or glob pattern
+            debounce: Seconds without events that end a burst of saves
+            poll_interval: Seconds between scans when polling
+            use_inotify: Use inotify when available; poll otherwise
+        """
+        self.target = target
+        self.debounce = debounce
+        self.poll_interval = poll_interval
+        self._seen = self.snapshot()
+        self._events = None
+        if use_inotify:
+            try:
+                self._events = _InotifyEvents()
+            except OSError:
+                pass
+        if self._events is None:
+            self._events = _PollingEvents(self.snapshot)
+        self._events.watch(self._directories(self._seen))
+
+    @property
+    def backend(self) -> str:
+        """Name of the change notification mechanism in use"""
+        return 'inotify' if isinstance(self._events, _InotifyEvents) else 'polling'
+
+    def decks(self) -> List[str]:
+        """Return the decks currently matched by the target"""
+        if os.path.isfile(self.target):
+            return [self.target]
+        return find_batch_inputs(self.target)
+
+    def snapshot(self) -> Dict[str, Signature]:
+        """Return the signature of every matched deck"""
+        signatures = {}
+        for path in self.decks():
+            try:
+                stat = os.stat(path)
+            except OSError:
+                continue
+            signatures[path] = (stat.st_mtime_ns, stat.st_size)
+        return signatures
+
+    def changes(self, timeout: Optional[float] = None) -> Iterator[List[str]]:
+        """
+        Yield the decks created or modified in each burst of saves
+
+        Args:
+            timeout: Stop after this many seconds without changes (runs forever when None)
+        """
+        idle_since = time.monotonic()
+        while timeout is None or time.monotonic() - idle_since < timeout:
+            if not self._events.wait(self.poll_interval):
+                continue
+            # Absorb the rest of the burst
+            while self._events.wait(self.debounce):
+                pass
+            current = self.snapshot()
+            changed = [path for path, signature in current.items() if self._seen.get(path) != signature]
+            self._seen = current
+            # Decks may have appeared in new directories
+            self._events.watch(self._directories(current))
+            if changed:
+                yield changed
+                idle_since = time.monotonic()
+
+    def close(self):
+        """Stop watching"""
+        self._events.close()
+
+    def _directories(self, decks: Dict[str, Signature]) -> List[str]:
+        """Directories to watch: those holding decks, plus the target's fixed leading part"""
+        directories = {os.path.dirname(os.path.abspath(path)) for path in decks}
+        base = self.target if os.path.isdir(self.target) else os.path.dirname(self.target)
+        while base and glob.has_magic(base):
+            base = os.path.dirname(base)
+        if os.path.isdir(base or '.'):
+            directories.add(os.path.abspath(base or '.'))
+        return sorted(directories)
@@ -0,0 +1,60 @@
+"""
+Parser Backends
+
+Registry of interchangeable slide parsers. Every backend is a SlideHTMLParser
+subclass, so ``parse``, ``iter_slides`` and ``get_metadata`` behave the same
+regardless of the tokenizer underneath.
+"""
+
+import importlib
+import importlib.util
+from typing import TYPE_CHECKING, Dict, Optional, Tuple, Type
+
+if TYPE_CHECKING:
+    from .html_parser import SlideHTMLParser
+    from ..utils.blobs import BlobStore
+
+DEFAULT_BACKEND = 'html.parser'
+
+# Module and class of each backend, imported when a parser is first created so
+# that listing the backends (e.g. for command line choices) stays cheap
+PARSER_BACKENDS: Dict[str, Tuple[str, str]] = {
+    'html.parser': ('.html_parser', 'SlideHTMLParser'),
+    'lxml': ('.lxml_parser', 'LxmlSlideParser'),
+}
+
+
+def available_backends() -> Dict[str, bool]:
+    """Return each backend name with whether its dependencies are installed"""
+    return {
+        'html.parser': True,
+        'lxml': importlib.util.find_spec('lxml') is not None,
+    }
+
+
+def backend_class(backend: str) -> Type['SlideHTMLParser']:
+    """Import and return the parser class of a backend"""
+    module_name, class_name = PARSER_BACKENDS[backend]
+    return getattr(importlib.import_module(module_name, __package__), class_name)
+
+
+def create_parser(backend: str = DEFAULT_BACKEND, blob_store: Optional['BlobStore'] = None) -> 'SlideHTMLParser':
+    """
+    Create a slide parser for the given backend
+
+    Args:
+        backend: Backend name, one of PARSER_BACKENDS
+        blob_store: Store that inline data URIs are spilled to (kept inline when None)
+
+    Returns:
+        SlideHTMLParser instance
+
+    Raises:
+        ValueError: If the backend name is unknown
+        ImportError: If the backend's dependencies are not installed
+    """
+    if backend not in PARSER_BACKENDS:
+        raise ValueError(f"Unknown parser backend: {backend} (choose from {', '.join(PARSER_BACKENDS)})")
+    if not available_backends()[backend]:
+        raise ImportError(f"The {backend} parser backend requires the {backend} package: pip install {backend}")
+    return backend_class(backend)(blob_store)
@@ -0,0 +1,330 @@
+"""
+CSS Cascade Module
+
+Compiles ``<style>`` blocks into indexed rule sets and computes element styles.
+Rules are bucketed by the id, class or tag of their rightmost compound selector,
+so matching an element only checks the rules that could possibly apply to it.
+"""
+
+import hashlib
+import re
+from collections import OrderedDict
+from typing import Dict, List, Optional, Sequence, Tuple, NamedTuple
+
+
+# Properties that propagate from parent to child when not set on the child
+INHERITED_PROPERTIES = frozenset({
+    'color', 'font', 'font-family', 'font-size', 'font-style', 'font-variant',
+    'font-weight', 'letter-spacing', 'line-height', 'text-align', 'text-indent',
+    'text-transform', 'visibility', 'white-space', 'word-spacing', 'direction'
+})
+
+# Specificity given to Tailwind utility classes, which behave like a linked stylesheet
+CLASS_SPECIFICITY = (0, 1, 0)
+
+_COMMENT_RE = re.compile(r'/\*.*?\*/', re.S)
+_COMPOUND_RE = re.compile(r'(?P<tag>\*|[a-zA-Z][\w-]*)?(?P<rest>(?:[.#][\w-]+)*)$')
+_SIMPLE_RE = re.compile(r'([.#])([\w-]+)')
+
+_MAX_CACHED_STYLESHEETS = 64
+_STYLESHEET_CACHE: 'OrderedDict[str, Stylesheet]' = OrderedDict()
+
+
+class Compound(NamedTuple):
+    """A compound selector such as ``div.title-box#main``"""
+    tag: Optional[str]
+    id: Optional[str]
+    classes: Tuple[str, ...]
+
+
+class Rule(NamedTuple):
+    """A single selector with its declarations"""
+    compounds: Tuple[Compound, ...]     # Rightmost compound first
+    combinators: Tuple[str, ...]        # Combinator to the left of each compound
+    specificity: Tuple[int, int, int]
+    order: int
+    declarations: Tuple[Tuple[str, str], ...]
+    important: Tuple[Tuple[str, str], ...]
+
+
+class StyledNode(NamedTuple):
+    """An open element as seen by the cascade"""
+    tag: str
+    id: Optional[str]
+    classes: Tuple[str, ...]
+    style: Dict[str, str]
+
+
+class Stylesheet:
+    """Compiled stylesheet with rules indexed by id, class and tag"""
+
+    def __init__(self, rules: List[Rule]):
+        self.rules = rules
+        self.by_id: Dict[str, List[Rule]] = {}
+        self.by_class: Dict[str, List[Rule]] = {}
+        self.by_tag: Dict[str, List[Rule]] = {}
+        self.universal: List[Rule] = []
+
+        for rule in rules:
+            key = rule.compounds[0]
+            if key.id:
+                self.by_id.setdefault(key.id, []).append(rule)
+            elif key.classes:
+                self.by_class.setdefault(key.classes[0], []).append(rule)
+            elif key.tag:
+                self.by_tag.setdefault(key.tag, []).append(rule)
+            else:
+                self.universal.append(rule)
+
+    def match(self, tag: str, element_id: Optional[str], classes: Sequence[str],
+              ancestors: Sequence[StyledNode]) -> List[Rule]:
+        """Return the rules matching an element, in no particular order"""
+        candidates = self.universal
+        if element_id and element_id in self.by_id:
+            candidates = candidates + self.by_id[element_id]
+        for cls in classes:
+            bucket = self.by_class.get(cls)
+            if bucket:
+                candidates = candidates + bucket
+        bucket = self.by_tag.get(tag)
+        if bucket:
+            candidates = candidates + bucket
+        if not candidates:
+            return candidates
+
+        return [
+            rule for rule in candidates
+            if _matches_element(rule.compounds[0], tag, element_id, classes)
+            and _matches_ancestors(rule, 1, ancestors, len(ancestors))
+        ]
+
+
+def compile_stylesheet(css_text: str) -> Stylesheet:
+    """
+    Compile CSS text into an indexed stylesheet
+
+    Compiled stylesheets are cached by content hash, so decks sharing the same
+    ``<style>`` block only pay the compile cost once per process.
+    """
+    key = hashlib.sha256(css_text.encode('utf-8')).hexdigest()
+    sheet = _STYLESHEET_CACHE.get(key)
+    if sheet is not None:
+        _STYLESHEET_CACHE.move_to_end(key)
+        return sheet
+
+    sheet = Stylesheet(_parse_rules(css_text))
+    _STYLESHEET_CACHE[key] = sheet
+    if len(_STYLESHEET_CACHE) > _MAX_CACHED_STYLESHEETS:
+        _STYLESHEET_CACHE.popitem(last=False)
+    return sheet
+
+
+def compute_style(stylesheets: Sequence[Stylesheet], tag: str, element_id: Optional[str],
+                  classes: Sequence[str], ancestors: Sequence[StyledNode],
+                  class_style: Optional[Dict[str, str]] = None,
+                  inline_style: Optional[Dict[str, str]] = None) -> Dict[str, str]:
+    """
+    Compute the cascaded style of an element
+
+    Args:
+        stylesheets: Compiled stylesheets in document order
+        tag: Element tag name
+        element_id: Value of the ``id`` attribute, if any
+        classes: Element class names
+        ancestors: Open ancestor elements, outermost first, with computed styles
+        class_style: Properties resolved from Tailwind utility classes
+        inline_style: Properties from the ``style`` attribute
+
+    Returns:
+        Dict of computed CSS properties, including inherited ones
+    """
+    style = {}
+    if ancestors:
+        parent_style = ancestors[-1].style
+        for prop in INHERITED_PROPERTIES.intersection(parent_style):
+            style[prop] = parent_style[prop]
+
+    matched = []
+    for sheet_index, sheet in enumerate(stylesheets):
+        for rule in sheet.match(tag, element_id, classes, ancestors):
+            matched.append((rule.specificity, sheet_index, rule.order, rule))
+    if len(matched) > 1:
+        matched.sort(key=lambda item: item[:3])
+
+    # Utility classes sit below any <style> rule of equal or higher specificity
+    applied_classes = not class_style
+    for specificity, _, _, rule in matched:
+        if not applied_classes and specificity >= CLASS_SPECIFICITY:
+            style.update(class_style)
+            applied_classes = True
+        style.update(rule.declarations)
+    if not applied_classes:
+        style.update(class_style)
+
+    if inline_style:
+        style.update(inline_style)
+
+    for _, _, _, rule in matched:
+        if rule.important:
+            style.update(rule.important)
+
+    return style
+
+
+def parse_declarations(block: str) -> Tuple[List[Tuple[str, str]], List[Tuple[str, str]]]:
+    """Parse a declaration block into (normal, !important) property lists"""
+    normal = []
+    important = []
+    for declaration in block.split(';'):
+        if ':' not in declaration:
+            continue
+        prop, value = declaration.split(':', 1)
+        prop = prop.strip().lower()
+        value = value.strip()
+        if not prop or not value:
+            continue
+        if value.lower().endswith('!important'):
+            important.append((prop, value[:-len('!important')].strip()))
+        else:
+            normal.append((prop, value))
+    return normal, important
+
+
+def _parse_rules(css_text: str) -> List[Rule]:
+    """Parse top-level style rules, skipping at-rules such as @media and @keyframes"""
+    text = _COMMENT_RE.sub('', css_text)
+    rules = []
+    pos = 0
+    length = len(text)
+
+    while pos < length:
+        brace = text.find('{', pos)
+        if brace == -1:
+            break
+        prelude = text[pos:brace].strip()
+        end = _find_block_end(text, brace)
+        body = text[brace + 1:end]
+        pos = end + 1
+
+        # Statement at-rules (@import ...;) may precede the prelude
+        if ';' in prelude:
+            prelude = prelude.rsplit(';', 1)[1].strip()
+        if not prelude or prelude.startswith('@'):
+            continue
+
+        declarations, important = parse_declarations(body)
+        if not declarations and not important:
+            continue
+        for selector in prelude.split(','):
+            parsed = _parse_selector(selector.strip())
+            if parsed is None:
+                continue
+            compounds, combinators, specificity = parsed
+            rules.append(Rule(compounds, combinators, specificity, len(rules),
+                              tuple(declarations), tuple(important)))
+    return rules
+
+
+def _find_block_end(text: str, brace: int) -> int:
+    """Return the index of the brace closing the block opened at ``brace``"""
+    depth = 0
+    for index in range(brace, len(text)):
+        char = text[index]
+        if char == '{':
+            depth += 1
+        elif char == '}':
+            depth -= 1
+            if depth == 0:
+                return index
+    return len(text)
+
+
+def _parse_selector(selector: str) -> Optional[Tuple[Tuple[Compound, ...], Tuple[str, ...], Tuple[int, int, int]]]:
+    """
+    Parse a selector into compounds (rightmost first) and combinators
+
+    Only type, class, id, universal, descendant and child selectors are supported.
+    Selectors using anything else (pseudo-classes, attributes, siblings) can never
+    match statically and return None.
+    """
+    if not selector or any(char in selector for char in ':[+~()'):
+        return None
+
+    tokens = selector.replace('>', ' > ').split()
+    compounds = []
+    combinators = []
+    combinator = ' '
+    ids = classes_count = tags = 0
+
+    for token in tokens:
+        if token == '>':
+            combinator = '>'
+            continue
+        match = _COMPOUND_RE.match(token)
+        if not match:
+            return None
+        tag = match.group('tag')
+        element_id = None
+        classes = []
+        for kind, name in _SIMPLE_RE.findall(match.group('rest')):
+            if kind == '#':
+                element_id = name
+                ids += 1
+            else:
+                classes.append(name)
+                classes_count += 1
+        if tag == '*':
+            tag = None
+        elif tag:
+            tag = tag.lower()
+            tags += 1
+        if compounds:
+            combinators.append(combinator)
+        compounds.append(Compound(tag, element_id, tuple(classes)))
+        combinator = ' '
+
+    if not compounds:
+        return None
+    compounds.reverse()
+    combinators.reverse()
+    return tuple(compounds), tuple(combinators), (ids, classes_count, tags)
+
+
+def _matches_compound(compound: Compound, node: StyledNode) -> bool:
+    """Check whether a single element satisfies a compound selector"""
+    if compound.tag and compound.tag != node.tag:
+        return False
+    if compound.id and compound.id != node.id:
+        return False
+    for cls in compound.classes:
+        if cls not in node.classes:
+            return False
+    return True
+
+
+def _matches_element(compound: Compound, tag: str, element_id: Optional[str], classes: Sequence[str]) -> bool:
+    """Check the rightmost compound selector against the element being styled"""
+    if compound.tag and compound.tag != tag:
+        return False
+    if compound.id and compound.id != element_id:
+        return False
+    for cls in compound.classes:
+        if cls not in classes:
+            return False
+    return True
+
+
+def _matches_ancestors(rule: Rule, index: int, ancestors: Sequence[StyledNode], limit: int) -> bool:
+    """Match compounds[index:] against ancestors[:limit], backtracking over descendants"""
+    if index == len(rule.compounds):
+        return True
+    compound = rule.compounds[index]
+    if rule.combinators[index - 1] == '>':
+        if limit == 0 or not _matches_compound(compound, ancestors[limit - 1]):
+            return False
+        return _matches_ancestors(rule, index + 1, ancestors, limit - 1)
+    for position in range(limit - 1, -1, -1):
+        if _matches_compound(compound, ancestors[position]):
+            if _matches_ancestors(rule, index + 1, ancestors, position):
+                return True
+    return False
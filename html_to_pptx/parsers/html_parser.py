@@ -5,50 +5,188 @@ Parses HTML content and extracts slide information including text, styling, and
 """
 
 from html.parser import HTMLParser
-from typing import Dict, List, Any, Optional
+from collections.abc import Mapping
+from types import MappingProxyType
+from typing import Dict, List, Any, Optional, Iterable, Iterator, TextIO
 import re
+import sys
+from .css import StyledNode, compile_stylesheet, compute_style
+from .tailwind import CLASS_TABLE, TEXT_SIZES, resolve_classes
+from ..utils.blobs import BlobStore
+
+
+# Bump whenever a parser change alters the slides it produces (invalidates parse caches)
+PARSER_VERSION = 3
+
+# Elements that never have a closing tag and must not be pushed onto the element stack
+VOID_ELEMENTS = frozenset({
+    'area', 'base', 'br', 'col', 'embed', 'hr', 'img', 'input',
+    'link', 'meta', 'param', 'source', 'track', 'wbr'
+})
+
+
+# Shared empty children container; replaced by a list on the first add_child
+_NO_CHILDREN = ()
+
+# Attribute tuples whose values are longer than this in total are not shared: long
+# values such as inline data URIs rarely repeat and would only be pinned in the table
+_MAX_SHARED_ATTRIBUTE_LENGTH = 512
+
+
+def _share_attributes(attrs: tuple, table: Optional[Dict[tuple, tuple]]) -> tuple:
+    """Return the instance of an attribute tuple already in table, adding it if new"""
+    if table is None:
+        return attrs
+    try:
+        return table[attrs]
+    except KeyError:
+        pass
+    except TypeError:
+        # Unhashable attribute values are kept per element
+        return attrs
+    if sum(len(value) for _, value in attrs if isinstance(value, str)) <= _MAX_SHARED_ATTRIBUTE_LENGTH:
+        table[attrs] = attrs
+    return attrs
 
 
 class SlideElement:
-    """Represents a single element on a slide"""
+    """Represents a single element on a slide
+    
+    Elements are slotted, intern their tag name and keep attributes as a tuple of
+    ``(name, value)`` pairs. Decks repeat the same tags heavily, so elements created
+    with the same ``attribute_table`` (the parser keeps one per document) share
+    identical attribute tuples.
+    """
+    
+    __slots__ = ('type', 'content', '_attrs', 'children', 'style')
     
-    def __init__(self, element_type: str, content: str = "", attributes: Dict[str, Any] = None):
-        self.type = element_type
+    def __init__(self, element_type: str, content: str = "", attributes: Dict[str, Any] = None,
+                 attribute_table: Optional[Dict[tuple, tuple]] = None):
+        self.type = sys.intern(element_type)
         self.content = content
-        self.attributes = attributes or {}
-        self.children = []
+        self._attrs = _share_attributes(tuple(attributes.items()), attribute_table) if attributes else ()
+        self.children = _NO_CHILDREN
         self.style = {}
         
+    @property
+    def attributes(self) -> Mapping:
+        """Element attributes as a read-only mapping
+        
+        The underlying pairs are shared between elements, so the mapping cannot be
+        modified; ``to_dict()`` returns an independent copy.
+        """
+        return MappingProxyType(dict(self._attrs))
+        
+    def attribute_items(self) -> tuple:
+        """Element attributes as the shared tuple of ``(name, value)`` pairs"""
+        return self._attrs
+        
     def add_child(self, child: 'SlideElement'):
-        self.children.append(child)
+        if not self.children:
+            self.children = [child]
+        else:
+            self.children.append(child)
         
     def to_dict(self) -> Dict[str, Any]:
         return {
             'type': self.type,
             'content': self.content,
-            'attributes': self.attributes,
+            'attributes': dict(self._attrs),
             'style': self.style,
             'children': [child.to_dict() for child in self.children]
         }
+        
+    def view(self) -> 'SlideElementView':
+        """Return a read-only dictionary view that converts children on access"""
+        return SlideElementView(self)
+
+
+class SlideElementView(Mapping):
+    """Lazy dictionary view of a SlideElement
+    
+    Has the keys of ``SlideElement.to_dict()``, but only materializes attributes
+    and child views for the keys that are actually read.
+    """
+    
+    __slots__ = ('_element',)
+    _KEYS = ('type', 'content', 'attributes', 'style', 'children')
+    
+    def __init__(self, element: SlideElement):
+        self._element = element
+        
+    def __getitem__(self, key: str) -> Any:
+        element = self._element
+        if key == 'type':
+            return element.type
+        if key == 'content':
+            return element.content
+        if key == 'attributes':
+            return element.attributes
+        if key == 'style':
+            return element.style
+        if key == 'children':
+            return [SlideElementView(child) for child in element.children]
+        raise KeyError(key)
+        
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._KEYS)
+        
+    def __len__(self) -> int:
+        return len(self._KEYS)
+        
+    def __repr__(self) -> str:
+        return f"SlideElementView({dict(self)!r})"
+
+
+def document_metadata(slides: List[Dict[str, Any]]) -> Dict[str, str]:
+    """Derive document metadata from parsed slides; as in the parser, the last value seen wins"""
+    metadata = {'title': '', 'subtitle': '', 'period': ''}
+    for slide in slides:
+        slide_meta = slide['metadata']
+        for key in metadata:
+            if key in slide_meta:
+                metadata[key] = slide_meta[key]
+    return metadata
 
 
 class SlideHTMLParser(HTMLParser):
     """Parse HTML and extract structured slide content"""
     
-    def __init__(self):
+    def __init__(self, blob_store: Optional[BlobStore] = None):
+        """
+        Initialize the parser
+        
+        Args:
+            blob_store: Store that inline ``data:`` URIs in slides are spilled to,
+                leaving a blob handle in the attribute; when None they are kept as is
+        """
+        self.blob_store = blob_store
         super().__init__()
+        
+    def reset(self):
+        """Reset the parser so the same instance can parse another document"""
+        super().reset()
         self.slides = []
         self.current_slide = None
         self.element_stack = []
         self.current_element = None
         self.in_slide = False
         self.style_context = {}
+        # Attribute tuples shared by this document's elements
+        self.attribute_table = {}
+        
+        # CSS cascade state: compiled <style> blocks and open elements with computed styles
+        self.stylesheets = []
+        self.style_ancestors = []
+        self.in_style = False
+        self.style_text = []
         
         # Tracking specific elements
         self.in_title = False
         self.in_subtitle = False
         self.in_content = False
         self.current_text = ""
+        self.pending_text = []
         
         # Slide metadata
         self.title = ""
@@ -58,12 +196,66 @@ class SlideHTMLParser(HTMLParser):
         
     def parse(self, html_content: str) -> List[Dict[str, Any]]:
         """Parse HTML content and return list of slides"""
+        self.reset()
         self.feed(html_content)
         return self.get_slides()
+
+    def iter_slides(self, fileobj: TextIO, chunk_size: int = 65536) -> Iterator[Dict[str, Any]]:
+        """
+        Parse HTML incrementally from a file object, yielding each slide once it is closed
+
+        Yielded slides are released from ``self.slides``, so peak memory stays at
+        roughly one slide plus one chunk of input. Document metadata is available
+        from ``get_metadata()`` once the iterator is exhausted.
+
+        Args:
+            fileobj: Text file object opened for reading
+            chunk_size: Number of characters passed to ``feed`` at a time
+
+        Yields:
+            Slide dictionaries in document order
+        """
+        return self.iter_chunks(iter(lambda: fileobj.read(chunk_size), ''))
+
+    def iter_chunks(self, chunks: Iterable[str]) -> Iterator[Dict[str, Any]]:
+        """
+        Parse HTML from an iterable of text chunks, yielding each slide once it is closed
+
+        Args:
+            chunks: Consecutive pieces of one HTML document
+
+        Yields:
+            Slide dictionaries in document order
+        """
+        self.reset()
+        for chunk in chunks:
+            self.feed(chunk)
+            yield from self._pop_completed_slides()
+        self.close()
+        yield from self._pop_completed_slides(final=True)
+
+    def _pop_completed_slides(self, final: bool = False) -> List[Dict[str, Any]]:
+        """Remove and return slides whose container has been closed"""
+        count = len(self.slides)
+        if self.in_slide and not final:
+            count -= 1
+        completed = self.slides[:count]
+        del self.slides[:count]
+        return completed
         
     def handle_starttag(self, tag: str, attrs: List[tuple]):
         """Handle opening tags"""
+        self._flush_text()
         attrs_dict = dict(attrs)
+        style = self._extract_style(attrs_dict, tag)
+        
+        if tag == 'style':
+            self.in_style = True
+            self.style_text = []
+            
+        # Styles are computed top-down, so open elements carry their computed style
+        if tag not in VOID_ELEMENTS:
+            self.style_ancestors.append(StyledNode(tag, attrs_dict.get('id'), tuple(style.get('classes', ())), style))
         
         # Check for slide container
         if 'class' in attrs_dict and 'slide-container' in attrs_dict.get('class', ''):
@@ -71,14 +263,16 @@ class SlideHTMLParser(HTMLParser):
             self.current_slide = {
                 'elements': [],
                 'metadata': {},
-                'style': self._extract_style(attrs_dict)
+                'style': style
             }
             self.slides.append(self.current_slide)
             
         # Track element hierarchy
         if self.in_slide:
-            element = SlideElement(tag, attributes=attrs_dict)
-            element.style = self._extract_style(attrs_dict)
+            if self.blob_store is not None:
+                self._spill_data_uris(attrs_dict)
+            element = SlideElement(tag, attributes=attrs_dict, attribute_table=self.attribute_table)
+            element.style = style
             
             if self.element_stack:
                 self.element_stack[-1].add_child(element)
@@ -86,7 +280,8 @@ class SlideHTMLParser(HTMLParser):
                 if self.current_slide:
                     self.current_slide['elements'].append(element)
                 
-            self.element_stack.append(element)
+            if tag not in VOID_ELEMENTS:
+                self.element_stack.append(element)
             
             # Special handling for specific elements
             if tag == 'h1':
@@ -101,6 +296,24 @@ class SlideHTMLParser(HTMLParser):
                     
     def handle_endtag(self, tag: str):
         """Handle closing tags"""
+        self._flush_text()
+        if tag == 'style' and self.in_style:
+            self.in_style = False
+            self.stylesheets.append(compile_stylesheet(''.join(self.style_text)))
+            self.style_text = []
+            
+        for depth in range(len(self.style_ancestors) - 1, -1, -1):
+            if self.style_ancestors[depth].tag == tag:
+                del self.style_ancestors[depth:]
+                break
+                
+        if self.in_slide and self.element_stack and self.element_stack[-1].type != tag:
+            # Implicitly close elements left open inside the matching element (e.g. <p>, <li>)
+            for depth in range(len(self.element_stack) - 2, -1, -1):
+                if self.element_stack[depth].type == tag:
+                    del self.element_stack[depth + 1:]
+                    break
+                    
         if self.in_slide and self.element_stack and self.element_stack[-1].type == tag:
             element = self.element_stack.pop()
             
@@ -133,8 +346,24 @@ class SlideHTMLParser(HTMLParser):
             self.current_slide = None
                 
     def handle_data(self, data: str):
-        """Handle text data"""
-        if self.in_slide:
+        """Buffer text data; a single text node may arrive in several chunks"""
+        self.pending_text.append(data)
+        
+    def close(self):
+        """Process any buffered input"""
+        super().close()
+        self._flush_text()
+        
+    def _flush_text(self):
+        """Handle the text collected since the last tag"""
+        if not self.pending_text:
+            return
+        data = ''.join(self.pending_text)
+        self.pending_text = []
+        
+        if self.in_style:
+            self.style_text.append(data)
+        elif self.in_slide:
             cleaned_data = data.strip()
             if cleaned_data:
                 if self.in_title or self.in_subtitle or self.in_content:
@@ -142,59 +371,43 @@ class SlideHTMLParser(HTMLParser):
                 elif self.element_stack:
                     self.element_stack[-1].content += cleaned_data
                     
-    def _extract_style(self, attrs_dict: Dict[str, str]) -> Dict[str, Any]:
-        """Extract styling information from attributes"""
-        style = {}
+    def _spill_data_uris(self, attrs_dict: Dict[str, str]):
+        """Replace inline data URIs with handles to their payload in the blob store"""
+        for name, value in attrs_dict.items():
+            if value and value[:5].lower() == 'data:':
+                handle = self.blob_store.put_data_uri(value)
+                if handle is not None:
+                    attrs_dict[name] = handle
+                    
+    def _extract_style(self, attrs_dict: Dict[str, str], tag: str = '') -> Dict[str, Any]:
+        """Compute the cascaded style of an element from its attributes and <style> rules"""
+        classes = ()
+        class_style = None
+        inline_style = None
         
-        # Extract from class names
+        # Extract from class names using the precompiled Tailwind table
         if 'class' in attrs_dict:
-            classes = attrs_dict['class'].split()
-            style['classes'] = classes
-            
-            # Map Tailwind classes to style properties
-            for cls in classes:
-                if cls.startswith('text-'):
-                    if 'xl' in cls:
-                        style['font-size'] = self._map_text_size(cls)
-                    elif cls.startswith('text-purple'):
-                        style['color'] = '#8a2be2'
-                    elif cls.startswith('text-gray'):
-                        style['color'] = '#666666'
-                elif cls == 'font-bold':
-                    style['font-weight'] = 'bold'
-                elif cls.startswith('bg-'):
-                    style['background-color'] = self._map_bg_color(cls)
+            classes, class_style = resolve_classes(attrs_dict['class'])
                     
         # Extract from style attribute
         if 'style' in attrs_dict:
-            style_str = attrs_dict['style']
-            style_props = self._parse_style_string(style_str)
-            style.update(style_props)
+            inline_style = self._parse_style_string(attrs_dict['style'])
             
+        style = compute_style(
+            self.stylesheets, tag, attrs_dict.get('id'), classes,
+            self.style_ancestors, class_style, inline_style
+        )
+        if 'class' in attrs_dict:
+            style['classes'] = list(classes)
         return style
         
     def _map_text_size(self, class_name: str) -> str:
         """Map Tailwind text size classes to point sizes"""
-        size_map = {
-            'text-5xl': '36pt',
-            'text-4xl': '28pt',
-            'text-3xl': '24pt',
-            'text-2xl': '20pt',
-            'text-xl': '18pt',
-            'text-lg': '16pt',
-            'text-base': '14pt',
-            'text-sm': '12pt'
-        }
-        return size_map.get(class_name, '14pt')
+        return TEXT_SIZES.get(class_name, '14pt')
         
     def _map_bg_color(self, class_name: str) -> str:
         """Map Tailwind background classes to colors"""
-        color_map = {
-            'bg-purple-50': '#f3e8ff',
-            'bg-gray-50': '#f9fafb',
-            'bg-white': '#ffffff'
-        }
-        return color_map.get(class_name, '#ffffff')
+        return CLASS_TABLE.get(class_name, {}).get('background-color', '#ffffff')
         
     def _parse_style_string(self, style_str: str) -> Dict[str, str]:
         """Parse inline style string"""
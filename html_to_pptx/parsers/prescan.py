@@ -0,0 +1,189 @@
+"""
+Slide Pre-scan
+
+Locates the source span of every ``slide-container`` element without building
+elements or computing styles. Tags are matched with a regular expression and
+tracked on a name-only stack that follows the same rules as SlideHTMLParser, so
+the spans agree with where the parser starts and ends each slide.
+
+Sources may be ``str`` or any bytes-like object, including an ``mmap``, in which
+case boundaries are found directly on the UTF-8 bytes without decoding them.
+"""
+
+import hashlib
+import re
+from typing import Dict, Iterator, List, NamedTuple, Optional, Pattern, Sequence, Union
+from .html_parser import PARSER_VERSION, VOID_ELEMENTS
+
+SLIDE_CLASS = 'slide-container'
+
+Source = Union[str, bytes, bytearray, memoryview, 'mmap.mmap']
+
+_TAG_PATTERN = (
+    r'<!--.*?-->'
+    r'|<(/?)([a-zA-Z][^\s/>]*)((?:[^>"\']|"[^"]*"|\'[^\']*\')*)>'
+)
+_CLASS_PATTERN = r'''(?:^|\s)class\s*=\s*(?:"([^"]*)"|'([^']*)'|([^\s>]+))'''
+
+
+class _Patterns(NamedTuple):
+    """Compiled patterns for one source type (str or bytes)"""
+    tag: Pattern
+    class_attr: Pattern
+    raw_text_end: Dict[str, Pattern]
+    style_open: Pattern
+    slide_class: Union[str, bytes]
+    self_closing: Union[str, bytes]
+
+
+def _compile_patterns(encode) -> _Patterns:
+    return _Patterns(
+        tag=re.compile(encode(_TAG_PATTERN), re.S),
+        class_attr=re.compile(encode(_CLASS_PATTERN), re.I),
+        raw_text_end={
+            'script': re.compile(encode(r'</script\s*>'), re.I),
+            'style': re.compile(encode(r'</style\s*>'), re.I),
+        },
+        style_open=re.compile(encode(r'<style'), re.I),
+        slide_class=encode(SLIDE_CLASS),
+        self_closing=encode('/')
+    )
+
+
+_STR_PATTERNS = _compile_patterns(lambda pattern: pattern)
+_BYTES_PATTERNS = _compile_patterns(lambda pattern: pattern.encode('ascii'))
+
+
+class SlideSpan(NamedTuple):
+    """Source range of one slide, ``text[start:end]``"""
+    start: int
+    end: int
+
+
+def _class_value(patterns: _Patterns, attrs) -> Optional[Union[str, bytes]]:
+    """Return the class attribute value from a raw attribute string"""
+    match = patterns.class_attr.search(attrs)
+    if not match:
+        return None
+    return next(group for group in match.groups() if group is not None)
+
+
+def find_slide_spans(html: Source) -> List[SlideSpan]:
+    """
+    Find the source span of every slide in an HTML document
+
+    Args:
+        html: HTML document as text or UTF-8 bytes (offsets are in the same units)
+
+    Returns:
+        Slide spans in document order
+    """
+    patterns = _STR_PATTERNS if isinstance(html, str) else _BYTES_PATTERNS
+    spans = []
+    stack: List[str] = []
+    slide_start = -1
+    pos = 0
+
+    while True:
+        match = patterns.tag.search(html, pos)
+        if not match:
+            break
+        pos = match.end()
+        tag = match.group(2)
+        if tag is None:
+            continue
+        if not isinstance(tag, str):
+            tag = tag.decode('ascii', 'replace')
+        tag = tag.lower()
+
+        if match.group(1):
+            if slide_start < 0 or not stack:
+                continue
+            # Pop to the matching open element, like SlideHTMLParser.handle_endtag
+            for depth in range(len(stack) - 1, -1, -1):
+                if stack[depth] == tag:
+                    del stack[depth:]
+                    break
+            if tag == 'div' and not stack:
+                spans.append(SlideSpan(slide_start, pos))
+                slide_start = -1
+            continue
+
+        attrs = match.group(3)
+        if slide_start < 0 and patterns.slide_class in attrs:
+            class_value = _class_value(patterns, attrs)
+            if class_value and patterns.slide_class in class_value:
+                slide_start = match.start()
+        if slide_start >= 0 and tag not in VOID_ELEMENTS and not attrs.rstrip().endswith(patterns.self_closing):
+            stack.append(tag)
+
+        # Skip script and style bodies, which may contain '<' freely
+        end_re = patterns.raw_text_end.get(tag)
+        if end_re is not None:
+            end = end_re.search(html, pos)
+            pos = end.start() if end else len(html)
+
+    if slide_start >= 0:
+        spans.append(SlideSpan(slide_start, len(html)))
+    return spans
+
+
+def has_style_block(html: Source, span: SlideSpan) -> bool:
+    """Return whether a slide span contains a ``<style>`` element of its own"""
+    patterns = _STR_PATTERNS if isinstance(html, str) else _BYTES_PATTERNS
+    return patterns.style_open.search(html, span.start, span.end) is not None
+
+
+def source_bytes(html: Source, start: int, end: int):
+    """Return ``html[start:end]`` as UTF-8 bytes, without copying bytes-like sources"""
+    if isinstance(html, str):
+        return html[start:end].encode('utf-8')
+    return memoryview(html)[start:end]
+
+
+def source_text(html: Source, start: int, end: int) -> str:
+    """
+    Return ``html[start:end]`` as text
+
+    Bytes-like sources are decoded from UTF-8 with universal newlines, matching a
+    file opened in text mode. Span boundaries always fall on tag edges, so a CRLF
+    pair is never split between two calls.
+    """
+    if isinstance(html, str):
+        return html[start:end]
+    text = str(memoryview(html)[start:end], 'utf-8')
+    if '\r' in text:
+        text = text.replace('\r\n', '\n').replace('\r', '\n')
+    return text
+
+
+def iter_source_text(html: Source, spans: Sequence[SlideSpan]) -> Iterator[str]:
+    """
+    Yield the whole document as text, one gap or slide span at a time
+
+    Only the piece being yielded is decoded, so a memory-mapped document is never
+    held in memory as a single string.
+    """
+    pos = 0
+    for span in spans:
+        if span.start > pos:
+            yield source_text(html, pos, span.start)
+        yield source_text(html, span.start, span.end)
+        pos = span.end
+    if len(html) > pos:
+        yield source_text(html, pos, len(html))
+
+
+def slide_fingerprint(context: bytes, source) -> str:
+    """
+    Fingerprint a slide's source together with the document context before it
+
+    Args:
+        context: Digest of the document text preceding the slide, outside other slides
+        source: Raw source of the slide span as UTF-8 bytes (see ``source_bytes``)
+    """
+    digest = hashlib.sha256()
+    digest.update(f"slide:{PARSER_VERSION}\0".encode('ascii'))
+    digest.update(context)
+    digest.update(source)
+    return digest.hexdigest()
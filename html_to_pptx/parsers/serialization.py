@@ -0,0 +1,96 @@
+"""
+Slide Serialization
+
+Packs parsed slides into flat, marshal-friendly node arrays and back.
+Each slide becomes parallel tuples of node type, content, attributes, style index
+and parent index in document order. Computed styles repeat heavily, so they are
+stored once in a per-slide table.
+"""
+
+import marshal
+from typing import Any, Dict, List, Tuple
+from .html_parser import SlideElement
+
+# Bump when the packed layout changes
+FORMAT_VERSION = 2
+
+PackedSlide = Tuple[Dict[str, Any], Dict[str, Any], tuple, tuple, tuple, tuple, tuple, tuple]
+
+
+def _style_key(style: Dict[str, Any]) -> tuple:
+    """Hashable form of a computed style dictionary"""
+    return tuple((prop, tuple(value) if isinstance(value, list) else value) for prop, value in style.items())
+
+
+def _style_from_key(key: tuple) -> Dict[str, Any]:
+    """Rebuild a style dictionary from its hashable form"""
+    return {prop: list(value) if isinstance(value, tuple) else value for prop, value in key}
+
+
+def pack_slide(slide: Dict[str, Any]) -> PackedSlide:
+    """Flatten one slide dictionary into node arrays"""
+    types = []
+    contents = []
+    attrs = []
+    styles = []
+    style_table: Dict[tuple, int] = {}
+    parents = []
+
+    # Pre-order walk; parents always precede their children
+    stack = [(element, -1) for element in reversed(slide.get('elements', []))]
+    while stack:
+        element, parent = stack.pop()
+        index = len(types)
+        types.append(element.type)
+        contents.append(element.content)
+        attrs.append(element.attribute_items())
+        styles.append(style_table.setdefault(_style_key(element.style), len(style_table)))
+        parents.append(parent)
+        for child in reversed(element.children):
+            stack.append((child, index))
+
+    return (
+        slide.get('metadata', {}),
+        slide.get('style', {}),
+        tuple(types),
+        tuple(contents),
+        tuple(attrs),
+        tuple(styles),
+        tuple(style_table),
+        tuple(parents)
+    )
+
+
+def unpack_slide(packed: PackedSlide) -> Dict[str, Any]:
+    """Rebuild a slide dictionary from node arrays"""
+    metadata, slide_style, types, contents, attrs, styles, style_table, parents = packed
+    nodes: List[SlideElement] = []
+    roots = []
+
+    for element_type, content, attributes, style, parent in zip(types, contents, attrs, styles, parents):
+        element = SlideElement(element_type, content, dict(attributes))
+        element.style = _style_from_key(style_table[style])
+        nodes.append(element)
+        if parent < 0:
+            roots.append(element)
+        else:
+            nodes[parent].add_child(element)
+
+    return {
+        'elements': roots,
+        'metadata': metadata,
+        'style': slide_style
+    }
+
+
+def dumps(slides: List[Dict[str, Any]], metadata: Dict[str, str]) -> bytes:
+    """Serialize slides and document metadata to bytes"""
+    return marshal.dumps((FORMAT_VERSION, metadata, [pack_slide(slide) for slide in slides]))
+
+
+def loads(data: bytes) -> Tuple[List[Dict[str, Any]], Dict[str, str]]:
+    """Deserialize slides and document metadata produced by ``dumps``"""
+    version, metadata, packed = marshal.loads(data)
+    if version != FORMAT_VERSION:
+        raise ValueError(f"Unsupported slide format version: {version}")
+    return [unpack_slide(slide) for slide in packed], metadata
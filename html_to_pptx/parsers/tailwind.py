@@ -0,0 +1,354 @@
+"""
+Tailwind Class Resolution
+
+Precompiled lookup table mapping Tailwind utility classes to style properties.
+The table is built once at import; whole ``class`` attribute strings are memoized
+so repeated combinations such as ``"flex items-center"`` resolve without re-tokenizing.
+"""
+
+from functools import lru_cache
+from typing import Dict, Tuple
+
+
+# Tailwind default palette, shades 50 and 100-900
+COLOR_SHADES = ('50', '100', '200', '300', '400', '500', '600', '700', '800', '900')
+
+PALETTE = {
+    'slate': ('#f8fafc', '#f1f5f9', '#e2e8f0', '#cbd5e1', '#94a3b8', '#64748b', '#475569', '#334155', '#1e293b', '#0f172a'),
+    'gray': ('#f9fafb', '#f3f4f6', '#e5e7eb', '#d1d5db', '#9ca3af', '#6b7280', '#4b5563', '#374151', '#1f2937', '#111827'),
+    'zinc': ('#fafafa', '#f4f4f5', '#e4e4e7', '#d4d4d8', '#a1a1aa', '#71717a', '#52525b', '#3f3f46', '#27272a', '#18181b'),
+    'neutral': ('#fafafa', '#f5f5f5', '#e5e5e5', '#d4d4d4', '#a3a3a3', '#737373', '#525252', '#404040', '#262626', '#171717'),
+    'stone': ('#fafaf9', '#f5f5f4', '#e7e5e4', '#d6d3d1', '#a8a29e', '#78716c', '#57534e', '#44403c', '#292524', '#1c1917'),
+    'red': ('#fef2f2', '#fee2e2', '#fecaca', '#fca5a5', '#f87171', '#ef4444', '#dc2626', '#b91c1c', '#991b1b', '#7f1d1d'),
+    'orange': ('#fff7ed', '#ffedd5', '#fed7aa', '#fdba74', '#fb923c', '#f97316', '#ea580c', '#c2410c', '#9a3412', '#7c2d12'),
+    'amber': ('#fffbeb', '#fef3c7', '#fde68a', '#fcd34d', '#fbbf24', '#f59e0b', '#d97706', '#b45309', '#92400e', '#78350f'),
+    'yellow': ('#fefce8', '#fef9c3', '#fef08a', '#fde047', '#facc15', '#eab308', '#ca8a04', '#a16207', '#854d0e', '#713f12'),
+    'lime': ('#f7fee7', '#ecfccb', '#d9f99d', '#bef264', '#a3e635', '#84cc16', '#65a30d', '#4d7c0f', '#3f6212', '#365314'),
+    'green': ('#f0fdf4', '#dcfce7', '#bbf7d0', '#86efac', '#4ade80', '#22c55e', '#16a34a', '#15803d', '#166534', '#14532d'),
+    'emerald': ('#ecfdf5', '#d1fae5', '#a7f3d0', '#6ee7b7', '#34d399', '#10b981', '#059669', '#047857', '#065f46', '#064e3b'),
+    'teal': ('#f0fdfa', '#ccfbf1', '#99f6e4', '#5eead4', '#2dd4bf', '#14b8a6', '#0d9488', '#0f766e', '#115e59', '#134e4a'),
+    'cyan': ('#ecfeff', '#cffafe', '#a5f3fc', '#67e8f9', '#22d3ee', '#06b6d4', '#0891b2', '#0e7490', '#155e75', '#164e63'),
+    'sky': ('#f0f9ff', '#e0f2fe', '#bae6fd', '#7dd3fc', '#38bdf8', '#0ea5e9', '#0284c7', '#0369a1', '#075985', '#0c4a6e'),
+    'blue': ('#eff6ff', '#dbeafe', '#bfdbfe', '#93c5fd', '#60a5fa', '#3b82f6', '#2563eb', '#1d4ed8', '#1e40af', '#1e3a8a'),
+    'indigo': ('#eef2ff', '#e0e7ff', '#c7d2fe', '#a5b4fc', '#818cf8', '#6366f1', '#4f46e5', '#4338ca', '#3730a3', '#312e81'),
+    'violet': ('#f5f3ff', '#ede9fe', '#ddd6fe', '#c4b5fd', '#a78bfa', '#8b5cf6', '#7c3aed', '#6d28d9', '#5b21b6', '#4c1d95'),
+    'purple': ('#faf5ff', '#f3e8ff', '#e9d5ff', '#d8b4fe', '#c084fc', '#a855f7', '#9333ea', '#7e22ce', '#6b21a8', '#581c87'),
+    'fuchsia': ('#fdf4ff', '#fae8ff', '#f5d0fe', '#f0abfc', '#e879f9', '#d946ef', '#c026d3', '#a21caf', '#86198f', '#701a75'),
+    'pink': ('#fdf2f8', '#fce7f3', '#fbcfe8', '#f9a8d4', '#f472b6', '#ec4899', '#db2777', '#be185d', '#9d174d', '#831843'),
+    'rose': ('#fff1f2', '#ffe4e6', '#fecdd3', '#fda4af', '#fb7185', '#f43f5e', '#e11d48', '#be123c', '#9f1239', '#881337'),
+}
+
+SPECIAL_COLORS = {
+    'white': '#ffffff',
+    'black': '#000000',
+    'transparent': 'transparent',
+    'current': 'currentColor',
+}
+
+# Text sizes mapped to PowerPoint point sizes
+TEXT_SIZES = {
+    'text-xs': '10pt',
+    'text-sm': '12pt',
+    'text-base': '14pt',
+    'text-lg': '16pt',
+    'text-xl': '18pt',
+    'text-2xl': '20pt',
+    'text-3xl': '24pt',
+    'text-4xl': '28pt',
+    'text-5xl': '36pt',
+    'text-6xl': '48pt',
+    'text-7xl': '60pt',
+}
+
+FONT_WEIGHTS = {
+    'thin': '100',
+    'extralight': '200',
+    'light': '300',
+    'normal': '400',
+    'medium': '500',
+    'semibold': '600',
+    'bold': 'bold',
+    'extrabold': '800',
+    'black': '900',
+}
+
+# Spacing scale steps, in units of 0.25rem
+SPACING_STEPS = (
+    '0', '0.5', '1', '1.5', '2', '2.5', '3', '3.5', '4', '5', '6', '7', '8', '9', '10',
+    '11', '12', '14', '16', '20', '24', '28', '32', '36', '40', '44', '48', '52', '56',
+    '60', '64', '72', '80', '96'
+)
+
+SPACING_PREFIXES = {
+    'p': ('padding',),
+    'px': ('padding-left', 'padding-right'),
+    'py': ('padding-top', 'padding-bottom'),
+    'pt': ('padding-top',),
+    'pr': ('padding-right',),
+    'pb': ('padding-bottom',),
+    'pl': ('padding-left',),
+    'm': ('margin',),
+    'mx': ('margin-left', 'margin-right'),
+    'my': ('margin-top', 'margin-bottom'),
+    'mt': ('margin-top',),
+    'mr': ('margin-right',),
+    'mb': ('margin-bottom',),
+    'ml': ('margin-left',),
+    'gap': ('gap',),
+    'gap-x': ('column-gap',),
+    'gap-y': ('row-gap',),
+    'w': ('width',),
+    'h': ('height',),
+    'min-h': ('min-height',),
+    'top': ('top',),
+    'right': ('right',),
+    'bottom': ('bottom',),
+    'left': ('left',),
+    'inset': ('top', 'right', 'bottom', 'left'),
+    # Tailwind sets these margins on the element's children; they are recorded on
+    # the element itself as custom properties
+    'space-x': ('--space-x',),
+    'space-y': ('--space-y',),
+}
+
+# Fractions usable with w-, h- and the inset prefixes
+SIZE_FRACTIONS = ('1/2', '1/3', '2/3', '1/4', '2/4', '3/4', '1/5', '2/5', '3/5', '4/5', '1/6', '5/6', '1/12', '5/12', '7/12', '11/12')
+
+SIZE_KEYWORDS = {
+    'w': {'auto': 'auto', 'full': '100%', 'screen': '100vw', 'min': 'min-content', 'max': 'max-content'},
+    'h': {'auto': 'auto', 'full': '100%', 'screen': '100vh'},
+    'min-w': {'0': '0px', 'full': '100%', 'min': 'min-content', 'max': 'max-content'},
+    'min-h': {'0': '0px', 'full': '100%', 'screen': '100vh'},
+    'max-w': {
+        'none': 'none', 'xs': '20rem', 'sm': '24rem', 'md': '28rem', 'lg': '32rem', 'xl': '36rem',
+        '2xl': '42rem', '3xl': '48rem', '4xl': '56rem', '5xl': '64rem', '6xl': '72rem', '7xl': '80rem',
+        'full': '100%', 'screen-sm': '640px', 'screen-md': '768px', 'screen-lg': '1024px', 'screen-xl': '1280px',
+    },
+    'max-h': {'full': '100%', 'screen': '100vh'},
+}
+
+BORDER_RADII = {
+    'none': '0px', 'sm': '0.125rem', '': '0.25rem', 'md': '0.375rem', 'lg': '0.5rem',
+    'xl': '0.75rem', '2xl': '1rem', '3xl': '1.5rem', 'full': '9999px',
+}
+
+BORDER_WIDTHS = {'0': '0px', '': '1px', '2': '2px', '4': '4px', '8': '8px'}
+BORDER_SIDES = {'': '', 't': '-top', 'r': '-right', 'b': '-bottom', 'l': '-left'}
+
+SHADOWS = {
+    'sm': '0 1px 2px 0 rgba(0, 0, 0, 0.05)',
+    '': '0 1px 3px 0 rgba(0, 0, 0, 0.1), 0 1px 2px 0 rgba(0, 0, 0, 0.06)',
+    'md': '0 4px 6px -1px rgba(0, 0, 0, 0.1), 0 2px 4px -1px rgba(0, 0, 0, 0.06)',
+    'lg': '0 10px 15px -3px rgba(0, 0, 0, 0.1), 0 4px 6px -2px rgba(0, 0, 0, 0.05)',
+    'xl': '0 20px 25px -5px rgba(0, 0, 0, 0.1), 0 10px 10px -5px rgba(0, 0, 0, 0.04)',
+    '2xl': '0 25px 50px -12px rgba(0, 0, 0, 0.25)',
+    'inner': 'inset 0 2px 4px 0 rgba(0, 0, 0, 0.06)',
+    'none': 'none',
+}
+
+OPACITY_STEPS = ('0', '5', '10', '20', '25', '30', '40', '50', '60', '70', '75', '80', '90', '95', '100')
+
+GRADIENT_DIRECTIONS = {
+    't': 'to top', 'tr': 'to top right', 'r': 'to right', 'br': 'to bottom right',
+    'b': 'to bottom', 'bl': 'to bottom left', 'l': 'to left', 'tl': 'to top left',
+}
+
+STATIC_CLASSES = {
+    # Typography
+    'text-left': {'text-align': 'left'},
+    'text-center': {'text-align': 'center'},
+    'text-right': {'text-align': 'right'},
+    'text-justify': {'text-align': 'justify'},
+    'uppercase': {'text-transform': 'uppercase'},
+    'lowercase': {'text-transform': 'lowercase'},
+    'capitalize': {'text-transform': 'capitalize'},
+    'italic': {'font-style': 'italic'},
+    'not-italic': {'font-style': 'normal'},
+    'underline': {'text-decoration': 'underline'},
+    'line-through': {'text-decoration': 'line-through'},
+    'no-underline': {'text-decoration': 'none'},
+    'whitespace-nowrap': {'white-space': 'nowrap'},
+    'leading-none': {'line-height': '1'},
+    'leading-tight': {'line-height': '1.25'},
+    'leading-snug': {'line-height': '1.375'},
+    'leading-normal': {'line-height': '1.5'},
+    'leading-relaxed': {'line-height': '1.625'},
+    'leading-loose': {'line-height': '2'},
+    'tracking-tighter': {'letter-spacing': '-0.05em'},
+    'tracking-tight': {'letter-spacing': '-0.025em'},
+    'tracking-normal': {'letter-spacing': '0em'},
+    'tracking-wide': {'letter-spacing': '0.025em'},
+    'tracking-wider': {'letter-spacing': '0.05em'},
+    'tracking-widest': {'letter-spacing': '0.1em'},
+
+    # Display and flexbox
+    'block': {'display': 'block'},
+    'inline-block': {'display': 'inline-block'},
+    'inline': {'display': 'inline'},
+    'flex': {'display': 'flex'},
+    'inline-flex': {'display': 'inline-flex'},
+    'grid': {'display': 'grid'},
+    'hidden': {'display': 'none'},
+    'flex-row': {'flex-direction': 'row'},
+    'flex-row-reverse': {'flex-direction': 'row-reverse'},
+    'flex-col': {'flex-direction': 'column'},
+    'flex-col-reverse': {'flex-direction': 'column-reverse'},
+    'flex-wrap': {'flex-wrap': 'wrap'},
+    'flex-nowrap': {'flex-wrap': 'nowrap'},
+    'flex-1': {'flex': '1 1 0%'},
+    'flex-auto': {'flex': '1 1 auto'},
+    'flex-initial': {'flex': '0 1 auto'},
+    'flex-none': {'flex': 'none'},
+    'flex-grow': {'flex-grow': '1'},
+    'flex-grow-0': {'flex-grow': '0'},
+    'flex-shrink': {'flex-shrink': '1'},
+    'flex-shrink-0': {'flex-shrink': '0'},
+    'items-start': {'align-items': 'flex-start'},
+    'items-end': {'align-items': 'flex-end'},
+    'items-center': {'align-items': 'center'},
+    'items-baseline': {'align-items': 'baseline'},
+    'items-stretch': {'align-items': 'stretch'},
+    'justify-start': {'justify-content': 'flex-start'},
+    'justify-end': {'justify-content': 'flex-end'},
+    'justify-center': {'justify-content': 'center'},
+    'justify-between': {'justify-content': 'space-between'},
+    'justify-around': {'justify-content': 'space-around'},
+    'justify-evenly': {'justify-content': 'space-evenly'},
+    'self-start': {'align-self': 'flex-start'},
+    'self-end': {'align-self': 'flex-end'},
+    'self-center': {'align-self': 'center'},
+    'self-stretch': {'align-self': 'stretch'},
+    'grid-flow-row': {'grid-auto-flow': 'row'},
+    'grid-flow-col': {'grid-auto-flow': 'column'},
+    'col-span-full': {'grid-column': '1 / -1'},
+
+    # Lists
+    'list-disc': {'list-style-type': 'disc'},
+    'list-decimal': {'list-style-type': 'decimal'},
+    'list-none': {'list-style-type': 'none'},
+    'list-inside': {'list-style-position': 'inside'},
+    'list-outside': {'list-style-position': 'outside'},
+
+    # Position and layout
+    'static': {'position': 'static'},
+    'relative': {'position': 'relative'},
+    'absolute': {'position': 'absolute'},
+    'fixed': {'position': 'fixed'},
+    'sticky': {'position': 'sticky'},
+    'overflow-hidden': {'overflow': 'hidden'},
+    'overflow-auto': {'overflow': 'auto'},
+    'overflow-visible': {'overflow': 'visible'},
+    'object-contain': {'object-fit': 'contain'},
+    'object-cover': {'object-fit': 'cover'},
+    'truncate': {'overflow': 'hidden', 'text-overflow': 'ellipsis', 'white-space': 'nowrap'},
+    'font-sans': {'font-family': 'ui-sans-serif, system-ui, sans-serif'},
+    'font-serif': {'font-family': 'ui-serif, Georgia, serif'},
+    'font-mono': {'font-family': 'ui-monospace, Menlo, Consolas, monospace'},
+
+    # Dividers between children, recorded on the element like space-x/space-y
+    'divide-x': {'--divide-x': '1px'},
+    'divide-y': {'--divide-y': '1px'},
+
+    # Spacing
+    'mx-auto': {'margin-left': 'auto', 'margin-right': 'auto'},
+    'my-auto': {'margin-top': 'auto', 'margin-bottom': 'auto'},
+    'mt-auto': {'margin-top': 'auto'},
+    'mb-auto': {'margin-bottom': 'auto'},
+    'ml-auto': {'margin-left': 'auto'},
+    'mr-auto': {'margin-right': 'auto'},
+}
+
+
+def _spacing_value(step: str) -> str:
+    """Convert a spacing scale step to a CSS length"""
+    if step == '0':
+        return '0px'
+    return f"{float(step) * 0.25:g}rem"
+
+
+def _compile_class_table() -> Dict[str, Dict[str, str]]:
+    """Build the class name to style properties table"""
+    table = {}
+
+    for name, shades in PALETTE.items():
+        for shade, color in zip(COLOR_SHADES, shades):
+            table[f'text-{name}-{shade}'] = {'color': color}
+            table[f'bg-{name}-{shade}'] = {'background-color': color}
+            table[f'border-{name}-{shade}'] = {'border-color': color}
+    for name, color in SPECIAL_COLORS.items():
+        table[f'text-{name}'] = {'color': color}
+        table[f'bg-{name}'] = {'background-color': color}
+        table[f'border-{name}'] = {'border-color': color}
+
+    for cls, size in TEXT_SIZES.items():
+        table[cls] = {'font-size': size}
+    for name, weight in FONT_WEIGHTS.items():
+        table[f'font-{name}'] = {'font-weight': weight}
+
+    for prefix, properties in SPACING_PREFIXES.items():
+        for step in SPACING_STEPS + ('px',):
+            value = '1px' if step == 'px' else _spacing_value(step)
+            table[f'{prefix}-{step}'] = {prop: value for prop in properties}
+        if prefix in ('w', 'h', 'top', 'right', 'bottom', 'left', 'inset'):
+            for fraction in SIZE_FRACTIONS:
+                numerator, denominator = fraction.split('/')
+                value = f"{int(numerator) / int(denominator) * 100:.6g}%"
+                table[f'{prefix}-{fraction}'] = {prop: value for prop in properties}
+    for prefix, keywords in SIZE_KEYWORDS.items():
+        prop = {'w': 'width', 'h': 'height'}.get(prefix, prefix.replace('-w', '-width').replace('-h', '-height'))
+        for keyword, value in keywords.items():
+            table[f'{prefix}-{keyword}'] = {prop: value}
+
+    for name, radius in BORDER_RADII.items():
+        table[f'rounded-{name}' if name else 'rounded'] = {'border-radius': radius}
+    for side, suffix in BORDER_SIDES.items():
+        for width, value in BORDER_WIDTHS.items():
+            name = '-'.join(part for part in ('border', side, width) if part)
+            table[name] = {f'border{suffix}-width': value}
+    for name, shadow in SHADOWS.items():
+        table[f'shadow-{name}' if name else 'shadow'] = {'box-shadow': shadow}
+    for step in OPACITY_STEPS:
+        table[f'opacity-{step}'] = {'opacity': f"{int(step) / 100:g}"}
+
+    for columns in range(1, 13):
+        table[f'grid-cols-{columns}'] = {'grid-template-columns': f'repeat({columns}, minmax(0, 1fr))'}
+        table[f'col-span-{columns}'] = {'grid-column': f'span {columns} / span {columns}'}
+    table['grid-cols-none'] = {'grid-template-columns': 'none'}
+
+    for direction, value in GRADIENT_DIRECTIONS.items():
+        table[f'bg-gradient-to-{direction}'] = {'background-image': f'linear-gradient({value}, var(--tw-gradient-stops))'}
+    for name, shades in PALETTE.items():
+        for shade, color in zip(COLOR_SHADES, shades):
+            table[f'from-{name}-{shade}'] = {'--tw-gradient-from': color}
+            table[f'via-{name}-{shade}'] = {'--tw-gradient-via': color}
+            table[f'to-{name}-{shade}'] = {'--tw-gradient-to': color}
+            table[f'divide-{name}-{shade}'] = {'--divide-color': color}
+
+    table.update(STATIC_CLASSES)
+    return table
+
+
+CLASS_TABLE = _compile_class_table()
+
+
+@lru_cache(maxsize=2048)
+def resolve_classes(class_attr: str) -> Tuple[Tuple[str, ...], Dict[str, str]]:
+    """
+    Resolve a raw ``class`` attribute string to its class list and style properties
+
+    The result is cached and shared between callers, so it must not be mutated.
+
+    Args:
+        class_attr: Value of the element's ``class`` attribute
+
+    Returns:
+        Tuple of (class names, style properties)
+    """
+    classes = tuple(class_attr.split())
+    style = {}
+    for cls in classes:
+        props = CLASS_TABLE.get(cls)
+        if props:
+            style.update(props)
+    return classes, style
+
@@ -0,0 +1,237 @@
+"""
+Blob Store Module
+
+Content-addressed store for binary payloads such as images inlined as ``data:``
+URIs. Payloads are decoded in fixed-size chunks straight from the URI string and
+hashed and written to disk chunk by chunk, then filed under their SHA-256 at
+``<directory>/<hex[:2]>/<hex>`` so each distinct image is kept once. Slide trees
+hold only a short handle of the form ``blob:<media type>;sha256,<hex>``, mirroring
+the data URI it replaces.
+
+A store without a directory keeps payloads in memory and writes only those larger
+than SPILL_BYTES to a temporary directory, created on first use.
+"""
+
+import binascii
+import hashlib
+import io
+import os
+import re
+import shutil
+import tempfile
+import weakref
+from typing import BinaryIO, Dict, Iterable, NamedTuple, Optional
+from urllib.parse import unquote_to_bytes
+
+BLOB_SCHEME = 'blob:'
+
+# Base64 characters decoded per step; a multiple of 4 so chunks decode independently
+_DECODE_CHUNK = 1 << 20
+
+# Largest payload a store without a directory keeps in memory
+SPILL_BYTES = 4 << 20
+
+_WHITESPACE_RE = re.compile(r'\s+')
+_BASE64_RE = re.compile(r'[A-Za-z0-9+/]*={0,2}')
+_HANDLE_RE = re.compile(r'blob:([^;,]*);sha256,([0-9a-f]{64})\Z')
+
+
+class BlobRef(NamedTuple):
+    """Parsed blob handle"""
+    media_type: str
+    digest: str
+
+
+def is_blob_handle(value: str) -> bool:
+    """Return whether an attribute value is a blob handle"""
+    return value.startswith(BLOB_SCHEME) and _HANDLE_RE.match(value) is not None
+
+
+def parse_blob_handle(handle: str) -> BlobRef:
+    """
+    Split a blob handle into media type and digest
+
+    Raises:
+        ValueError: If the value is not a blob handle
+    """
+    match = _HANDLE_RE.match(handle)
+    if not match:
+        raise ValueError(f"Not a blob handle: {handle[:80]}")
+    return BlobRef(match.group(1), match.group(2))
+
+
+class BlobStore:
+    """Content-addressed store of binary payloads kept as files in a directory or in memory"""
+
+    def __init__(self, directory: Optional[str] = None, spill_bytes: int = SPILL_BYTES):
+        """
+        Initialize the store
+
+        Args:
+            directory: Directory holding blobs (created if missing). When None, blobs
+                are kept in memory; larger ones go to a temporary directory that is
+                removed with the store.
+            spill_bytes: Largest blob kept in memory by a store without a directory
+        """
+        if directory is not None:
+            os.makedirs(directory, exist_ok=True)
+        self.directory = directory
+        self.spill_bytes = spill_bytes
+        self.stored = 0
+        self.deduplicated = 0
+        self._temporary = directory is None
+        self._cleanup: Optional[weakref.finalize] = None
+        # Blobs held in memory, by digest
+        self._memory: Dict[str, bytes] = {}
+
+    def path(self, handle: str) -> str:
+        """
+        Return the file path of a blob that is not held in memory
+
+        Raises:
+            FileNotFoundError: If the store has no directory yet
+        """
+        digest = parse_blob_handle(handle).digest
+        if self.directory is None:
+            raise FileNotFoundError(f"Blob not found: {handle[:80]}")
+        return os.path.join(self.directory, digest[:2], digest)
+
+    def read(self, handle: str) -> bytes:
+        """Return the contents of a blob"""
+        data = self._memory.get(parse_blob_handle(handle).digest)
+        if data is not None:
+            return data
+        with open(self.path(handle), 'rb') as f:
+            return f.read()
+
+    def open(self, handle: str) -> BinaryIO:
+        """Open a blob for reading"""
+        data = self._memory.get(parse_blob_handle(handle).digest)
+        if data is not None:
+            return io.BytesIO(data)
+        return open(self.path(handle), 'rb')
+
+    def __contains__(self, handle: str) -> bool:
+        if not is_blob_handle(handle):
+            return False
+        if parse_blob_handle(handle).digest in self._memory:
+            return True
+        return self.directory is not None and os.path.exists(self.path(handle))
+
+    def touch(self, handle: str) -> bool:
+        """Mark a blob as recently used for cache eviction; False if it does not exist"""
+        if not is_blob_handle(handle):
+            return False
+        if parse_blob_handle(handle).digest in self._memory:
+            return True
+        if self.directory is None:
+            return False
+        try:
+            os.utime(self.path(handle))
+        except OSError:
+            return False
+        return True
+
+    def put_data_uri(self, uri: str) -> Optional[str]:
+        """
+        Store the payload of a ``data:`` URI
+
+        Args:
+            uri: Complete data URI
+
+        Returns:
+            Blob handle, or None if the URI is malformed (it should then be kept as is)
+        """
+        comma = uri.find(',')
+        if uri[:5].lower() != 'data:' or comma < 0:
+            return None
+        params = uri[5:comma].split(';')
+        media_type = params[0].strip().lower() or 'text/plain'
+
+        if 'base64' not in (param.strip().lower() for param in params[1:]):
+            return self._store([unquote_to_bytes(uri[comma + 1:])], media_type)
+
+        # The payload is validated and decoded in place; only wrapped base64 is copied
+        start = comma + 1
+        payload = uri
+        if not _BASE64_RE.fullmatch(uri, start):
+            if not _WHITESPACE_RE.search(uri, start):
+                return None
+            # Wrapped base64 would misalign the fixed-size chunks
+            payload, start = _WHITESPACE_RE.sub('', uri[start:]), 0
+            if not _BASE64_RE.fullmatch(payload):
+                return None
+        chunks = (
+            binascii.a2b_base64(payload[offset:offset + _DECODE_CHUNK])
+            for offset in range(start, len(payload), _DECODE_CHUNK)
+        )
+        try:
+            return self._store(chunks, media_type)
+        except binascii.Error:
+            return None
+
+    def _store(self, chunks: Iterable[bytes], media_type: str) -> str:
+        """Keep decoded chunks under their content hash and return the handle"""
+        digest = hashlib.sha256()
+        chunks = iter(chunks)
+        buffered = []
+        if self._temporary:
+            size = 0
+            for chunk in chunks:
+                digest.update(chunk)
+                buffered.append(chunk)
+                size += len(chunk)
+                if size > self.spill_bytes:
+                    break
+            else:
+                handle = f"{BLOB_SCHEME}{media_type};sha256,{digest.hexdigest()}"
+                if handle in self:
+                    self.deduplicated += 1
+                else:
+                    self._memory[digest.hexdigest()] = b''.join(buffered)
+                    self.stored += 1
+                return handle
+
+        fd, temp_path = tempfile.mkstemp(dir=self._directory(), suffix='.tmp')
+        try:
+            with os.fdopen(fd, 'wb') as f:
+                # Chunks buffered before spilling are already hashed
+                for chunk in buffered:
+                    f.write(chunk)
+                for chunk in chunks:
+                    digest.update(chunk)
+                    f.write(chunk)
+            handle = f"{BLOB_SCHEME}{media_type};sha256,{digest.hexdigest()}"
+            path = self.path(handle)
+            if self.touch(handle):
+                self.deduplicated += 1
+                os.unlink(temp_path)
+                return handle
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            os.replace(temp_path, path)
+        except BaseException:
+            if os.path.exists(temp_path):
+                os.unlink(temp_path)
+            raise
+        self.stored += 1
+        return handle
+
+    def _directory(self) -> str:
+        """Return the blob directory, creating the temporary one on first use"""
+        if self.directory is None:
+            self.directory = tempfile.mkdtemp(prefix='html_to_pptx_blobs_')
+            self._cleanup = weakref.finalize(self, shutil.rmtree, self.directory, True)
+        return self.directory
+
+    def __reduce__(self):
+        # Worker processes cannot see the blobs held in memory here, so they write to
+        # the directory, which they share but never remove
+        return (BlobStore, (self._directory(),))
+
+    def cleanup(self):
+        """Drop the blobs held in memory and remove a temporary store's directory now; the store stays usable"""
+        self._memory.clear()
+        if self._cleanup is not None:
+            self._cleanup()
+            self._cleanup = None
+            self.directory = None
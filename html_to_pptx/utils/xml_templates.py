@@ -2,76 +2,253 @@
 XML Templates for PPTX generation
 
 Contains all XML templates needed for creating PPTX files.
+Templates are compiled once at import: parts without variable content are kept as
+pre-encoded UTF-8 bytes, and the others are split into static byte chunks and
+slots, so rendering is a single ``b"".join`` and every getter returns bytes.
 """
 
+import re
+from typing import Any, Dict, List, Mapping, Sequence, Tuple
 
-class XMLTemplates:
-    """Collection of XML templates for PPTX generation"""
+# Most slot values contain no XML special characters and are returned unchanged
+_NEEDS_ESCAPE_RE = re.compile('[&<>"\']')
+
+_SLOT_RE = re.compile(r'\{(\w+)\}')
+
+# Bump whenever a template change alters the XML rendered for the same slide content
+TEMPLATE_VERSION = 1
+
+# Custom part recording what each slide was rendered from, for incremental updates
+MANIFEST_PART = 'html_to_pptx/manifest.json'
+MANIFEST_RELATIONSHIP = 'urn:html-to-pptx:relationships:slide-manifest'
+
+
+def escape_xml(text: str) -> str:
+    """Escape special XML characters"""
+    if not text or not _NEEDS_ESCAPE_RE.search(text):
+        return text or ""
+    return (text
+            .replace("&", "&amp;")
+            .replace("<", "&lt;")
+            .replace(">", "&gt;")
+            .replace('"', "&quot;")
+            .replace("'", "&apos;"))
+
+
+class CompiledTemplate:
+    """XML template split into static byte chunks and ``{name}`` slots
     
-    @staticmethod
-    def get_content_types():
-        """Get [Content_Types].xml template"""
-        return '''<?xml version="1.0" encoding="UTF-8" standalone="yes"?>
+    Slot values are escaped and encoded when rendered; ``bytes`` values are taken
+    to be already rendered markup and inserted as is.
+    """
+    
+    __slots__ = ('_chunks', '_slots')
+    
+    def __init__(self, source: str):
+        chunks = []
+        slots = []
+        pos = 0
+        for match in _SLOT_RE.finditer(source):
+            chunks.append(source[pos:match.start()].encode('utf-8'))
+            slots.append((len(chunks), match.group(1)))
+            chunks.append(b'')
+            pos = match.end()
+        chunks.append(source[pos:].encode('utf-8'))
+        self._chunks = chunks
+        self._slots = tuple(slots)
+        
+    def parts(self, values: Dict[str, Any]) -> List[bytes]:
+        """Return the rendered chunks, for joining together with other templates"""
+        parts = self._chunks.copy()
+        for index, name in self._slots:
+            value = values[name]
+            if isinstance(value, bytes):
+                parts[index] = value
+            else:
+                parts[index] = escape_xml(str(value)).encode('utf-8')
+        return parts
+        
+    def render(self, **values: Any) -> bytes:
+        """Render the template to UTF-8 bytes"""
+        return b''.join(self.parts(values))
+
+
+_CONTENT_TYPES = CompiledTemplate('''<?xml version="1.0" encoding="UTF-8" standalone="yes"?>
 <Types xmlns="http://schemas.openxmlformats.org/package/2006/content-types">
     <Default Extension="rels" ContentType="application/vnd.openxmlformats-package.relationships+xml"/>
     <Default Extension="xml" ContentType="application/xml"/>
-    <Override PartName="/ppt/presentation.xml" ContentType="application/vnd.openxmlformats-officedocument.presentationml.presentation.main+xml"/>
-    <Override PartName="/ppt/slides/slide1.xml" ContentType="application/vnd.openxmlformats-officedocument.presentationml.slide+xml"/>
+    <Default Extension="json" ContentType="application/json"/>
+{media_defaults}    <Override PartName="/ppt/presentation.xml" ContentType="application/vnd.openxmlformats-officedocument.presentationml.presentation.main+xml"/>
+{slide_overrides}
     <Override PartName="/ppt/slideLayouts/slideLayout1.xml" ContentType="application/vnd.openxmlformats-officedocument.presentationml.slideLayout+xml"/>
     <Override PartName="/ppt/slideMasters/slideMaster1.xml" ContentType="application/vnd.openxmlformats-officedocument.presentationml.slideMaster+xml"/>
     <Override PartName="/ppt/theme/theme1.xml" ContentType="application/vnd.openxmlformats-officedocument.theme+xml"/>
     <Override PartName="/docProps/core.xml" ContentType="application/vnd.openxmlformats-package.core-properties+xml"/>
     <Override PartName="/docProps/app.xml" ContentType="application/vnd.openxmlformats-officedocument.extended-properties+xml"/>
-</Types>'''
+</Types>''')
 
-    @staticmethod
-    def get_root_relationships():
-        """Get root relationships template"""
-        return '''<?xml version="1.0" encoding="UTF-8" standalone="yes"?>
+_MEDIA_DEFAULT = CompiledTemplate('    <Default Extension="{extension}" ContentType="{content_type}"/>\n')
+
+_SLIDE_OVERRIDE = CompiledTemplate('    <Override PartName="/ppt/slides/slide{number}.xml" ContentType="application/vnd.openxmlformats-officedocument.presentationml.slide+xml"/>')
+
+_ROOT_RELATIONSHIPS = f'''<?xml version="1.0" encoding="UTF-8" standalone="yes"?>
 <Relationships xmlns="http://schemas.openxmlformats.org/package/2006/relationships">
     <Relationship Id="rId1" Type="http://schemas.openxmlformats.org/officeDocument/2006/relationships/officeDocument" Target="ppt/presentation.xml"/>
     <Relationship Id="rId2" Type="http://schemas.openxmlformats.org/package/2006/relationships/metadata/core-properties" Target="docProps/core.xml"/>
     <Relationship Id="rId3" Type="http://schemas.openxmlformats.org/officeDocument/2006/relationships/extended-properties" Target="docProps/app.xml"/>
-</Relationships>'''
+    <Relationship Id="rId4" Type="{MANIFEST_RELATIONSHIP}" Target="{MANIFEST_PART}"/>
+</Relationships>'''.encode('utf-8')
 
-    @staticmethod
-    def escape_xml(text: str) -> str:
-        """Escape special XML characters"""
-        if not text:
-            return ""
-        return (text
-                .replace("&", "&amp;")
-                .replace("<", "&lt;")
-                .replace(">", "&gt;")
-                .replace('"', "&quot;")
-                .replace("'", "&apos;"))
-    
-    @staticmethod
-    def get_core_properties(title: str, creator: str):
-        """Get core properties template"""
-        return f'''<?xml version="1.0" encoding="UTF-8" standalone="yes"?>
-<cp:coreProperties xmlns:cp="http://schemas.openxmlformats.org/package/2006/metadata/core-properties" xmlns:dc="http://purl.org/dc/elements/1.1/" xmlns:dcterms="http://purl.org/dc/terms/" xmlns:dcmitype="http://purl.org/dc/dcmitype/" xmlns:xsi="http://www.w3.org/2001/XMLSchema-instance">
-    <dc:title>{XMLTemplates.escape_xml(title)}</dc:title>
-    <dc:creator>{XMLTemplates.escape_xml(creator)}</dc:creator>
-</cp:coreProperties>'''
-
-    @staticmethod
-    def get_app_properties():
-        """Get app properties template"""
-        return '''<?xml version="1.0" encoding="UTF-8" standalone="yes"?>
+_APP_PROPERTIES = CompiledTemplate('''<?xml version="1.0" encoding="UTF-8" standalone="yes"?>
 <Properties xmlns="http://schemas.openxmlformats.org/officeDocument/2006/extended-properties" xmlns:vt="http://schemas.openxmlformats.org/officeDocument/2006/docPropsVTypes">
     <Application>HTML to PPTX Converter</Application>
     <PresentationFormat>On-screen Show (16:9)</PresentationFormat>
-    <Slides>1</Slides>
+    <Slides>{slide_count}</Slides>
     <TotalTime>0</TotalTime>
-</Properties>'''
+</Properties>''')
 
-    @staticmethod
-    def get_presentation(slide_count: int):
-        """Get presentation.xml template"""
-        slide_ids = '\n'.join([f'        <p:sldId id="{256 + i}" r:id="rId{i + 1}"/>' for i in range(slide_count)])
-        
-        return f'''<?xml version="1.0" encoding="UTF-8" standalone="yes"?>
+_SLIDE_RELATIONSHIPS = '''<?xml version="1.0" encoding="UTF-8" standalone="yes"?>
+<Relationships xmlns="http://schemas.openxmlformats.org/package/2006/relationships">
+    <Relationship Id="rId1" Type="http://schemas.openxmlformats.org/officeDocument/2006/relationships/slideLayout" Target="../slideLayouts/slideLayout1.xml"/>
+</Relationships>'''.encode('utf-8')
+
+# Slide relationships with images spliced in before the closing tag
+_SLIDE_RELATIONSHIPS_HEAD, _SLIDE_RELATIONSHIPS_TAIL = _SLIDE_RELATIONSHIPS.rsplit(b'\n', 1)
+
+_IMAGE_RELATIONSHIP = CompiledTemplate('''
+    <Relationship Id="rId{rid}" Type="http://schemas.openxmlformats.org/officeDocument/2006/relationships/image" Target="../media/{target}"/>''')
+
+_SLIDE_LAYOUT = '''<?xml version="1.0" encoding="UTF-8" standalone="yes"?>
+<p:sldLayout xmlns:a="http://schemas.openxmlformats.org/drawingml/2006/main" xmlns:r="http://schemas.openxmlformats.org/officeDocument/2006/relationships" xmlns:p="http://schemas.openxmlformats.org/presentationml/2006/main" type="blank">
+    <p:cSld name="Blank">
+        <p:spTree>
+            <p:nvGrpSpPr>
+                <p:cNvPr id="1" name=""/>
+                <p:cNvGrpSpPr/>
+                <p:nvPr/>
+            </p:nvGrpSpPr>
+            <p:grpSpPr/>
+        </p:spTree>
+    </p:cSld>
+</p:sldLayout>'''.encode('utf-8')
+
+_SLIDE_LAYOUT_RELATIONSHIPS = '''<?xml version="1.0" encoding="UTF-8" standalone="yes"?>
+<Relationships xmlns="http://schemas.openxmlformats.org/package/2006/relationships">
+    <Relationship Id="rId1" Type="http://schemas.openxmlformats.org/officeDocument/2006/relationships/slideMaster" Target="../slideMasters/slideMaster1.xml"/>
+</Relationships>'''.encode('utf-8')
+
+_SLIDE_MASTER = '''<?xml version="1.0" encoding="UTF-8" standalone="yes"?>
+<p:sldMaster xmlns:a="http://schemas.openxmlformats.org/drawingml/2006/main" xmlns:r="http://schemas.openxmlformats.org/officeDocument/2006/relationships" xmlns:p="http://schemas.openxmlformats.org/presentationml/2006/main">
+    <p:cSld>
+        <p:bg>
+            <p:bgRef idx="1001">
+                <a:schemeClr val="bg1"/>
+            </p:bgRef>
+        </p:bg>
+        <p:spTree>
+            <p:nvGrpSpPr>
+                <p:cNvPr id="1" name=""/>
+                <p:cNvGrpSpPr/>
+                <p:nvPr/>
+            </p:nvGrpSpPr>
+            <p:grpSpPr/>
+        </p:spTree>
+    </p:cSld>
+    <p:sldLayoutIdLst>
+        <p:sldLayoutId id="2147483649" r:id="rId1"/>
+    </p:sldLayoutIdLst>
+</p:sldMaster>'''.encode('utf-8')
+
+_SLIDE_MASTER_RELATIONSHIPS = '''<?xml version="1.0" encoding="UTF-8" standalone="yes"?>
+<Relationships xmlns="http://schemas.openxmlformats.org/package/2006/relationships">
+    <Relationship Id="rId1" Type="http://schemas.openxmlformats.org/officeDocument/2006/relationships/slideLayout" Target="../slideLayouts/slideLayout1.xml"/>
+    <Relationship Id="rId2" Type="http://schemas.openxmlformats.org/officeDocument/2006/relationships/theme" Target="../theme/theme1.xml"/>
+</Relationships>'''.encode('utf-8')
+
+_THEME = '''<?xml version="1.0" encoding="UTF-8" standalone="yes"?>
+<a:theme xmlns:a="http://schemas.openxmlformats.org/drawingml/2006/main" name="Office Theme">
+    <a:themeElements>
+        <a:clrScheme name="Office">
+            <a:dk1><a:sysClr val="windowText" lastClr="000000"/></a:dk1>
+            <a:lt1><a:sysClr val="window" lastClr="FFFFFF"/></a:lt1>
+            <a:dk2><a:srgbClr val="44546A"/></a:dk2>
+            <a:lt2><a:srgbClr val="E7E6E6"/></a:lt2>
+            <a:accent1><a:srgbClr val="4472C4"/></a:accent1>
+            <a:accent2><a:srgbClr val="ED7D31"/></a:accent2>
+            <a:accent3><a:srgbClr val="A5A5A5"/></a:accent3>
+            <a:accent4><a:srgbClr val="FFC000"/></a:accent4>
+            <a:accent5><a:srgbClr val="5B9BD5"/></a:accent5>
+            <a:accent6><a:srgbClr val="70AD47"/></a:accent6>
+            <a:hlink><a:srgbClr val="0563C1"/></a:hlink>
+            <a:folHlink><a:srgbClr val="954F72"/></a:folHlink>
+        </a:clrScheme>
+        <a:fontScheme name="Office">
+            <a:majorFont>
+                <a:latin typeface="Calibri Light"/>
+                <a:ea typeface=""/>
+                <a:cs typeface=""/>
+                <a:font script="Jpan" typeface="游ゴシック Light"/>
+            </a:majorFont>
+            <a:minorFont>
+                <a:latin typeface="Calibri"/>
+                <a:ea typeface=""/>
+                <a:cs typeface=""/>
+                <a:font script="Jpan" typeface="游ゴシック"/>
+            </a:minorFont>
+        </a:fontScheme>
+        <a:fmtScheme name="Office">
+            <a:fillStyleLst>
+                <a:solidFill><a:schemeClr val="phClr"/></a:solidFill>
+                <a:gradFill rotWithShape="1">
+                    <a:gsLst>
+                        <a:gs pos="0"><a:schemeClr val="phClr"><a:lumMod val="110000"/><a:satMod val="105000"/><a:tint val="67000"/></a:schemeClr></a:gs>
+                        <a:gs pos="50000"><a:schemeClr val="phClr"><a:lumMod val="105000"/><a:satMod val="103000"/><a:tint val="73000"/></a:schemeClr></a:gs>
+                        <a:gs pos="100000"><a:schemeClr val="phClr"><a:lumMod val="105000"/><a:satMod val="109000"/><a:tint val="81000"/></a:schemeClr></a:gs>
+                    </a:gsLst>
+                    <a:lin ang="5400000" scaled="0"/>
+                </a:gradFill>
+            </a:fillStyleLst>
+            <a:lnStyleLst>
+                <a:ln w="9525" cap="flat" cmpd="sng" algn="ctr"><a:solidFill><a:schemeClr val="phClr"><a:shade val="95000"/><a:satMod val="105000"/></a:schemeClr></a:solidFill><a:prstDash val="solid"/></a:ln>
+                <a:ln w="25400" cap="flat" cmpd="sng" algn="ctr"><a:solidFill><a:schemeClr val="phClr"/></a:solidFill><a:prstDash val="solid"/></a:ln>
+                <a:ln w="38100" cap="flat" cmpd="sng" algn="ctr"><a:solidFill><a:schemeClr val="phClr"/></a:solidFill><a:prstDash val="solid"/></a:ln>
+            </a:lnStyleLst>
+            <a:effectStyleLst>
+                <a:effectStyle><a:effectLst/></a:effectStyle>
+                <a:effectStyle><a:effectLst/></a:effectStyle>
+                <a:effectStyle><a:effectLst><a:outerShdw blurRad="40000" dist="23000" dir="5400000" rotWithShape="0"><a:srgbClr val="000000"><a:alpha val="35000"/></a:srgbClr></a:outerShdw></a:effectLst></a:effectStyle>
+            </a:effectStyleLst>
+            <a:bgFillStyleLst>
+                <a:solidFill><a:schemeClr val="phClr"/></a:solidFill>
+                <a:gradFill rotWithShape="1">
+                    <a:gsLst>
+                        <a:gs pos="0"><a:schemeClr val="phClr"><a:tint val="40000"/><a:satMod val="350000"/></a:schemeClr></a:gs>
+                        <a:gs pos="40000"><a:schemeClr val="phClr"><a:tint val="45000"/><a:shade val="99000"/><a:satMod val="350000"/></a:schemeClr></a:gs>
+                        <a:gs pos="100000"><a:schemeClr val="phClr"><a:shade val="20000"/><a:satMod val="255000"/></a:schemeClr></a:gs>
+                    </a:gsLst>
+                    <a:path path="circle"><a:fillToRect l="50000" t="-80000" r="50000" b="180000"/></a:path>
+                </a:gradFill>
+                <a:gradFill rotWithShape="1">
+                    <a:gsLst>
+                        <a:gs pos="0"><a:schemeClr val="phClr"><a:tint val="80000"/><a:satMod val="300000"/></a:schemeClr></a:gs>
+                        <a:gs pos="100000"><a:schemeClr val="phClr"><a:shade val="30000"/><a:satMod val="200000"/></a:schemeClr></a:gs>
+                    </a:gsLst>
+                    <a:path path="circle"><a:fillToRect l="50000" t="50000" r="50000" b="50000"/></a:path>
+                </a:gradFill>
+            </a:bgFillStyleLst>
+        </a:fmtScheme>
+    </a:themeElements>
+    <a:objectDefaults/>
+    <a:extraClrSchemeLst/>
+</a:theme>'''.encode('utf-8')
+
+_CORE_PROPERTIES = CompiledTemplate('''<?xml version="1.0" encoding="UTF-8" standalone="yes"?>
+<cp:coreProperties xmlns:cp="http://schemas.openxmlformats.org/package/2006/metadata/core-properties" xmlns:dc="http://purl.org/dc/elements/1.1/" xmlns:dcterms="http://purl.org/dc/terms/" xmlns:dcmitype="http://purl.org/dc/dcmitype/" xmlns:xsi="http://www.w3.org/2001/XMLSchema-instance">
+    <dc:title>{title}</dc:title>
+    <dc:creator>{creator}</dc:creator>
+</cp:coreProperties>''')
+
+_PRESENTATION = CompiledTemplate('''<?xml version="1.0" encoding="UTF-8" standalone="yes"?>
 <p:presentation xmlns:a="http://schemas.openxmlformats.org/drawingml/2006/main" xmlns:r="http://schemas.openxmlformats.org/officeDocument/2006/relationships" xmlns:p="http://schemas.openxmlformats.org/presentationml/2006/main">
     <p:sldMasterIdLst>
         <p:sldMasterId id="2147483648" r:id="rId1"/>
@@ -81,29 +258,20 @@ class XMLTemplates:
     </p:sldIdLst>
     <p:sldSz cx="12192000" cy="6858000"/>
     <p:notesSz cx="6858000" cy="9144000"/>
-</p:presentation>'''
+</p:presentation>''')
 
-    @staticmethod
-    def get_presentation_relationships(slide_count: int):
-        """Get presentation relationships template"""
-        slide_rels = '\n'.join([f'    <Relationship Id="rId{i + 1}" Type="http://schemas.openxmlformats.org/officeDocument/2006/relationships/slide" Target="slides/slide{i + 1}.xml"/>' for i in range(slide_count)])
-        
-        return f'''<?xml version="1.0" encoding="UTF-8" standalone="yes"?>
+_SLIDE_ID = CompiledTemplate('        <p:sldId id="{id}" r:id="rId{rid}"/>')
+
+_PRESENTATION_RELATIONSHIPS = CompiledTemplate('''<?xml version="1.0" encoding="UTF-8" standalone="yes"?>
 <Relationships xmlns="http://schemas.openxmlformats.org/package/2006/relationships">
     <Relationship Id="rId1" Type="http://schemas.openxmlformats.org/officeDocument/2006/relationships/slideMaster" Target="slideMasters/slideMaster1.xml"/>
 {slide_rels}
-    <Relationship Id="rId{slide_count + 2}" Type="http://schemas.openxmlformats.org/officeDocument/2006/relationships/theme" Target="theme/theme1.xml"/>
-</Relationships>'''
+    <Relationship Id="rId{theme_rid}" Type="http://schemas.openxmlformats.org/officeDocument/2006/relationships/theme" Target="theme/theme1.xml"/>
+</Relationships>''')
 
-    @staticmethod
-    def get_slide(title: str, subtitle: str, period: str):
-        """Get slide template"""
-        # Escape XML special characters
-        title_escaped = XMLTemplates.escape_xml(title)
-        subtitle_escaped = XMLTemplates.escape_xml(subtitle) if subtitle else ""
-        period_escaped = XMLTemplates.escape_xml(period) if period else ""
-        
-        slide_xml = f'''<?xml version="1.0" encoding="UTF-8" standalone="yes"?>
+_SLIDE_RELATIONSHIP = CompiledTemplate('    <Relationship Id="rId{rid}" Type="http://schemas.openxmlformats.org/officeDocument/2006/relationships/slide" Target="slides/slide{number}.xml"/>')
+
+_SLIDE_HEAD = '''<?xml version="1.0" encoding="UTF-8" standalone="yes"?>
 <p:sld xmlns:a="http://schemas.openxmlformats.org/drawingml/2006/main" xmlns:r="http://schemas.openxmlformats.org/officeDocument/2006/relationships" xmlns:p="http://schemas.openxmlformats.org/presentationml/2006/main">
     <p:cSld>
         <p:spTree>
@@ -119,11 +287,9 @@ class XMLTemplates:
                     <a:chOff x="0" y="0"/>
                     <a:chExt cx="12192000" cy="6858000"/>
                 </a:xfrm>
-            </p:grpSpPr>'''
-            
-        # Add title if present
-        if title_escaped:
-            slide_xml += f'''
+            </p:grpSpPr>'''.encode('utf-8')
+
+_SLIDE_TITLE = CompiledTemplate('''
             <p:sp>
                 <p:nvSpPr>
                     <p:cNvPr id="2" name="Title"/>
@@ -150,15 +316,13 @@ class XMLTemplates:
                                     <a:srgbClr val="000000"/>
                                 </a:solidFill>
                             </a:rPr>
-                            <a:t>{title_escaped}</a:t>
+                            <a:t>{title}</a:t>
                         </a:r>
                     </a:p>
                 </p:txBody>
-            </p:sp>'''
-            
-        # Add subtitle if present
-        if subtitle_escaped:
-            slide_xml += f'''
+            </p:sp>''')
+
+_SLIDE_SUBTITLE = CompiledTemplate('''
             <p:sp>
                 <p:nvSpPr>
                     <p:cNvPr id="3" name="Subtitle"/>
@@ -185,15 +349,13 @@ class XMLTemplates:
                                     <a:srgbClr val="8A2BE2"/>
                                 </a:solidFill>
                             </a:rPr>
-                            <a:t>{subtitle_escaped}</a:t>
+                            <a:t>{subtitle}</a:t>
                         </a:r>
                     </a:p>
                 </p:txBody>
-            </p:sp>'''
-            
-        # Add period if present  
-        if period_escaped:
-            slide_xml += f'''
+            </p:sp>''')
+
+_SLIDE_PERIOD = CompiledTemplate('''
             <p:sp>
                 <p:nvSpPr>
                     <p:cNvPr id="4" name="Period"/>
@@ -218,163 +380,170 @@ class XMLTemplates:
                                     <a:srgbClr val="666666"/>
                                 </a:solidFill>
                             </a:rPr>
-                            <a:t>対象期間: {period_escaped}</a:t>
+                            <a:t>対象期間: {period}</a:t>
                         </a:r>
                     </a:p>
                 </p:txBody>
-            </p:sp>'''
-            
-        # Close the slide
-        slide_xml += '''
+            </p:sp>''')
+
+_SLIDE_PICTURE = CompiledTemplate('''
+            <p:pic>
+                <p:nvPicPr>
+                    <p:cNvPr id="{id}" name="Picture {number}" descr="{description}"/>
+                    <p:cNvPicPr>
+                        <a:picLocks noChangeAspect="1"/>
+                    </p:cNvPicPr>
+                    <p:nvPr/>
+                </p:nvPicPr>
+                <p:blipFill>
+                    <a:blip r:embed="rId{rid}"/>
+                    <a:stretch>
+                        <a:fillRect/>
+                    </a:stretch>
+                </p:blipFill>
+                <p:spPr>
+                    <a:xfrm>
+                        <a:off x="{x}" y="{y}"/>
+                        <a:ext cx="{cx}" cy="{cy}"/>
+                    </a:xfrm>
+                    <a:prstGeom prst="rect">
+                        <a:avLst/>
+                    </a:prstGeom>
+                </p:spPr>
+            </p:pic>''')
+
+# Shape ids 2-4 are taken by the title, subtitle and period
+_FIRST_PICTURE_ID = 5
+
+_SLIDE_TAIL = '''
         </p:spTree>
     </p:cSld>
-</p:sld>'''
+</p:sld>'''.encode('utf-8')
+
+
+class XMLTemplates:
+    """Collection of XML templates for PPTX generation"""
+    
+    @staticmethod
+    def get_content_types(slide_count: int = 1, media_types: Mapping[str, str] = None) -> bytes:
+        """
+        Get [Content_Types].xml template
         
-        return slide_xml
+        Args:
+            slide_count: Number of slides
+            media_types: Content type of each media file extension in the package
+        """
+        slide_overrides = b'\n'.join([_SLIDE_OVERRIDE.render(number=i + 1) for i in range(slide_count)])
+        media_defaults = b''.join([
+            _MEDIA_DEFAULT.render(extension=extension, content_type=content_type)
+            for extension, content_type in sorted((media_types or {}).items())
+        ])
+        return _CONTENT_TYPES.render(slide_overrides=slide_overrides, media_defaults=media_defaults)
 
     @staticmethod
-    def get_slide_relationships():
-        """Get slide relationships template"""
-        return '''<?xml version="1.0" encoding="UTF-8" standalone="yes"?>
-<Relationships xmlns="http://schemas.openxmlformats.org/package/2006/relationships">
-    <Relationship Id="rId1" Type="http://schemas.openxmlformats.org/officeDocument/2006/relationships/slideLayout" Target="../slideLayouts/slideLayout1.xml"/>
-</Relationships>'''
+    def get_root_relationships() -> bytes:
+        """Get root relationships template"""
+        return _ROOT_RELATIONSHIPS
+
+    @staticmethod
+    def escape_xml(text: str) -> str:
+        """Escape special XML characters"""
+        return escape_xml(text)
+    
+    @staticmethod
+    def get_core_properties(title: str, creator: str) -> bytes:
+        """Get core properties template"""
+        return _CORE_PROPERTIES.render(title=title or '', creator=creator or '')
+
+    @staticmethod
+    def get_app_properties(slide_count: int = 1) -> bytes:
+        """Get app properties template"""
+        return _APP_PROPERTIES.render(slide_count=slide_count)
+
+    @staticmethod
+    def get_presentation(slide_count: int) -> bytes:
+        """Get presentation.xml template"""
+        slide_ids = b'\n'.join([_SLIDE_ID.render(id=256 + i, rid=i + 2) for i in range(slide_count)])
+        return _PRESENTATION.render(slide_ids=slide_ids)
+
+    @staticmethod
+    def get_presentation_relationships(slide_count: int) -> bytes:
+        """Get presentation relationships template"""
+        slide_rels = b'\n'.join([_SLIDE_RELATIONSHIP.render(rid=i + 2, number=i + 1) for i in range(slide_count)])
+        return _PRESENTATION_RELATIONSHIPS.render(slide_rels=slide_rels, theme_rid=slide_count + 2)
+
+    @staticmethod
+    def get_slide(title: str, subtitle: str, period: str,
+                  pictures: Sequence[Tuple[int, int, int, int, int, str]] = ()) -> bytes:
+        """
+        Get slide template
+        
+        Args:
+            title: Slide title
+            subtitle: Slide subtitle
+            period: Period shown below the subtitle
+            pictures: (relationship number, x, y, cx, cy, description) of each image,
+                with position and size in EMU
+        """
+        parts = [_SLIDE_HEAD]
+        
+        # Add title, subtitle and period shapes if present
+        if title:
+            parts += _SLIDE_TITLE.parts({'title': title})
+        if subtitle:
+            parts += _SLIDE_SUBTITLE.parts({'subtitle': subtitle})
+        if period:
+            parts += _SLIDE_PERIOD.parts({'period': period})
+            
+        # Add pictures above the text
+        for number, (rid, x, y, cx, cy, description) in enumerate(pictures, 1):
+            parts += _SLIDE_PICTURE.parts({
+                'id': _FIRST_PICTURE_ID + number - 1, 'number': number, 'rid': rid,
+                'x': x, 'y': y, 'cx': cx, 'cy': cy, 'description': description
+            })
+            
+        # Close the slide
+        parts.append(_SLIDE_TAIL)
+        return b''.join(parts)
+
+    @staticmethod
+    def get_slide_relationships(images: Sequence[Tuple[int, str]] = ()) -> bytes:
+        """
+        Get slide relationships template
+        
+        Args:
+            images: (relationship number, media file name) of each image on the slide;
+                relationship 1 is the slide layout
+        """
+        if not images:
+            return _SLIDE_RELATIONSHIPS
+        parts = [_SLIDE_RELATIONSHIPS_HEAD]
+        for rid, target in images:
+            parts += _IMAGE_RELATIONSHIP.parts({'rid': rid, 'target': target})
+        parts += [b'\n', _SLIDE_RELATIONSHIPS_TAIL]
+        return b''.join(parts)
 
     @staticmethod
-    def get_slide_layout():
+    def get_slide_layout() -> bytes:
         """Get slide layout template"""
-        return '''<?xml version="1.0" encoding="UTF-8" standalone="yes"?>
-<p:sldLayout xmlns:a="http://schemas.openxmlformats.org/drawingml/2006/main" xmlns:r="http://schemas.openxmlformats.org/officeDocument/2006/relationships" xmlns:p="http://schemas.openxmlformats.org/presentationml/2006/main" type="blank">
-    <p:cSld name="Blank">
-        <p:spTree>
-            <p:nvGrpSpPr>
-                <p:cNvPr id="1" name=""/>
-                <p:cNvGrpSpPr/>
-                <p:nvPr/>
-            </p:nvGrpSpPr>
-            <p:grpSpPr/>
-        </p:spTree>
-    </p:cSld>
-</p:sldLayout>'''
+        return _SLIDE_LAYOUT
 
     @staticmethod
-    def get_slide_layout_relationships():
+    def get_slide_layout_relationships() -> bytes:
         """Get slide layout relationships template"""
-        return '''<?xml version="1.0" encoding="UTF-8" standalone="yes"?>
-<Relationships xmlns="http://schemas.openxmlformats.org/package/2006/relationships">
-    <Relationship Id="rId1" Type="http://schemas.openxmlformats.org/officeDocument/2006/relationships/slideMaster" Target="../slideMasters/slideMaster1.xml"/>
-</Relationships>'''
+        return _SLIDE_LAYOUT_RELATIONSHIPS
 
     @staticmethod
-    def get_slide_master():
+    def get_slide_master() -> bytes:
         """Get slide master template"""
-        return '''<?xml version="1.0" encoding="UTF-8" standalone="yes"?>
-<p:sldMaster xmlns:a="http://schemas.openxmlformats.org/drawingml/2006/main" xmlns:r="http://schemas.openxmlformats.org/officeDocument/2006/relationships" xmlns:p="http://schemas.openxmlformats.org/presentationml/2006/main">
-    <p:cSld>
-        <p:bg>
-            <p:bgRef idx="1001">
-                <a:schemeClr val="bg1"/>
-            </p:bgRef>
-        </p:bg>
-        <p:spTree>
-            <p:nvGrpSpPr>
-                <p:cNvPr id="1" name=""/>
-                <p:cNvGrpSpPr/>
-                <p:nvPr/>
-            </p:nvGrpSpPr>
-            <p:grpSpPr/>
-        </p:spTree>
-    </p:cSld>
-    <p:sldLayoutIdLst>
-        <p:sldLayoutId id="2147483649" r:id="rId1"/>
-    </p:sldLayoutIdLst>
-</p:sldMaster>'''
+        return _SLIDE_MASTER
 
     @staticmethod
-    def get_slide_master_relationships():
+    def get_slide_master_relationships() -> bytes:
         """Get slide master relationships template"""
-        return '''<?xml version="1.0" encoding="UTF-8" standalone="yes"?>
-<Relationships xmlns="http://schemas.openxmlformats.org/package/2006/relationships">
-    <Relationship Id="rId1" Type="http://schemas.openxmlformats.org/officeDocument/2006/relationships/slideLayout" Target="../slideLayouts/slideLayout1.xml"/>
-    <Relationship Id="rId2" Type="http://schemas.openxmlformats.org/officeDocument/2006/relationships/theme" Target="../theme/theme1.xml"/>
-</Relationships>'''
+        return _SLIDE_MASTER_RELATIONSHIPS
 
     @staticmethod
-    def get_theme():
+    def get_theme() -> bytes:
         """Get theme template"""
-        return '''<?xml version="1.0" encoding="UTF-8" standalone="yes"?>
-<a:theme xmlns:a="http://schemas.openxmlformats.org/drawingml/2006/main" name="Office Theme">
-    <a:themeElements>
-        <a:clrScheme name="Office">
-            <a:dk1><a:sysClr val="windowText" lastClr="000000"/></a:dk1>
-            <a:lt1><a:sysClr val="window" lastClr="FFFFFF"/></a:lt1>
-            <a:dk2><a:srgbClr val="44546A"/></a:dk2>
-            <a:lt2><a:srgbClr val="E7E6E6"/></a:lt2>
-            <a:accent1><a:srgbClr val="4472C4"/></a:accent1>
-            <a:accent2><a:srgbClr val="ED7D31"/></a:accent2>
-            <a:accent3><a:srgbClr val="A5A5A5"/></a:accent3>
-            <a:accent4><a:srgbClr val="FFC000"/></a:accent4>
-            <a:accent5><a:srgbClr val="5B9BD5"/></a:accent5>
-            <a:accent6><a:srgbClr val="70AD47"/></a:accent6>
-            <a:hlink><a:srgbClr val="0563C1"/></a:hlink>
-            <a:folHlink><a:srgbClr val="954F72"/></a:folHlink>
-        </a:clrScheme>
-        <a:fontScheme name="Office">
-            <a:majorFont>
-                <a:latin typeface="Calibri Light"/>
-                <a:ea typeface=""/>
-                <a:cs typeface=""/>
-                <a:font script="Jpan" typeface="游ゴシック Light"/>
-            </a:majorFont>
-            <a:minorFont>
-                <a:latin typeface="Calibri"/>
-                <a:ea typeface=""/>
-                <a:cs typeface=""/>
-                <a:font script="Jpan" typeface="游ゴシック"/>
-            </a:minorFont>
-        </a:fontScheme>
-        <a:fmtScheme name="Office">
-            <a:fillStyleLst>
-                <a:solidFill><a:schemeClr val="phClr"/></a:solidFill>
-                <a:gradFill rotWithShape="1">
-                    <a:gsLst>
-                        <a:gs pos="0"><a:schemeClr val="phClr"><a:lumMod val="110000"/><a:satMod val="105000"/><a:tint val="67000"/></a:schemeClr></a:gs>
-                        <a:gs pos="50000"><a:schemeClr val="phClr"><a:lumMod val="105000"/><a:satMod val="103000"/><a:tint val="73000"/></a:schemeClr></a:gs>
-                        <a:gs pos="100000"><a:schemeClr val="phClr"><a:lumMod val="105000"/><a:satMod val="109000"/><a:tint val="81000"/></a:schemeClr></a:gs>
-                    </a:gsLst>
-                    <a:lin ang="5400000" scaled="0"/>
-                </a:gradFill>
-            </a:fillStyleLst>
-            <a:lnStyleLst>
-                <a:ln w="9525" cap="flat" cmpd="sng" algn="ctr"><a:solidFill><a:schemeClr val="phClr"><a:shade val="95000"/><a:satMod val="105000"/></a:schemeClr></a:solidFill><a:prstDash val="solid"/></a:ln>
-                <a:ln w="25400" cap="flat" cmpd="sng" algn="ctr"><a:solidFill><a:schemeClr val="phClr"/></a:solidFill><a:prstDash val="solid"/></a:ln>
-                <a:ln w="38100" cap="flat" cmpd="sng" algn="ctr"><a:solidFill><a:schemeClr val="phClr"/></a:solidFill><a:prstDash val="solid"/></a:ln>
-            </a:lnStyleLst>
-            <a:effectStyleLst>
-                <a:effectStyle><a:effectLst/></a:effectStyle>
-                <a:effectStyle><a:effectLst/></a:effectStyle>
-                <a:effectStyle><a:effectLst><a:outerShdw blurRad="40000" dist="23000" dir="5400000" rotWithShape="0"><a:srgbClr val="000000"><a:alpha val="35000"/></a:srgbClr></a:outerShdw></a:effectLst></a:effectStyle>
-            </a:effectStyleLst>
-            <a:bgFillStyleLst>
-                <a:solidFill><a:schemeClr val="phClr"/></a:solidFill>
-                <a:gradFill rotWithShape="1">
-                    <a:gsLst>
-                        <a:gs pos="0"><a:schemeClr val="phClr"><a:tint val="40000"/><a:satMod val="350000"/></a:schemeClr></a:gs>
-                        <a:gs pos="40000"><a:schemeClr val="phClr"><a:tint val="45000"/><a:shade val="99000"/><a:satMod val="350000"/></a:schemeClr></a:gs>
-                        <a:gs pos="100000"><a:schemeClr val="phClr"><a:shade val="20000"/><a:satMod val="255000"/></a:schemeClr></a:gs>
-                    </a:gsLst>
-                    <a:path path="circle"><a:fillToRect l="50000" t="-80000" r="50000" b="180000"/></a:path>
-                </a:gradFill>
-                <a:gradFill rotWithShape="1">
-                    <a:gsLst>
-                        <a:gs pos="0"><a:schemeClr val="phClr"><a:tint val="80000"/><a:satMod val="300000"/></a:schemeClr></a:gs>
-                        <a:gs pos="100000"><a:schemeClr val="phClr"><a:shade val="30000"/><a:satMod val="200000"/></a:schemeClr></a:gs>
-                    </a:gsLst>
-                    <a:path path="circle"><a:fillToRect l="50000" t="50000" r="50000" b="50000"/></a:path>
-                </a:gradFill>
-            </a:bgFillStyleLst>
-        </a:fmtScheme>
-    </a:themeElements>
-    <a:objectDefaults/>
-    <a:extraClrSchemeLst/>
-</a:theme>'''
\ No newline at end of file
+        return _THEME
@@ -0,0 +1,89 @@
+"""Shared fixtures for the html_to_pptx test suite"""
+
+import glob
+import io
+import os
+import sys
+import zipfile
+
+import pytest
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if REPO_ROOT not in sys.path:
+    sys.path.insert(0, REPO_ROOT)
+
+# Every real deck in the repository, used by the corpus-wide tests
+PJT_DECKS = sorted(glob.glob(os.path.join(REPO_ROOT, 'pjt', '*', 'slides', '*.html')))
+PATTERNS_DECK = os.path.join(REPO_ROOT, 'patterns', 'slide_patterns.html')
+REFERENCE_DECK = os.path.join(REPO_ROOT, 'reference', 'sample_green.html')
+
+# 1x1 transparent GIF
+GIF_DATA_URI = 'data:image/gif;base64,R0lGODlhAQABAIAAAAAAAP///yH5BAEAAAAALAAAAAABAAEAAAICRAEAOw=='
+
+
+def deck_html(slides: int = 3, body: str = '', head: str = '') -> str:
+    """
+    Return a synthetic deck in the layout of the decks under pjt/
+
+    Args:
+        slides: Number of slide containers
+        body: Extra markup placed in every slide; ``{n}`` is replaced by the slide number
+        head: Extra markup for the document head (e.g. a <style> block)
+    """
+    parts = [f'<!DOCTYPE html><html lang="ja"><head><meta charset="UTF-8"><title>Deck</title>{head}</head><body>']
+    for n in range(slides):
+        parts.append(
+            f'<div class="slide-container bg-white"><div class="logo">= SB C&amp;S</div>'
+            f'<div class="title-box p-8"><h1 class="text-3xl font-bold">Title {n}</h1>'
+            f'<h2 class="text-xl text-gray-600">Subtitle {n}</h2>'
+            f'<div class="subtitle text-sm">対象期間: 2025年{n + 1}月</div></div>'
+            f'<ul class="list-disc"><li class="text-lg">Point {n}.1</li><li>Point {n}.2</li></ul>'
+            f'{body.replace("{n}", str(n))}</div>'
+        )
+    parts.append('</body></html>')
+    return '\n'.join(parts)
+
+
+def png_bytes(width: int, height: int) -> bytes:
+    """Return a PNG of the given size (header plus a minimal image body)"""
+    import struct
+    import zlib
+
+    def chunk(kind: bytes, data: bytes) -> bytes:
+        return struct.pack('>I', len(data)) + kind + data + struct.pack('>I', zlib.crc32(kind + data))
+
+    raw = b''.join(b'\x00' + b'\x00\x00\x00' * width for _ in range(height))
+    return (b'\x89PNG\r\n\x1a\n' + chunk(b'IHDR', struct.pack('>IIBBBBB', width, height, 8, 2, 0, 0, 0))
+            + chunk(b'IDAT', zlib.compress(raw)) + chunk(b'IEND', b''))
+
+
+def package_parts(data_or_path) -> dict:
+    """Return the parts of a PPTX package as {name: bytes}"""
+    source = io.BytesIO(data_or_path) if isinstance(data_or_path, bytes) else data_or_path
+    with zipfile.ZipFile(source) as package:
+        return {name: package.read(name) for name in package.namelist()}
+
+
+def slide_texts(slides) -> list:
+    """Reduce parsed slides to comparable plain data: metadata plus the element tree"""
+    def element(node):
+        return (node.type, node.content, tuple(sorted(node.attributes.items())),
+                tuple(sorted((k, str(v)) for k, v in node.style.items())),
+                tuple(element(child) for child in node.children))
+    return [(slide['metadata'], tuple(element(e) for e in slide['elements'])) for slide in slides]
+
+
+@pytest.fixture
+def deck_file(tmp_path):
+    """Write a synthetic deck to a file and return its path"""
+    def write(slides: int = 3, body: str = '', head: str = '', name: str = 'deck.html') -> str:
+        path = tmp_path / name
+        path.write_text(deck_html(slides, body, head), encoding='utf-8')
+        return str(path)
+    return write
+
+
+def requires(module: str):
+    """Skip a test unless an optional dependency is installed"""
+    import importlib.util
+    return pytest.mark.skipif(importlib.util.find_spec(module) is None, reason=f'{module} is not installed')
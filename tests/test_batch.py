@@ -0,0 +1,78 @@
+"""Batch conversion of many decks in one process"""
+
+import json
+import os
+import subprocess
+import sys
+
+import pytest
+
+from conftest import REPO_ROOT, deck_html, package_parts
+from html_to_pptx.core.batch import batch_outputs, convert_batch, find_batch_inputs
+
+
+@pytest.fixture
+def decks(tmp_path):
+    """Three good decks in two directories and one that is not UTF-8"""
+    (tmp_path / 'a').mkdir()
+    (tmp_path / 'a' / 'sub').mkdir()
+    for name, slides in (('a/one.html', 1), ('a/two.html', 2), ('a/sub/three.html', 3)):
+        (tmp_path / name).write_text(deck_html(slides), encoding='utf-8')
+    (tmp_path / 'a' / 'broken.html').write_bytes(b'<div class="slide-container">\xff\xfe</div>')
+    (tmp_path / 'a' / 'notes.txt').write_text('not a deck')
+    return tmp_path
+
+
+def test_inputs_from_a_directory_or_glob(decks):
+    def names(paths):
+        return [os.path.relpath(path, decks) for path in paths]
+
+    assert names(find_batch_inputs(str(decks / 'a'))) == ['a/broken.html', 'a/one.html', 'a/two.html']
+    assert names(find_batch_inputs(str(decks / 'a' / 't*.html'))) == ['a/two.html']
+    assert 'a/sub/three.html' in names(find_batch_inputs(str(decks / '**' / '*.html')))
+    assert find_batch_inputs(str(decks / 'missing')) == []
+
+
+def test_outputs_mirror_the_input_layout(decks):
+    inputs = [str(decks / 'a' / 'one.html'), str(decks / 'a' / 'sub' / 'three.html')]
+    assert batch_outputs(inputs) == [(inputs[0], str(decks / 'a' / 'one.pptx')),
+                                     (inputs[1], str(decks / 'a' / 'sub' / 'three.pptx'))]
+    out = str(decks / 'out')
+    assert [output for _, output in batch_outputs(inputs, out)] == \
+        [os.path.join(out, 'one.pptx'), os.path.join(out, 'sub', 'three.pptx')]
+
+
+@pytest.mark.parametrize('workers', [1, 2])
+def test_every_file_gets_a_record(decks, workers):
+    jobs = batch_outputs(find_batch_inputs(str(decks / '**' / '*.html')), str(decks / 'out'))
+    results = {os.path.basename(result['input']): result
+               for result in convert_batch(jobs, workers, {'use_native': True})}
+    assert set(results) == {'broken.html', 'one.html', 'two.html', 'three.html'}
+    assert not results['broken.html']['ok']
+    assert results['broken.html']['error'].startswith('UnicodeDecodeError')
+    for name, slides in (('one.html', 1), ('two.html', 2), ('three.html', 3)):
+        assert results[name]['ok'] and results[name]['error'] is None
+        parts = package_parts(results[name]['output'])
+        assert f'ppt/slides/slide{slides}.xml' in parts
+
+
+def test_cli_prints_json_lines_and_fails_only_for_failures(decks):
+    def run(target):
+        return subprocess.run(
+            [sys.executable, '-m', 'html_to_pptx.cli', '--batch', target, '--native', '--no-daemon',
+             '--jobs', '2', '--output-dir', str(decks / 'cli')],
+            cwd=REPO_ROOT, capture_output=True, text=True, timeout=120
+        )
+
+    failing = run(str(decks / 'a'))
+    records = [json.loads(line) for line in failing.stdout.splitlines()]
+    assert failing.returncode == 1
+    assert sorted((os.path.basename(r['input']), r['ok']) for r in records) == \
+        [('broken.html', False), ('one.html', True), ('two.html', True)]
+
+    passing = run(str(decks / 'a' / '[ot]*.html'))
+    assert passing.returncode == 0
+    assert len(passing.stdout.splitlines()) == 2
+
+    empty = run(str(decks / 'nothing-*.html'))
+    assert empty.returncode == 2 and 'matched no files' in empty.stderr
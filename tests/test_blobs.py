@@ -0,0 +1,141 @@
+"""Content-addressed blob store for inline data URIs and its share of the cache budget"""
+
+import base64
+import os
+
+import pytest
+
+from conftest import deck_html, package_parts, png_bytes
+from html_to_pptx.core.cache import ParseCache
+from html_to_pptx.core.converter import HTMLtoPPTXConverter
+from html_to_pptx.parsers.html_parser import SlideHTMLParser
+from html_to_pptx.utils import blobs
+from html_to_pptx.utils.blobs import BlobStore, is_blob_handle, parse_blob_handle
+
+
+class _UnencodableURI(str):
+    """A URI that fails if the store copies the whole of it to bytes"""
+
+    def encode(self, *args, **kwargs):
+        raise AssertionError('the whole URI was encoded')
+
+
+def _png_uri(width=4, height=3):
+    return 'data:image/png;base64,' + base64.b64encode(png_bytes(width, height)).decode('ascii')
+
+
+def test_data_uri_is_stored_once_under_its_digest(tmp_path):
+    store = BlobStore(str(tmp_path))
+    uri = _png_uri()
+    handle = store.put_data_uri(_UnencodableURI(uri))
+    assert is_blob_handle(handle)
+    assert parse_blob_handle(handle).media_type == 'image/png'
+    assert store.read(handle) == png_bytes(4, 3)
+    assert store.put_data_uri(uri) == handle
+    assert (store.stored, store.deduplicated) == (1, 1)
+
+
+def test_payload_is_decoded_in_chunks(tmp_path, monkeypatch):
+    monkeypatch.setattr(blobs, '_DECODE_CHUNK', 8)
+    store = BlobStore(str(tmp_path))
+    handle = store.put_data_uri(_UnencodableURI(_png_uri(20, 20)))
+    assert store.read(handle) == png_bytes(20, 20)
+
+
+@pytest.mark.parametrize('uri, expected', [
+    ('data:text/plain,hello%20world', b'hello world'),
+    ('data:image/gif;base64,R0lG\nODlh', base64.b64decode('R0lGODlh')),
+    ('data:;base64,AAEC', b'\x00\x01\x02'),
+])
+def test_plain_and_wrapped_payloads(tmp_path, uri, expected):
+    store = BlobStore(str(tmp_path))
+    assert store.read(store.put_data_uri(uri)) == expected
+
+
+@pytest.mark.parametrize('uri', ['data:image/png;base64,not base64!', 'data:image/png;base64,ＡＢＣＤ',
+                                 'image/png;base64,AAAA', 'data:image/png;base64'])
+def test_malformed_uris_are_left_alone(tmp_path, uri):
+    assert BlobStore(str(tmp_path)).put_data_uri(uri) is None
+
+
+def test_parser_keeps_only_handles_in_the_tree(tmp_path):
+    store = BlobStore(str(tmp_path))
+    slide = SlideHTMLParser(store).parse(deck_html(1, body=f'<img src="{_png_uri()}">'))[0]
+    image = slide['elements'][0].children[-1]
+    assert image.type == 'img' and is_blob_handle(image.attributes['src'])
+    assert image.attributes['src'] in store
+
+
+def test_temporary_store_is_removed(tmp_path):
+    store = BlobStore(spill_bytes=0)
+    store.put_data_uri(_png_uri())
+    directory = store.directory
+    assert _blob_files(directory)
+    store.cleanup()
+    assert not os.path.exists(directory)
+
+
+def test_temporary_store_keeps_small_blobs_in_memory():
+    store = BlobStore(spill_bytes=len(png_bytes(4, 3)))
+    small = store.put_data_uri(_png_uri())
+    assert store.directory is None
+    assert small in store and store.touch(small)
+    with store.open(small) as f:
+        assert f.read() == png_bytes(4, 3)
+    assert store.put_data_uri(_png_uri()) == small
+    assert (store.stored, store.deduplicated) == (1, 1)
+
+    # Larger payloads spill to a temporary directory, created only now
+    large = store.put_data_uri(_png_uri(40, 40))
+    assert store.read(large) == png_bytes(40, 40)
+    assert os.path.isfile(store.path(large))
+    directory = store.directory
+    store.cleanup()
+    assert not os.path.exists(directory)
+    assert small not in store and large not in store
+
+
+def _blob_files(directory):
+    return [name for _, _, names in os.walk(directory) for name in names]
+
+
+def test_blobs_count_toward_the_cache_budget(tmp_path, deck_file):
+    cache_dir = tmp_path / 'cache'
+    converter = HTMLtoPPTXConverter(use_native=True, cache_dir=str(cache_dir))
+    for n in range(3):
+        html_file = deck_file(1, body=f'<img src="{_png_uri(40 + n, 40)}">', name=f'deck{n}.html')
+        assert converter.convert_file(html_file, str(tmp_path / f'deck{n}.pptx'))
+    stats = converter.cache.stats()
+    blob_bytes = sum(os.path.getsize(os.path.join(root, name))
+                     for root, _, names in os.walk(cache_dir / 'blobs') for name in names)
+    assert blob_bytes > 0 and stats['bytes'] > blob_bytes
+
+    converter.cache.max_bytes = stats['bytes'] // 2
+    converter.cache.put('extra', [], {})
+    assert converter.cache.stats()['bytes'] <= converter.cache.max_bytes
+    assert len(_blob_files(cache_dir / 'blobs')) < 3
+
+
+def test_entries_whose_blobs_were_evicted_are_misses(tmp_path, deck_file):
+    cache_dir = tmp_path / 'cache'
+    html_file = deck_file(2, body=f'<img src="{_png_uri()}">')
+    converter = HTMLtoPPTXConverter(use_native=True, cache_dir=str(cache_dir))
+    assert converter.convert_file(html_file, str(tmp_path / 'first.pptx'))
+    for root, _, names in os.walk(cache_dir / 'blobs'):
+        for name in names:
+            os.unlink(os.path.join(root, name))
+
+    fresh = HTMLtoPPTXConverter(use_native=True, cache_dir=str(cache_dir))
+    assert fresh.convert_file(html_file, str(tmp_path / 'second.pptx'))
+    assert fresh.cache.stats()['hits'] == 0
+    media = [name for name in package_parts(str(tmp_path / 'second.pptx')) if name.startswith('ppt/media/')]
+    assert len(media) == 1
+
+
+def test_cache_without_a_blob_store_ignores_handles(tmp_path):
+    store = BlobStore(str(tmp_path / 'blobs'))
+    parser = SlideHTMLParser(store)
+    slides = parser.parse(deck_html(1, body=f'<img src="{_png_uri()}">'))
+    cache = ParseCache(str(tmp_path / 'cache'))
+    cache.put('key', slides, {})
+    assert cache.get('key') is not None
@@ -0,0 +1,79 @@
+"""Streaming packages into write-only file objects"""
+
+import io
+import socket
+import threading
+
+from conftest import deck_html, package_parts, requires
+from html_to_pptx.builders.pptx_builder import PPTXBuilder
+from html_to_pptx.parsers.html_parser import SlideHTMLParser
+
+
+class _Sink:
+    """Write-only, non-seekable file object recording what reached it"""
+
+    def __init__(self):
+        self.chunks = []
+
+    def write(self, data):
+        self.chunks.append(bytes(data))
+        return len(data)
+
+    @property
+    def written(self):
+        return sum(len(chunk) for chunk in self.chunks)
+
+
+def test_build_to_a_non_seekable_sink_matches_build(tmp_path):
+    slides = SlideHTMLParser().parse(deck_html(4))
+    sink = _Sink()
+    builder = PPTXBuilder(use_native=True, deterministic=True)
+    builder.build_to(slides, sink, {'title': 'Deck'})
+    builder.build(slides, str(tmp_path / 'deck.pptx'), {'title': 'Deck'})
+    data = b''.join(sink.chunks)
+    assert data == (tmp_path / 'deck.pptx').read_bytes()
+    assert len(package_parts(data)) > 10
+
+
+def test_first_bytes_are_written_before_the_last_slide_is_parsed():
+    html = deck_html(6)
+    sink = _Sink()
+    written_before = []
+
+    def slides():
+        for index, slide in enumerate(SlideHTMLParser().iter_slides(io.StringIO(html))):
+            if index == 5:
+                written_before.append(sink.written)
+            yield slide
+
+    PPTXBuilder(use_native=True).build_to(slides(), sink)
+    assert written_before[0] > 0
+    # Earlier slides are already in the stream
+    assert b'ppt/slides/slide4.xml' in b''.join(sink.chunks)[:written_before[0]]
+
+
+def test_build_to_a_socket():
+    slides = SlideHTMLParser().parse(deck_html(3))
+    left, right = socket.socketpair()
+    received = []
+    reader = threading.Thread(target=lambda: received.append(right.makefile('rb').read()))
+    reader.start()
+    with left, left.makefile('wb') as stream:
+        PPTXBuilder(use_native=True).build_to(slides, stream)
+    reader.join()
+    right.close()
+    assert 'ppt/slides/slide3.xml' in package_parts(received[0])
+
+
+def test_build_to_leaves_the_file_object_open():
+    out = io.BytesIO()
+    PPTXBuilder(use_native=True).build_to(SlideHTMLParser().parse(deck_html(1)), out)
+    assert not out.closed
+
+
+@requires('pptx')
+def test_library_build_to_a_non_seekable_sink():
+    sink = _Sink()
+    PPTXBuilder(use_native=False).build_to(SlideHTMLParser().parse(deck_html(2)), sink)
+    parts = package_parts(b''.join(sink.chunks))
+    assert 'ppt/slides/slide2.xml' in parts
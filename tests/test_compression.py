@@ -0,0 +1,61 @@
+"""Compression profiles chosen per part type"""
+
+import zipfile
+
+import pytest
+
+from conftest import deck_html, png_bytes
+from html_to_pptx.builders.package import COMPRESSION_PROFILES, check_compression, compression_level
+from html_to_pptx.builders.pptx_builder import PPTXBuilder
+from html_to_pptx.core.converter import HTMLtoPPTXConverter
+from html_to_pptx.parsers.html_parser import SlideHTMLParser
+
+
+@pytest.mark.parametrize('name, profile, expected', [
+    ('ppt/slides/slide1.xml', 'fast', 1),
+    ('ppt/slides/slide1.xml', 'smallest', 9),
+    ('ppt/slides/slide1.xml', 'stored', None),
+    ('ppt/media/image1.png', 'smallest', None),
+    ('ppt/media/IMAGE2.JPEG', 'balanced', None),
+    ('ppt/media/image3.bmp', 'fast', 1),
+])
+def test_level_depends_on_profile_and_part_type(name, profile, expected):
+    assert compression_level(name, profile) == expected
+
+
+def test_unknown_profiles_are_rejected():
+    with pytest.raises(ValueError, match='Unknown compression profile'):
+        check_compression('ultra')
+    with pytest.raises(ValueError):
+        PPTXBuilder(use_native=True, compression='ultra')
+
+
+def _build(tmp_path, profile):
+    image = tmp_path / 'chart.png'
+    image.write_bytes(png_bytes(60, 40))
+    slides = SlideHTMLParser().parse(deck_html(20, body='<img src="chart.png">'))
+    path = tmp_path / f'{profile}.pptx'
+    PPTXBuilder(use_native=True, compression=profile, base_dir=str(tmp_path)).build(slides, str(path))
+    return path
+
+
+def test_profiles_trade_size_and_store_media(tmp_path):
+    sizes = {}
+    for profile in COMPRESSION_PROFILES:
+        path = _build(tmp_path, profile)
+        sizes[profile] = path.stat().st_size
+        with zipfile.ZipFile(path) as package:
+            assert package.testzip() is None
+            methods = {info.filename: info.compress_type for info in package.infolist()}
+        media = [method for name, method in methods.items() if name.startswith('ppt/media/')]
+        assert media == [zipfile.ZIP_STORED]
+        expected = zipfile.ZIP_STORED if profile == 'stored' else zipfile.ZIP_DEFLATED
+        assert methods['ppt/slides/slide1.xml'] == expected
+    assert sizes['smallest'] <= sizes['balanced'] <= sizes['fast'] < sizes['stored']
+
+
+def test_converter_passes_the_profile_through(tmp_path, deck_file):
+    output = tmp_path / 'deck.pptx'
+    assert HTMLtoPPTXConverter(use_native=True, compression='stored').convert_file(deck_file(2), str(output))
+    with zipfile.ZipFile(output) as package:
+        assert {info.compress_type for info in package.infolist()} == {zipfile.ZIP_STORED}
@@ -0,0 +1,153 @@
+"""In-memory conversion to bytes and structured conversion errors"""
+
+import asyncio
+import base64
+import io
+import os
+import tempfile
+import zipfile
+
+import pytest
+
+from conftest import deck_html, package_parts, png_bytes, requires
+from html_to_pptx.builders import package
+from html_to_pptx.core.converter import ConversionError, HTMLtoPPTXConverter
+
+
+def _media(data: bytes):
+    return [name for name in package_parts(data) if name.startswith('ppt/media/')]
+
+
+def _temporary_dirs():
+    return {name for name in os.listdir(tempfile.gettempdir()) if name.startswith('html_to_pptx_')}
+
+
+def test_bytes_are_a_package_and_nothing_touches_the_disk(tmp_path, monkeypatch, capsys):
+    monkeypatch.chdir(tmp_path)
+    uri = 'data:image/png;base64,' + base64.b64encode(png_bytes(8, 6)).decode('ascii')
+    before = _temporary_dirs()
+    converter = HTMLtoPPTXConverter(use_native=True)
+    data = converter.convert_to_bytes(deck_html(3, body=f'<img src="{uri}">'))
+    with zipfile.ZipFile(io.BytesIO(data)) as archive:
+        assert archive.testzip() is None
+    assert len(_media(data)) == 1
+    assert capsys.readouterr().out == ''
+    assert os.listdir(tmp_path) == []
+    assert _temporary_dirs() == before
+    assert converter.blob_store.directory is None
+
+
+def test_each_conversion_releases_its_images():
+    converter = HTMLtoPPTXConverter(use_native=True)
+    for n in range(20):
+        uri = 'data:image/png;base64,' + base64.b64encode(png_bytes(8 + n, 6)).decode('ascii')
+        assert len(_media(converter.convert_to_bytes(deck_html(2, body=f'<img src="{uri}">')))) == 1
+    assert converter.blob_store.stored == 20
+    assert converter.blob_store._memory == {}
+    assert converter.builder.media._images == {}
+
+
+def test_blobs_of_cached_slides_are_kept(tmp_path, deck_file):
+    uri = 'data:image/png;base64,' + base64.b64encode(png_bytes(8, 6)).decode('ascii')
+    html_file = deck_file(2, body=f'<img src="{uri}">')
+    converter = HTMLtoPPTXConverter(use_native=True, cache_dir=str(tmp_path / 'cache'))
+    assert converter.convert_file(html_file, str(tmp_path / 'first.pptx'))
+    assert converter.convert_file(html_file, str(tmp_path / 'second.pptx'))
+    assert converter.cache.stats()['hits'] == 1
+    assert len(_media(str(tmp_path / 'second.pptx'))) == 1
+
+
+def test_spilled_blobs_are_removed_after_the_conversion():
+    converter = HTMLtoPPTXConverter(use_native=True)
+    converter.blob_store.spill_bytes = 0
+    uri = 'data:image/png;base64,' + base64.b64encode(png_bytes(8, 6)).decode('ascii')
+    before = _temporary_dirs()
+    assert _media(converter.convert_to_bytes(deck_html(1, body=f'<img src="{uri}">')))
+    assert converter.blob_store.stored == 1
+    assert converter.blob_store.directory is None
+    assert _temporary_dirs() == before
+    converter.close()
+
+
+def test_async_wrapper_returns_the_same_bytes():
+    converter = HTMLtoPPTXConverter(use_native=True, deterministic=True)
+    html = deck_html(2)
+    assert asyncio.run(converter.convert_to_bytes_async(html)) == converter.convert_to_bytes(html)
+
+
+def test_local_files_are_read_only_under_a_given_base_dir(tmp_path, monkeypatch):
+    (tmp_path / 'secret.png').write_bytes(png_bytes(5, 5))
+    monkeypatch.chdir(tmp_path)
+    images = ''.join(f'<img src="{src}">' for src in (
+        'secret.png', str(tmp_path / 'secret.png'), (tmp_path / 'secret.png').as_uri()))
+    converter = HTMLtoPPTXConverter(use_native=True)
+    assert _media(converter.convert_to_bytes(deck_html(1, body=images))) == []
+    assert _media(converter.convert_to_bytes(deck_html(1, body=images), base_dir=str(tmp_path)))
+
+    output = tmp_path / 'string.pptx'
+    assert converter.convert_string(deck_html(1, body=images), str(output))
+    assert _media(str(output)) == []
+
+
+def test_paths_leading_outside_the_base_dir_are_not_embedded(tmp_path):
+    (tmp_path / 'assets').mkdir()
+    (tmp_path / 'secret').mkdir()
+    (tmp_path / 'secret' / 'private.png').write_bytes(png_bytes(5, 5))
+    (tmp_path / 'assets' / 'logo.png').write_bytes(png_bytes(6, 6))
+    os.symlink(tmp_path / 'secret' / 'private.png', tmp_path / 'assets' / 'link.png')
+    private = tmp_path / 'secret' / 'private.png'
+    converter = HTMLtoPPTXConverter(use_native=True)
+    base_dir = str(tmp_path / 'assets')
+    for src in ('../secret/private.png', str(private), private.as_uri(), 'link.png', 'sub/../../secret/private.png'):
+        assert _media(converter.convert_to_bytes(deck_html(1, body=f'<img src="{src}">'), base_dir=base_dir)) == []
+    logo = tmp_path / 'assets' / 'logo.png'
+    for src in ('logo.png', str(logo), logo.as_uri(), './sub/../logo.png'):
+        assert len(_media(converter.convert_to_bytes(deck_html(1, body=f'<img src="{src}">'), base_dir=base_dir))) == 1
+
+
+def test_relative_images_of_files_resolve_against_their_directory(tmp_path, monkeypatch):
+    (tmp_path / 'deck').mkdir()
+    (tmp_path / 'deck' / 'chart.png').write_bytes(png_bytes(5, 5))
+    (tmp_path / 'deck' / 'deck.html').write_text(deck_html(1, body='<img src="chart.png">'), encoding='utf-8')
+    monkeypatch.chdir(tmp_path)
+    converter = HTMLtoPPTXConverter(use_native=True)
+    assert converter.convert_file('deck/deck.html', str(tmp_path / 'deck.pptx'))
+    assert len(_media(str(tmp_path / 'deck.pptx'))) == 1
+
+
+def test_undecodable_input_is_invalid_input(tmp_path):
+    html_file = tmp_path / 'broken.html'
+    html_file.write_bytes(b'<div class="slide-container">\xff\xfe</div>')
+    converter = HTMLtoPPTXConverter(use_native=True)
+    assert not converter.convert_file(str(html_file), str(tmp_path / 'broken.pptx'))
+    assert converter.last_error.to_dict() == {
+        'kind': 'invalid_input', 'error_type': 'UnicodeDecodeError',
+        'message': converter.last_error.message, 'source': str(html_file)}
+
+
+def test_missing_input_is_not_found(tmp_path):
+    converter = HTMLtoPPTXConverter(use_native=True)
+    assert not converter.convert_file(str(tmp_path / 'missing.html'), str(tmp_path / 'out.pptx'))
+    assert converter.last_error.kind == 'not_found'
+
+
+def test_internal_value_errors_are_not_invalid_input(monkeypatch):
+    def too_large(*args, **kwargs):
+        raise ValueError("Package too large: ZIP64 archives are not supported")
+
+    monkeypatch.setattr(package.PackageWriter, 'write', too_large)
+    with pytest.raises(ConversionError) as raised:
+        HTMLtoPPTXConverter(use_native=True).convert_to_bytes(deck_html(1))
+    assert (raised.value.kind, raised.value.error_type) == ('internal', 'ValueError')
+    with pytest.raises(ValueError) as profile:
+        package.check_compression('tiny')
+    assert ConversionError.from_exception(profile.value).kind == 'internal'
+
+
+@requires('lxml')
+def test_lxml_parse_errors_are_invalid_input():
+    from lxml import etree
+
+    with pytest.raises(etree.XMLSyntaxError) as raised:
+        etree.fromstring(b'<a>')
+    assert ConversionError.from_exception(raised.value).kind == 'invalid_input'
@@ -0,0 +1,87 @@
+"""<style> block cascade: selector index, specificity, inheritance and the compile cache"""
+
+from conftest import REFERENCE_DECK, deck_html
+from html_to_pptx.parsers import css
+from html_to_pptx.parsers.css import compile_stylesheet
+from html_to_pptx.parsers.html_parser import SlideHTMLParser
+
+_STYLE = '''<style>
+.slide-container { color: #112233; font-family: "Noto Sans JP"; }
+.title-box { background-color: #e8f5e9; border-left: 6px solid #2e7d32; }
+.title-box h1 { color: #1b5e20; }
+div > .subtitle { font-style: italic; }
+li { margin-bottom: 4px !important; }
+#special { color: #ff0000; }
+</style>'''
+
+
+def _container(html):
+    return SlideHTMLParser().parse(html)[0]['elements'][0]
+
+
+def test_style_rules_reach_elements():
+    container = _container(deck_html(1, head=_STYLE))
+    title_box = container.children[1]
+    assert title_box.style['background-color'] == '#e8f5e9'
+    assert title_box.style['border-left'] == '6px solid #2e7d32'
+    h1, h2, subtitle = title_box.children
+    assert h1.style['color'] == '#1b5e20'
+    assert subtitle.style['font-style'] == 'italic'
+
+
+def test_inherited_properties_propagate_and_others_do_not():
+    container = _container(deck_html(1, head=_STYLE))
+    title_box = container.children[1]
+    h2 = title_box.children[1]
+    assert h2.style['font-family'] == '"Noto Sans JP"'
+    assert 'background-color' not in h2.style
+    # The Tailwind class on the h2 is more specific than the inherited colour
+    assert h2.style['color'] != '#112233'
+    assert container.children[0].style['color'] == '#112233'
+
+
+def test_specificity_inline_and_important_ordering():
+    body = '<p id="special" class="text-gray-600">a</p><ul><li style="margin-bottom: 9px">b</li></ul>'
+    container = _container(deck_html(1, body=body, head=_STYLE))
+    special, li = container.children[3], container.children[4].children[0]
+    assert special.style['color'] == '#ff0000'
+    assert li.style['margin-bottom'] == '4px'
+
+
+def test_index_buckets_rules_by_rightmost_compound():
+    sheet = compile_stylesheet('#a .b p { x: 1 } .c.d { x: 2 } span { x: 3 } * { x: 4 } p#e { x: 5 }')
+    assert set(sheet.by_id) == {'e'}
+    assert set(sheet.by_class) == {'c'}
+    assert set(sheet.by_tag) == {'p', 'span'}
+    assert len(sheet.universal) == 1
+
+
+def test_reference_deck_styles_reach_the_builder_input():
+    with open(REFERENCE_DECK, encoding='utf-8') as f:
+        container = SlideHTMLParser().parse(f.read())[0]['elements'][0]
+    # .slide-container plus the more specific .slide-container.active
+    assert container.style['width'] == '1280px'
+    assert container.style['background-color'] == 'white'
+    assert container.style['display'] == 'block'
+    # font-family is inherited from the body rule
+    assert container.style['font-family'].startswith("'Hiragino Sans'")
+    logo = container.children[0]
+    assert (logo.style['color'], logo.style['position']) == ('#888', 'absolute')
+    assert logo.style['font-family'] == container.style['font-family']
+
+
+def test_compiled_stylesheets_are_cached_by_content():
+    text = '.cached-rule { color: red; }'
+    first = compile_stylesheet(text)
+    assert compile_stylesheet(''.join(['.cached-rule', ' { color: red; }'])) is first
+    assert compile_stylesheet(text + ' ') is not first
+
+
+def test_decks_sharing_a_stylesheet_compile_it_once(monkeypatch):
+    calls = []
+    original = css._parse_rules
+    monkeypatch.setattr(css, '_parse_rules', lambda text: calls.append(text) or original(text))
+    head = '<style>.shared-once { color: #010203; }</style>'
+    for _ in range(3):
+        SlideHTMLParser().parse(deck_html(2, head=head))
+    assert len(calls) <= 1
@@ -0,0 +1,122 @@
+"""Conversion daemon and the client that forwards to it"""
+
+import os
+import shutil
+import socket
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+import zipfile
+
+import pytest
+
+from conftest import REPO_ROOT, deck_html, package_parts
+from html_to_pptx.core import daemon_client
+from html_to_pptx.core.daemon import ConversionDaemon
+from html_to_pptx.core.daemon_client import DaemonClient, DaemonUnavailable
+
+pytestmark = pytest.mark.skipif(not hasattr(socket, 'AF_UNIX'), reason='needs Unix domain sockets')
+
+
+@pytest.fixture
+def socket_dir():
+    # Socket paths are limited to about 100 bytes, too short for pytest's tmp_path
+    directory = tempfile.mkdtemp(prefix='h2p-')
+    yield directory
+    shutil.rmtree(directory, ignore_errors=True)
+
+
+@pytest.fixture
+def daemon(socket_dir):
+    server = ConversionDaemon(os.path.join(socket_dir, 'd.sock'))
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    client = DaemonClient(server.path, timeout=30)
+    deadline = time.monotonic() + 10
+    while client.ping() is None:
+        assert time.monotonic() < deadline, 'daemon did not start'
+        time.sleep(0.02)
+    yield server
+    server.shutdown()
+    thread.join(10)
+
+
+def _entry_time(path) -> tuple:
+    with zipfile.ZipFile(path) as package:
+        return package.infolist()[0].date_time
+
+
+def test_conversions_run_in_the_daemon(daemon, tmp_path):
+    (tmp_path / 'deck.html').write_text(deck_html(2), encoding='utf-8')
+    results = DaemonClient(daemon.path).convert(
+        [(str(tmp_path / 'deck.html'), str(tmp_path / 'deck.pptx')),
+         (str(tmp_path / 'missing.html'), str(tmp_path / 'missing.pptx'))],
+        {'use_native': True})
+    assert [result['ok'] for result in results] == [True, False]
+    assert results[0]['input'] == str(tmp_path / 'deck.html')
+    assert 'ppt/slides/slide2.xml' in package_parts(str(tmp_path / 'deck.pptx'))
+    status = DaemonClient(daemon.path).ping()
+    assert (status['pid'], status['converted'], status['rejected']) == (os.getpid(), 2, 0)
+
+
+def test_the_clients_source_date_epoch_is_used(daemon, tmp_path, monkeypatch):
+    (tmp_path / 'deck.html').write_text(deck_html(1), encoding='utf-8')
+    options = {'use_native': True, 'deterministic': True}
+    monkeypatch.setenv('SOURCE_DATE_EPOCH', '1700000000')
+    DaemonClient(daemon.path).convert([(str(tmp_path / 'deck.html'), str(tmp_path / 'a.pptx'))], options)
+    assert _entry_time(tmp_path / 'a.pptx') == time.gmtime(1700000000)[:6]
+
+    # A client without SOURCE_DATE_EPOCH gets the default, whatever the daemon's environment holds
+    monkeypatch.setattr(daemon_client, 'FORWARDED_ENVIRON', ())
+    DaemonClient(daemon.path).convert([(str(tmp_path / 'deck.html'), str(tmp_path / 'b.pptx'))], options)
+    assert _entry_time(tmp_path / 'b.pptx') == (1980, 1, 1, 0, 0, 0)
+
+
+def test_sockets_of_other_users_are_refused(daemon, socket_dir, monkeypatch):
+    monkeypatch.setattr(os, 'getuid', lambda: os.stat(daemon.path).st_uid + 1)
+    with pytest.raises(DaemonUnavailable, match='another user'):
+        DaemonClient(daemon.path).convert([('in.html', 'out.pptx')])
+    assert DaemonClient(daemon.path).ping() is None
+
+
+def test_paths_that_are_not_sockets_are_refused(daemon, socket_dir):
+    link = os.path.join(socket_dir, 'link.sock')
+    os.symlink(daemon.path, link)
+    plain = os.path.join(socket_dir, 'plain.sock')
+    open(plain, 'w').close()
+    for path in (link, plain, os.path.join(socket_dir, 'missing.sock')):
+        assert DaemonClient(path).ping() is None
+    # Nor does a new daemon replace a file that is not a socket
+    with pytest.raises(RuntimeError, match='Not a socket'):
+        ConversionDaemon(plain).serve_forever()
+    assert os.path.isfile(plain)
+
+
+def test_cli_forwards_single_files_but_not_batches(daemon, tmp_path):
+    for name in ('one.html', 'two.html'):
+        (tmp_path / name).write_text(deck_html(1), encoding='utf-8')
+    env = dict(os.environ, HTML_TO_PPTX_SOCKET=daemon.path)
+
+    def cli(*args):
+        return subprocess.run([sys.executable, '-m', 'html_to_pptx.cli', *args, '--native'],
+                              cwd=REPO_ROOT, env=env, capture_output=True, text=True, timeout=120)
+
+    assert cli(str(tmp_path / 'one.html'), str(tmp_path / 'single.pptx')).returncode == 0
+    assert DaemonClient(daemon.path).ping()['converted'] == 1
+    batch = cli('--batch', str(tmp_path), '--jobs', '2')
+    assert batch.returncode == 0, batch.stderr
+    assert len(batch.stdout.splitlines()) == 2
+    assert DaemonClient(daemon.path).ping()['converted'] == 1
+    assert (tmp_path / 'two.pptx').exists()
+
+
+def test_shutdown_removes_the_socket(daemon):
+    assert DaemonClient(daemon.path).shutdown()
+    deadline = time.monotonic() + 10
+    while os.path.exists(daemon.path):
+        assert time.monotonic() < deadline
+        time.sleep(0.02)
+    assert DaemonClient(daemon.path).ping() is None
+    assert not DaemonClient(daemon.path).shutdown()
@@ -0,0 +1,60 @@
+"""Reproducible, byte-identical packages"""
+
+import hashlib
+import time
+import zipfile
+
+import pytest
+
+from conftest import GIF_DATA_URI, requires
+from html_to_pptx.builders.package import DETERMINISTIC_TIMESTAMP, deterministic_timestamp
+from html_to_pptx.core.converter import HTMLtoPPTXConverter
+
+
+def _convert(tmp_path, html_file, name, **options):
+    output = tmp_path / name
+    assert HTMLtoPPTXConverter(deterministic=True, **options).convert_file(html_file, str(output))
+    return output.read_bytes()
+
+
+@pytest.mark.parametrize('native', [True, pytest.param(False, marks=requires('pptx'))])
+def test_identical_inputs_give_identical_bytes(tmp_path, deck_file, monkeypatch, native):
+    html_file = deck_file(5, body=f'<img src="{GIF_DATA_URI}"><p>{{n}}</p>')
+    first = _convert(tmp_path, html_file, 'a.pptx', use_native=native)
+    # A later run in another process state
+    monkeypatch.setattr(time, 'time', lambda: 2_000_000_000.0)
+    second = _convert(tmp_path, html_file, 'b.pptx', use_native=native)
+    assert hashlib.sha256(first).digest() == hashlib.sha256(second).digest()
+    with zipfile.ZipFile(tmp_path / 'a.pptx') as package:
+        assert {info.date_time for info in package.infolist()} == {(1980, 1, 1, 0, 0, 0)}
+
+
+def test_entry_order_and_relationship_ids_are_stable(tmp_path, deck_file):
+    html_file = deck_file(3)
+    _convert(tmp_path, html_file, 'a.pptx', use_native=True)
+    _convert(tmp_path, html_file, 'b.pptx', use_native=True, workers=2)
+    with zipfile.ZipFile(tmp_path / 'a.pptx') as a, zipfile.ZipFile(tmp_path / 'b.pptx') as b:
+        assert a.namelist() == b.namelist()
+        rels = 'ppt/_rels/presentation.xml.rels'
+        assert a.read(rels) == b.read(rels)
+
+
+def test_source_date_epoch_sets_the_timestamp(tmp_path, deck_file, monkeypatch):
+    monkeypatch.setenv('SOURCE_DATE_EPOCH', '1700000000')
+    assert deterministic_timestamp() == 1700000000
+    _convert(tmp_path, deck_file(1), 'deck.pptx', use_native=True)
+    with zipfile.ZipFile(tmp_path / 'deck.pptx') as package:
+        assert package.infolist()[0].date_time == time.gmtime(1700000000)[:6]
+
+
+@pytest.mark.parametrize('value', ['', 'soon', '-5', '100'])
+def test_invalid_or_early_epochs_fall_back(monkeypatch, value):
+    monkeypatch.setenv('SOURCE_DATE_EPOCH', value)
+    assert deterministic_timestamp() == DETERMINISTIC_TIMESTAMP
+
+
+def test_non_deterministic_builds_use_the_current_time(tmp_path, deck_file):
+    output = tmp_path / 'deck.pptx'
+    HTMLtoPPTXConverter(use_native=True).convert_file(deck_file(1), str(output))
+    with zipfile.ZipFile(output) as package:
+        assert package.infolist()[0].date_time[0] >= 2024
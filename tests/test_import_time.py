@@ -0,0 +1,96 @@
+"""Importing the package and running the CLI for --version stay cheap"""
+
+import io
+import json
+import subprocess
+import sys
+
+import pytest
+
+from conftest import REPO_ROOT, deck_html, package_parts
+from html_to_pptx.builders import pptx_builder
+from html_to_pptx.parsers.html_parser import SlideHTMLParser
+from html_to_pptx.utils.xml_templates import MANIFEST_PART
+
+# Modules that only conversions need; python-pptx alone takes over 100 ms to import
+_HEAVY_MODULES = ('pptx', 'multiprocessing', 'html_to_pptx.core.converter',
+                  'html_to_pptx.builders.pptx_builder', 'html_to_pptx.parsers.html_parser')
+
+# Cumulative import time budgets in microseconds, loose enough for slow machines
+# but well below what importing python-pptx would add
+_PACKAGE_BUDGET = 20_000
+_CLI_BUDGET = 120_000
+
+_VERSION_SCRIPT = '''
+import json, sys
+sys.argv = ['html_to_pptx', '--version']
+from html_to_pptx import cli
+try:
+    cli.main()
+except SystemExit:
+    pass
+print(json.dumps(sorted(sys.modules)))
+'''
+
+
+def _run(*args):
+    result = subprocess.run([sys.executable, '-X', 'importtime', *args], cwd=REPO_ROOT,
+                            capture_output=True, text=True, timeout=60)
+    assert result.returncode == 0, result.stderr
+    return result
+
+
+def _cumulative(stderr: str, module: str) -> int:
+    """Return the cumulative import time of a module from -X importtime output"""
+    for line in stderr.splitlines():
+        if line.startswith('import time:') and line.rsplit('|', 1)[1].strip() == module:
+            return int(line.split('|')[1])
+    raise AssertionError(f'{module} was not imported')
+
+
+def test_importing_the_package_loads_no_converter_code():
+    result = _run('-c', 'import json, sys, html_to_pptx; print(json.dumps(sorted(sys.modules)))')
+    loaded = set(json.loads(result.stdout))
+    assert not loaded & set(_HEAVY_MODULES)
+    assert _cumulative(result.stderr, 'html_to_pptx') < _PACKAGE_BUDGET
+
+
+def test_version_loads_no_converter_code():
+    result = _run('-c', _VERSION_SCRIPT)
+    version, modules = result.stdout.splitlines()
+    assert version.endswith('1.0.0')
+    assert not set(json.loads(modules)) & set(_HEAVY_MODULES)
+    assert _cumulative(result.stderr, 'html_to_pptx.cli') < _CLI_BUDGET
+
+
+def test_version_from_the_command_line():
+    result = _run('-m', 'html_to_pptx.cli', '--version')
+    assert result.stdout.strip().endswith('1.0.0')
+    assert not any(line.rsplit('|', 1)[1].strip() in _HEAVY_MODULES
+                   for line in result.stderr.splitlines() if line.startswith('import time:'))
+
+
+def test_public_classes_are_still_importable():
+    import html_to_pptx
+    assert set(html_to_pptx.__all__) <= set(dir(html_to_pptx))
+    assert html_to_pptx.HTMLtoPPTXConverter.__name__ == 'HTMLtoPPTXConverter'
+    with pytest.raises(AttributeError):
+        html_to_pptx.Missing
+
+
+def test_a_python_pptx_that_fails_to_import_falls_back_to_native(tmp_path, monkeypatch):
+    # Installed, but importing it fails (as with a missing lxml)
+    monkeypatch.setattr(pptx_builder, 'PPTX_AVAILABLE', True)
+    monkeypatch.setitem(sys.modules, 'pptx', None)
+    builder = pptx_builder.PPTXBuilder(use_native=False)
+    assert not builder.use_native
+    output = tmp_path / 'deck.pptx'
+    builder.build(SlideHTMLParser().parse(deck_html(2)), str(output))
+    assert builder.use_native and not pptx_builder.PPTX_AVAILABLE
+    assert MANIFEST_PART in package_parts(str(output))
+
+    # Streams fall back as well
+    monkeypatch.setattr(pptx_builder, 'PPTX_AVAILABLE', True)
+    stream = io.BytesIO()
+    pptx_builder.PPTXBuilder(use_native=False).build_to(SlideHTMLParser().parse(deck_html(1)), stream)
+    assert MANIFEST_PART in package_parts(stream.getvalue())
@@ -0,0 +1,59 @@
+"""Per-slide incremental reparse keyed by slide fingerprints"""
+
+from conftest import deck_html, slide_texts
+from html_to_pptx.core.cache import ParseCache
+from html_to_pptx.core.converter import HTMLtoPPTXConverter
+from html_to_pptx.core.incremental import IncrementalParser
+from html_to_pptx.parsers.html_parser import SlideHTMLParser
+
+
+def _incremental(tmp_path):
+    return IncrementalParser(SlideHTMLParser(), ParseCache(str(tmp_path)))
+
+
+def _check(parser, html, reparsed, reused):
+    slides = parser.parse(html)
+    assert (parser.reparsed, parser.reused) == (reparsed, reused)
+    full = SlideHTMLParser()
+    assert slide_texts(slides) == slide_texts(full.parse(html))
+    assert parser.get_metadata() == full.get_metadata()
+
+
+def test_only_the_changed_slide_is_reparsed(tmp_path):
+    html = deck_html(30)
+    _check(_incremental(tmp_path), html, 30, 0)
+    # A fresh parser on the same store: the fingerprints persist
+    parser = _incremental(tmp_path)
+    _check(parser, html, 0, 30)
+    _check(parser, html.replace('Point 17.2', 'Point 17.2 revised'), 1, 29)
+
+
+def test_changes_outside_slides_invalidate_later_slides(tmp_path):
+    head = '<style>.title-box h1 { color: #111111; }</style>'
+    parser = _incremental(tmp_path)
+    _check(parser, deck_html(4, head=head), 4, 0)
+    _check(parser, deck_html(4, head=head.replace('#111111', '#222222')), 4, 0)
+
+
+def test_slides_with_their_own_style_block_are_always_reparsed(tmp_path):
+    html = deck_html(3, body='<style>.note-{n} { color: #333333; }</style><p class="note-{n}">x</p>')
+    parser = _incremental(tmp_path)
+    _check(parser, html, 3, 0)
+    _check(parser, html, 3, 0)
+
+
+def test_converter_incremental_output_matches_a_full_conversion(tmp_path, deck_file):
+    html_file = deck_file(6)
+    cache_dir = str(tmp_path / 'cache')
+    converter = HTMLtoPPTXConverter(use_native=True, cache_dir=cache_dir, incremental=True, deterministic=True)
+    assert converter.convert_file(html_file, str(tmp_path / 'first.pptx'))
+    with open(html_file, encoding='utf-8') as f:
+        edited = f.read().replace('Point 2.1', 'Point 2.1 edited')
+    with open(html_file, 'w', encoding='utf-8') as f:
+        f.write(edited)
+    assert converter.convert_file(html_file, str(tmp_path / 'incremental.pptx'))
+    assert (converter.incremental.reparsed, converter.incremental.reused) == (1, 5)
+
+    full = HTMLtoPPTXConverter(use_native=True, deterministic=True)
+    assert full.convert_file(html_file, str(tmp_path / 'full.pptx'))
+    assert (tmp_path / 'incremental.pptx').read_bytes() == (tmp_path / 'full.pptx').read_bytes()
@@ -0,0 +1,41 @@
+"""python-pptx presentations opened from a cached 16:9 prototype"""
+
+import io
+
+from conftest import deck_html, requires
+from html_to_pptx.builders import pptx_builder
+from html_to_pptx.builders.pptx_builder import PPTXBuilder
+from html_to_pptx.parsers.html_parser import SlideHTMLParser
+
+pytestmark = requires('pptx')
+
+
+def test_prototype_is_built_once_per_process(monkeypatch):
+    monkeypatch.setattr(pptx_builder, '_library_prototype', None)
+    import pptx
+    created = []
+    original = pptx.Presentation
+    monkeypatch.setattr(pptx, 'Presentation', lambda *args: created.append(args) or original(*args))
+
+    first = pptx_builder._load_library_prototype()
+    assert pptx_builder._load_library_prototype() is first
+    builder = PPTXBuilder(use_native=False)
+    for _ in range(3):
+        builder.build_to(SlideHTMLParser().parse(deck_html(1)), io.BytesIO())
+    # Only the prototype itself was created from the default template
+    assert created.count(()) == 1
+
+
+def test_presentations_are_16_9_and_independent():
+    from pptx import Presentation
+    builder = PPTXBuilder(use_native=False)
+    decks = []
+    for count in (2, 5):
+        out = io.BytesIO()
+        builder.build_to(SlideHTMLParser().parse(deck_html(count)), out)
+        decks.append(Presentation(io.BytesIO(out.getvalue())))
+    assert [len(prs.slides) for prs in decks] == [2, 5]
+    for prs in decks:
+        assert (prs.slide_width, prs.slide_height) == (9144000, 5143500)
+    texts = [shape.text_frame.text for shape in decks[1].slides[4].shapes if shape.has_text_frame]
+    assert 'Title 4' in texts and 'Title 1' not in texts
@@ -0,0 +1,76 @@
+"""Image placement stays inside the slide in native and python-pptx builds"""
+
+import re
+
+import pytest
+
+from conftest import deck_html, package_parts, png_bytes
+from html_to_pptx.builders import media
+from html_to_pptx.builders.pptx_builder import PPTX_AVAILABLE, PPTXBuilder
+from html_to_pptx.parsers.html_parser import SlideHTMLParser
+
+_XFRM_RE = re.compile(rb'<a:xfrm[^>]*>\s*<a:off x="(-?\d+)" y="(-?\d+)"/>\s*<a:ext cx="(\d+)" cy="(\d+)"/>')
+_SLIDE_SIZE_RE = re.compile(rb'<p:sldSz cx="(\d+)" cy="(\d+)"')
+
+_IMAGES = {'small.png': (100, 60), 'photo.png': (400, 300), 'wide.png': (900, 120), 'huge.png': (3000, 2000)}
+
+_BODIES = {
+    'one-flowed': '<img src="photo.png">',
+    'row-too-wide': '<img src="photo.png">' * 6,
+    'very-tall': '<img src="huge.png"><img src="small.png">',
+    'many-small': '<img src="small.png">' * 60,
+    'positioned-off-slide': '<img src="wide.png" style="position: absolute; left: 1200px; top: 700px">',
+    'negative-position': '<img src="photo.png" style="position: absolute; left: -50px; top: -20px">',
+    'percent-sizes': '<img src="wide.png" style="width: 100%"><img src="photo.png" style="height: 100%">',
+}
+
+_MODES = ['native', pytest.param('library', marks=pytest.mark.skipif(not PPTX_AVAILABLE, reason='python-pptx is not installed'))]
+
+
+@pytest.fixture
+def images(tmp_path):
+    for name, size in _IMAGES.items():
+        (tmp_path / name).write_bytes(png_bytes(*size))
+    return str(tmp_path)
+
+
+def _boxes(tmp_path, base_dir, body, mode):
+    slides = SlideHTMLParser().parse(deck_html(1, body=body))
+    output = tmp_path / f'{mode}.pptx'
+    PPTXBuilder(use_native=mode == 'native', base_dir=base_dir).build(slides, str(output))
+    parts = package_parts(str(output))
+    size = tuple(map(int, _SLIDE_SIZE_RE.search(parts['ppt/presentation.xml']).groups()))
+    slide = parts['ppt/slides/slide1.xml']
+    pictures = slide.count(b'<p:pic>')
+    return size, [tuple(map(int, match)) for match in _XFRM_RE.findall(slide)], pictures
+
+
+@pytest.mark.parametrize('mode', _MODES)
+@pytest.mark.parametrize('case', sorted(_BODIES))
+def test_every_shape_is_inside_the_slide(tmp_path, images, mode, case):
+    (width, height), boxes, pictures = _boxes(tmp_path, images, _BODIES[case], mode)
+    assert pictures == _BODIES[case].count('<img')
+    assert len(boxes) >= pictures
+    for x, y, cx, cy in boxes:
+        assert 0 <= x and x + cx <= width, (x, cx, width)
+        assert 0 <= y and y + cy <= height, (y, cy, height)
+
+
+def test_slide_sizes_differ_between_modes():
+    resolver = media.MediaResolver()
+    assert resolver._rendered_size(media.ImageInfo('0' * 64, 'image/png', 3000, 2000, ''), {}, {},
+                                   (9144000, 5143500)) == (7715250, 5143500)
+
+
+def test_small_flowed_images_keep_their_size_and_row(tmp_path, images):
+    _, boxes, _ = _boxes(tmp_path, images, '<img src="small.png"><img src="small.png">', 'native')
+    pictures = boxes[-2:]
+    assert [box[2:] for box in pictures] == [(100 * media.EMU_PER_PX, 60 * media.EMU_PER_PX)] * 2
+    assert {box[1] for box in pictures} == {media._FLOW_TOP}
+
+
+def test_tall_flowed_images_move_up_instead_of_shrinking(tmp_path, images):
+    (width, height), boxes, _ = _boxes(tmp_path, images, '<img src="photo.png">', 'native')
+    x, y, cx, cy = boxes[-1]
+    assert (cx, cy) == (400 * media.EMU_PER_PX, 300 * media.EMU_PER_PX)
+    assert y + cy == height - media._FLOW_BOTTOM
@@ -0,0 +1,55 @@
+"""Memory-mapped input decoded one slide span at a time"""
+
+import pytest
+
+from conftest import GIF_DATA_URI, deck_html
+from html_to_pptx.core import converter as converter_module
+from html_to_pptx.core.converter import HTMLtoPPTXConverter
+from html_to_pptx.parsers.prescan import find_slide_spans, iter_source_text, source_text
+
+
+def test_span_text_decodes_utf8_with_universal_newlines():
+    html = deck_html(3).replace('\n', '\r\n')
+    buffer = html.encode('utf-8')
+    pieces = list(iter_source_text(buffer, find_slide_spans(buffer)))
+    assert ''.join(pieces) == html.replace('\r\n', '\n')
+    # Gaps and slides alternate, so no piece is the whole document
+    assert len(pieces) == 7
+    assert '対象期間' in source_text(buffer, *find_slide_spans(buffer)[0])
+
+
+def test_mmap_conversion_matches_the_text_path(tmp_path, deck_file):
+    html_file = deck_file(5, body=f'<img src="{GIF_DATA_URI}"><p>日本語 {{n}}</p>')
+    assert HTMLtoPPTXConverter(use_native=True, deterministic=True).convert_file(html_file, str(tmp_path / 'a.pptx'))
+    assert HTMLtoPPTXConverter(use_native=True, deterministic=True, mmap_input=True).convert_file(
+        html_file, str(tmp_path / 'b.pptx'))
+    assert (tmp_path / 'a.pptx').read_bytes() == (tmp_path / 'b.pptx').read_bytes()
+
+
+def test_mmap_path_never_decodes_the_whole_file(monkeypatch, tmp_path, deck_file):
+    html_file = deck_file(10, body=f'<img src="{GIF_DATA_URI}">')
+    with open(html_file, 'rb') as f:
+        size = len(f.read())
+    decoded = []
+    original = converter_module.iter_source_text
+
+    def recording(buffer, spans):
+        for text in original(buffer, spans):
+            decoded.append(len(text))
+            yield text
+
+    monkeypatch.setattr(converter_module, 'iter_source_text', recording)
+    converter = HTMLtoPPTXConverter(use_native=True, mmap_input=True)
+    assert converter.convert_file(html_file, str(tmp_path / 'out.pptx'))
+    assert len(decoded) > 10
+    assert max(decoded) < size / 5
+
+
+@pytest.mark.parametrize('options', [{}, {'cache_dir': 'cache', 'incremental': True}])
+def test_mmap_of_an_empty_file(tmp_path, options):
+    html_file = tmp_path / 'empty.html'
+    html_file.write_bytes(b'')
+    if 'cache_dir' in options:
+        options = dict(options, cache_dir=str(tmp_path / options['cache_dir']))
+    converter = HTMLtoPPTXConverter(use_native=True, mmap_input=True, **options)
+    assert converter.convert_file(str(html_file), str(tmp_path / 'empty.pptx'))
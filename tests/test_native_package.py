@@ -0,0 +1,92 @@
+"""Native packages assembled in memory, without a temporary directory"""
+
+import io
+import tempfile
+import zipfile
+
+import pytest
+
+from conftest import deck_html, package_parts, requires
+from html_to_pptx.builders.package import PackageWriter
+from html_to_pptx.builders import pptx_builder
+from html_to_pptx.builders.pptx_builder import PPTXBuilder
+from html_to_pptx.parsers.html_parser import SlideHTMLParser
+
+_REQUIRED_PARTS = {
+    '[Content_Types].xml', '_rels/.rels', 'docProps/core.xml', 'docProps/app.xml',
+    'ppt/presentation.xml', 'ppt/_rels/presentation.xml.rels', 'ppt/theme/theme1.xml',
+    'ppt/slideMasters/slideMaster1.xml', 'ppt/slideLayouts/slideLayout1.xml',
+}
+
+
+def _forbid_temp_dirs(monkeypatch):
+    def fail(*args, **kwargs):
+        raise AssertionError('native build touched a temporary directory')
+    monkeypatch.setattr(tempfile, 'TemporaryDirectory', fail)
+    monkeypatch.setattr(tempfile, 'mkdtemp', fail)
+
+
+def test_native_build_writes_a_complete_package_without_temp_files(tmp_path, monkeypatch):
+    slides = SlideHTMLParser().parse(deck_html(3))
+    _forbid_temp_dirs(monkeypatch)
+    output = tmp_path / 'deck.pptx'
+    PPTXBuilder(use_native=True).build(slides, str(output), {'title': 'Deck'})
+    with zipfile.ZipFile(output) as package:
+        assert package.testzip() is None
+        names = set(package.namelist())
+    assert _REQUIRED_PARTS <= names
+    assert {f'ppt/slides/slide{n}.xml' for n in (1, 2, 3)} <= names
+    assert {f'ppt/slides/_rels/slide{n}.xml.rels' for n in (1, 2, 3)} <= names
+    assert list(tmp_path.iterdir()) == [output]
+
+
+def test_slide_text_reaches_the_slide_parts():
+    slides = SlideHTMLParser().parse(deck_html(2))
+    out = io.BytesIO()
+    PPTXBuilder(use_native=True).build_to(slides, out)
+    parts = package_parts(out.getvalue())
+    assert 'Title 1' in parts['ppt/slides/slide2.xml'].decode('utf-8')
+    assert '対象期間: 2025年1月' in parts['ppt/slides/slide1.xml'].decode('utf-8')
+    assert b'<p:sldId ' in parts['ppt/presentation.xml']
+
+
+def test_package_writer_output_is_a_standard_zip():
+    out = io.BytesIO()
+    with PackageWriter(out) as package:
+        package.write('a.xml', b'<a/>' * 100)
+        package.write('image.png', b'\x89PNG' + bytes(50))
+        package.write('名前.xml', b'<b/>')
+    with zipfile.ZipFile(out) as archive:
+        assert archive.read('a.xml') == b'<a/>' * 100
+        assert archive.getinfo('a.xml').compress_type == zipfile.ZIP_DEFLATED
+        assert archive.getinfo('image.png').compress_type == zipfile.ZIP_STORED
+        assert archive.read('名前.xml') == b'<b/>'
+
+
+@requires('pptx')
+def test_python_pptx_opens_native_packages(tmp_path):
+    from pptx import Presentation
+    output = tmp_path / 'deck.pptx'
+    PPTXBuilder(use_native=True).build(SlideHTMLParser().parse(deck_html(4)), str(output))
+    assert len(Presentation(str(output)).slides) == 4
+
+
+def test_failed_build_keeps_the_previous_package(tmp_path):
+    output = tmp_path / 'deck.pptx'
+    PPTXBuilder(use_native=True).build(SlideHTMLParser().parse(deck_html(2)), str(output))
+    previous = output.read_bytes()
+
+    def broken_slides():
+        yield from SlideHTMLParser().parse(deck_html(3))[:2]
+        raise ValueError('parse failed mid-deck')
+
+    with pytest.raises(ValueError):
+        PPTXBuilder(use_native=True).build(broken_slides(), str(output))
+    assert output.read_bytes() == previous
+    assert list(tmp_path.iterdir()) == [output]
+
+
+def test_new_packages_get_the_usual_permissions(tmp_path):
+    output = tmp_path / 'deck.pptx'
+    PPTXBuilder(use_native=True).build(SlideHTMLParser().parse(deck_html(1)), str(output))
+    assert output.stat().st_mode & 0o777 == 0o666 & ~pptx_builder._UMASK
@@ -0,0 +1,61 @@
+"""Parallel multi-slide parsing across worker processes"""
+
+import pickle
+
+from conftest import GIF_DATA_URI, deck_html, slide_texts
+from html_to_pptx.core.converter import HTMLtoPPTXConverter
+from html_to_pptx.core.parallel import ParallelParser
+from html_to_pptx.parsers.html_parser import SlideHTMLParser
+from html_to_pptx.parsers.prescan import find_slide_spans
+from html_to_pptx.parsers.serialization import pack_slide, unpack_slide
+
+
+def test_prescan_finds_every_slide_container():
+    html = deck_html(7, body='<div class="inner"><div>nested</div></div>')
+    spans = find_slide_spans(html)
+    assert len(spans) == 7
+    assert all(html[span.start:span.end].startswith('<div class="slide-container') for span in spans)
+    assert all(html[span.start:span.end].endswith('</div>') for span in spans)
+    assert [span.start for span in find_slide_spans(html.encode('utf-8'))] == \
+        [len(html[:span.start].encode('utf-8')) for span in spans]
+
+
+def test_packed_slides_are_picklable_and_round_trip():
+    slide = SlideHTMLParser().parse(deck_html(1, body='<p style="color: red">x</p>'))[0]
+    packed = pickle.loads(pickle.dumps(pack_slide(slide)))
+    assert slide_texts([unpack_slide(packed)]) == slide_texts([slide])
+
+
+def test_workers_produce_the_serial_slides():
+    html = deck_html(12, head='<style>.title-box h1 { color: #123456; }</style>')
+    parallel = ParallelParser(2)
+    try:
+        slides = list(parallel.parse(html))
+        serial = SlideHTMLParser()
+        assert slide_texts(slides) == slide_texts(serial.parse(html))
+        assert parallel.get_metadata() == serial.get_metadata()
+        assert parallel._executor is not None
+    finally:
+        parallel.shutdown()
+
+
+def test_slides_with_their_own_style_block_fall_back_to_a_serial_parse():
+    html = deck_html(3, body='<style>.note { color: #333333; }</style><p class="note">{n}</p>')
+    assert ParallelParser._split(html) is None
+    parallel = ParallelParser(2)
+    try:
+        assert slide_texts(parallel.parse(html)) == slide_texts(SlideHTMLParser().parse(html))
+        assert parallel._executor is None
+    finally:
+        parallel.shutdown()
+
+
+def test_converter_with_workers_matches_the_serial_output(tmp_path, deck_file):
+    html_file = deck_file(8, body=f'<img src="{GIF_DATA_URI}">')
+    parallel = HTMLtoPPTXConverter(use_native=True, workers=2, deterministic=True)
+    try:
+        assert parallel.convert_file(html_file, str(tmp_path / 'parallel.pptx'))
+    finally:
+        parallel.close()
+    assert HTMLtoPPTXConverter(use_native=True, deterministic=True).convert_file(html_file, str(tmp_path / 'serial.pptx'))
+    assert (tmp_path / 'parallel.pptx').read_bytes() == (tmp_path / 'serial.pptx').read_bytes()
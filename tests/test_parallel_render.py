@@ -0,0 +1,52 @@
+"""Slide XML rendered and deflated in worker processes"""
+
+import pytest
+
+from conftest import GIF_DATA_URI, deck_html, package_parts
+from html_to_pptx.builders import pptx_builder
+from html_to_pptx.builders.pptx_builder import PPTXBuilder
+from html_to_pptx.parsers.html_parser import SlideHTMLParser
+from html_to_pptx.utils.blobs import BlobStore
+
+
+@pytest.fixture
+def slides(tmp_path):
+    store = BlobStore(str(tmp_path / 'blobs'))
+    body = '<p>{n}</p>' + f'<img src="{GIF_DATA_URI}">'
+    return SlideHTMLParser(store).parse(deck_html(40, body=body)), store
+
+
+def _build(tmp_path, name, slides, store, workers):
+    builder = PPTXBuilder(use_native=True, workers=workers, blob_store=store, deterministic=True)
+    try:
+        builder.build(slides, str(tmp_path / name))
+    finally:
+        builder.shutdown()
+    return builder, (tmp_path / name).read_bytes()
+
+
+def test_workers_write_the_serial_package(tmp_path, slides, monkeypatch):
+    # Several tasks per build, so batches finish and are written out of step
+    monkeypatch.setattr(pptx_builder, '_SLIDES_PER_TASK', 3)
+    _, serial = _build(tmp_path, 'serial.pptx', *slides, workers=1)
+    builder, parallel = _build(tmp_path, 'parallel.pptx', *slides, workers=2)
+    assert parallel == serial
+    assert builder.rendered_slides == 40
+
+
+def test_slides_keep_their_order(tmp_path, slides):
+    _, data = _build(tmp_path, 'deck.pptx', *slides, workers=2)
+    parts = package_parts(data)
+    names = [name for name in parts if name.startswith('ppt/slides/slide')]
+    assert names == [f'ppt/slides/slide{n}.xml' for n in range(1, 41)]
+    assert all(f'Title {n - 1}'.encode() in parts[f'ppt/slides/slide{n}.xml'] for n in range(1, 41))
+
+
+def test_worker_pool_is_reused_and_shut_down(tmp_path, slides):
+    builder = PPTXBuilder(use_native=True, workers=2, blob_store=slides[1])
+    builder.build(slides[0], str(tmp_path / 'a.pptx'))
+    executor = builder._executor
+    builder.build(slides[0], str(tmp_path / 'b.pptx'))
+    assert builder._executor is executor
+    builder.shutdown()
+    assert builder._executor is None
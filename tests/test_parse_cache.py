@@ -0,0 +1,125 @@
+"""On-disk parse cache keyed by content hash and parser version"""
+
+import base64
+import os
+import time
+
+import pytest
+
+from conftest import deck_html, png_bytes, slide_texts
+from html_to_pptx.core import cache as cache_module
+from html_to_pptx.core.cache import ParseCache
+from html_to_pptx.core.converter import HTMLtoPPTXConverter
+from html_to_pptx.core.incremental import IncrementalParser
+from html_to_pptx.parsers.html_parser import SlideHTMLParser
+from html_to_pptx.utils.blobs import BlobStore
+
+
+def _parsed(html):
+    parser = SlideHTMLParser()
+    return parser.parse(html), parser.get_metadata()
+
+
+def test_round_trip_preserves_slides_and_metadata(tmp_path):
+    html = deck_html(4, body='<p style="color: red">Note {n}</p>')
+    slides, metadata = _parsed(html)
+    cache = ParseCache(str(tmp_path))
+    key = cache.key_for(html.encode('utf-8'))
+    assert cache.get(key) is None
+    cache.put(key, slides, metadata)
+    cached_slides, cached_metadata = cache.get(key)
+    assert slide_texts(cached_slides) == slide_texts(slides)
+    assert cached_metadata == metadata
+    assert cache.stats()['hits'] == 1 and cache.stats()['misses'] == 1
+
+
+def test_key_depends_on_content_and_parser_version(monkeypatch):
+    html = deck_html(1).encode('utf-8')
+    key = ParseCache.key_for(html)
+    assert ParseCache.key_for(html) == key
+    assert ParseCache.key_for(html + b' ') != key
+    monkeypatch.setattr(cache_module, 'PARSER_VERSION', cache_module.PARSER_VERSION + 1)
+    assert ParseCache.key_for(html) != key
+
+
+def test_converter_skips_parsing_on_a_hit(tmp_path, deck_file):
+    html_file = deck_file(3)
+    cache_dir = str(tmp_path / 'cache')
+    first = HTMLtoPPTXConverter(use_native=True, cache_dir=cache_dir, deterministic=True)
+    assert first.convert_file(html_file, str(tmp_path / 'a.pptx'))
+
+    second = HTMLtoPPTXConverter(use_native=True, cache_dir=cache_dir, deterministic=True)
+    second.parser.parse = lambda html: pytest.fail('parsed despite a cache hit')
+    assert second.convert_file(html_file, str(tmp_path / 'b.pptx'))
+    assert second.cache.stats()['hits'] == 1
+    assert (tmp_path / 'a.pptx').read_bytes() == (tmp_path / 'b.pptx').read_bytes()
+
+
+def test_corrupt_entries_are_misses(tmp_path):
+    cache = ParseCache(str(tmp_path))
+    (tmp_path / ('0' * 64 + ParseCache.SUFFIX)).write_bytes(b'not zlib')
+    assert cache.get('0' * 64) is None
+    assert cache.misses == 1
+
+
+def test_eviction_is_size_bounded_lru(tmp_path):
+    slides, metadata = _parsed(deck_html(2))
+    cache = ParseCache(str(tmp_path), max_bytes=10 ** 9)
+    for name in 'abc':
+        cache.put(name, slides, metadata)
+    entry_size = cache.stats()['bytes'] // 3
+    # "a" is the oldest entry, but using it leaves "b" as the least recently used
+    for age, name in enumerate('abc'):
+        stamp = time.time() - 100 + age
+        os.utime(tmp_path / (name + ParseCache.SUFFIX), (stamp, stamp))
+    assert cache.get('a') is not None
+
+    cache.max_bytes = entry_size * 3
+    cache.put('d', slides, metadata)
+    assert cache.get('b') is None
+    assert all(cache.get(name) is not None for name in 'acd')
+    assert cache.evictions == 1
+    assert cache.stats()['bytes'] <= cache.max_bytes
+
+
+def _count_walks(monkeypatch):
+    walks = []
+    files = ParseCache._files
+    monkeypatch.setattr(ParseCache, '_files', lambda self: walks.append(1) or files(self))
+    return walks
+
+
+def test_a_whole_deck_change_walks_the_cache_once(tmp_path, monkeypatch):
+    walks = _count_walks(monkeypatch)
+    parser = IncrementalParser(SlideHTMLParser(), ParseCache(str(tmp_path)))
+    parser.parse(deck_html(30))
+    assert parser.reparsed == 30 and len(walks) == 1
+    # Every slide changes: the running total is trusted, so no further walk
+    parser.parse(deck_html(30, body='<p>edited {n}</p>'))
+    assert parser.reparsed == 30 and len(walks) == 1
+    assert parser.store._total == parser.store.stats()['bytes']
+
+
+def _image_deck(slides, width):
+    uri = 'data:image/png;base64,' + base64.b64encode(png_bytes(width, 30)).decode('ascii')
+    return deck_html(slides, body=f'<img src="{uri}"><p>{{n}}</p>')
+
+
+def test_eviction_keeps_the_document_being_stored(tmp_path):
+    store = BlobStore(str(tmp_path / 'blobs'))
+    cache = ParseCache(str(tmp_path / 'cache'), max_bytes=1, blob_store=store)
+    cache.put('old', SlideHTMLParser(store).parse(_image_deck(2, 30)), {})
+    # Over budget at once, yet the entry being written and its blob survive
+    cache.put('new', SlideHTMLParser(store).parse(_image_deck(2, 31)), {})
+    assert cache.get('old') is None
+    assert cache.get('new') is not None
+    assert len(os.listdir(tmp_path / 'cache')) == 1
+
+    # An incremental parse evicts once, after its last slide, and keeps all of them
+    html = _image_deck(3, 32)
+    first = IncrementalParser(SlideHTMLParser(store), cache)
+    first.parse(html)
+    assert first.reparsed == 3
+    second = IncrementalParser(SlideHTMLParser(store), cache)
+    second.parse(html)
+    assert (second.reparsed, second.reused) == (0, 3)
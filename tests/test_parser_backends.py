@@ -0,0 +1,90 @@
+"""Parser backends: selection, missing dependencies and lxml equivalence"""
+
+import io
+import os
+import sys
+
+import pytest
+
+from conftest import PJT_DECKS, REPO_ROOT, deck_html, requires, slide_texts
+from html_to_pptx import cli
+from html_to_pptx.core.cache import ParseCache
+from html_to_pptx.core.incremental import IncrementalParser
+from html_to_pptx.core.parallel import ParallelParser, _parse_slide_span
+from html_to_pptx.parsers import backends
+from html_to_pptx.parsers.backends import create_parser
+from html_to_pptx.parsers.html_parser import SlideHTMLParser
+from html_to_pptx.parsers.prescan import find_slide_spans
+
+
+def _without_lxml(monkeypatch):
+    monkeypatch.setattr(backends, 'available_backends', lambda: {'html.parser': True, 'lxml': False})
+    monkeypatch.setattr(cli, 'available_backends', backends.available_backends)
+
+
+def test_unknown_backend_is_rejected():
+    with pytest.raises(ValueError, match='Unknown parser backend'):
+        create_parser('selectolax')
+
+
+def test_missing_lxml_raises_instead_of_falling_back(monkeypatch):
+    _without_lxml(monkeypatch)
+    with pytest.raises(ImportError, match='pip install lxml'):
+        create_parser('lxml')
+    assert type(create_parser('html.parser')) is SlideHTMLParser
+
+
+def test_cli_reports_a_missing_backend(monkeypatch, capsys, deck_file):
+    _without_lxml(monkeypatch)
+    monkeypatch.setattr(sys, 'argv', ['html_to_pptx', deck_file(1), '--parser', 'lxml', '--no-daemon'])
+    with pytest.raises(SystemExit) as exit_info:
+        cli.main()
+    assert exit_info.value.code == 2
+    assert '--parser lxml requires the lxml package' in capsys.readouterr().err
+
+
+@requires('lxml')
+@pytest.mark.parametrize('deck', PJT_DECKS, ids=lambda path: os.path.relpath(path, REPO_ROOT))
+def test_lxml_matches_html_parser_on_pjt_decks(deck):
+    with open(deck, encoding='utf-8') as f:
+        html = f.read()
+    expected = slide_texts(SlideHTMLParser().parse(html))
+    lxml_parser = create_parser('lxml')
+    assert slide_texts(lxml_parser.parse(html)) == expected
+    assert slide_texts(lxml_parser.iter_slides(io.StringIO(html), chunk_size=61)) == expected
+
+
+@requires('lxml')
+def test_lxml_incremental_parse_reuses_slides(tmp_path):
+    html = deck_html(6)
+    expected = slide_texts(SlideHTMLParser().parse(html))
+    store = ParseCache(str(tmp_path))
+    incremental = IncrementalParser(create_parser('lxml'), store)
+    # Every span must be seen complete after its own feed, otherwise it would fall back to a full parse
+    assert slide_texts(incremental._parse_spans(html, find_slide_spans(html))) == expected
+    changed = html.replace('Point 3.1', 'Point 3.1 edited')
+    slides = incremental.parse(changed)
+    assert (incremental.reparsed, incremental.reused) == (1, 5)
+    assert slide_texts(slides) == slide_texts(SlideHTMLParser().parse(changed))
+
+
+@requires('lxml')
+def test_lxml_parallel_spans_parse_as_single_slides():
+    html = deck_html(5, head='<style>.title-box h1 { color: #123456; }</style>')
+    tasks = ParallelParser._split(html)
+    packed = [_parse_slide_span('lxml', None, context, source) for context, source in tasks]
+    assert all(slide is not None for slide in packed)
+    parallel = ParallelParser(2, 'lxml')
+    try:
+        assert slide_texts(parallel.parse(html)) == slide_texts(SlideHTMLParser().parse(html))
+    finally:
+        parallel.shutdown()
+
+
+def test_throughput_benchmark_reports_installed_backends(tmp_path):
+    from benchmarks.parser_throughput import throughput
+    deck = tmp_path / 'deck.html'
+    deck.write_text(deck_html(4), encoding='utf-8')
+    results = throughput([str(deck)], repeat=1)
+    assert set(results) == {name for name, installed in backends.available_backends().items() if installed}
+    assert all(rate > 0 for rate in results.values())
@@ -0,0 +1,111 @@
+"""Process-wide cache of pre-deflated shared parts"""
+
+import io
+import os
+import tracemalloc
+import zipfile
+import zlib
+
+from conftest import deck_html
+from html_to_pptx.builders import package as package_module
+from html_to_pptx.builders.package import (COMPRESSION_PROFILES, PackageReader, PackageWriter, compress_part,
+                                           shared_part)
+from html_to_pptx.builders.pptx_builder import PPTXBuilder
+from html_to_pptx.parsers.html_parser import SlideHTMLParser
+from html_to_pptx.utils.xml_templates import XMLTemplates
+
+_SHARED = ('_rels/.rels', 'ppt/theme/theme1.xml', 'ppt/slideMasters/slideMaster1.xml',
+           'ppt/slideMasters/_rels/slideMaster1.xml.rels', 'ppt/slideLayouts/slideLayout1.xml',
+           'ppt/slideLayouts/_rels/slideLayout1.xml.rels')
+
+
+def _build(tmp_path, name, slides=2, compression='balanced'):
+    path = tmp_path / name
+    PPTXBuilder(use_native=True, compression=compression).build(
+        SlideHTMLParser().parse(deck_html(slides)), str(path))
+    return str(path)
+
+
+def test_shared_part_is_compressed_once_per_level():
+    data = XMLTemplates.get_theme()
+    level = COMPRESSION_PROFILES['balanced']
+    part = shared_part(data, level)
+    assert shared_part(data, level) is part
+    assert zlib.decompress(part.data, -15) == data
+    assert (part.crc, part.size) == (zlib.crc32(data), len(data))
+    assert shared_part(data, COMPRESSION_PROFILES['fast']) is not part
+
+
+def test_builds_splice_identical_raw_bytes_without_recompressing(tmp_path, monkeypatch):
+    first = _build(tmp_path, 'first.pptx')
+    compressed = []
+
+    def counting(data, level=zlib.Z_DEFAULT_COMPRESSION):
+        compressed.append(data)
+        return compress_part(data, level)
+
+    monkeypatch.setattr(package_module, 'compress_part', counting)
+    second = _build(tmp_path, 'second.pptx', slides=5)
+    assert not any(data == XMLTemplates.get_theme() for data in compressed)
+    with PackageReader(first) as a, PackageReader(second) as b:
+        for name in _SHARED:
+            assert a.compressed(name) == b.compressed(name)
+    # Slides and the other per-deck parts are still compressed for each build
+    assert len(compressed) >= 5
+
+
+def test_shared_parts_follow_the_compression_profile(tmp_path):
+    stored = _build(tmp_path, 'stored.pptx', compression='stored')
+    with PackageReader(stored) as reader:
+        theme = reader.compressed('ppt/theme/theme1.xml')
+    assert theme.method == package_module.ZIP_STORED
+    assert theme.data == XMLTemplates.get_theme()
+
+
+def test_shared_cache_is_bounded(monkeypatch):
+    monkeypatch.setattr(package_module, '_SHARED_PARTS', {})
+    monkeypatch.setattr(package_module, '_MAX_SHARED_PARTS', 2)
+    for n in range(4):
+        shared_part(b'<part n="%d"/>' % n)
+    assert len(package_module._SHARED_PARTS) == 2
+    # Uncached parts are still compressed correctly
+    assert zlib.decompress(shared_part(b'<other/>').data, -15) == b'<other/>'
+
+
+class _CountingSink:
+    """Write-only sink that keeps nothing but the byte count"""
+
+    def __init__(self):
+        self.size = 0
+
+    def write(self, data):
+        self.size += len(data)
+
+
+def test_writer_does_not_keep_written_payloads():
+    sink = _CountingSink()
+    tracemalloc.start()
+    try:
+        writer = PackageWriter(sink, compression='stored')
+        for n in range(20):
+            writer.write(f'ppt/media/image{n}.png', os.urandom(1 << 20))
+        held, _ = tracemalloc.get_traced_memory()
+        writer.close()
+    finally:
+        tracemalloc.stop()
+    assert sink.size > 20 << 20
+    assert held < 2 << 20
+
+
+def test_central_directory_matches_the_written_entries():
+    output = io.BytesIO()
+    with PackageWriter(output) as writer:
+        writer.write('a.xml', b'<a/>' * 100)
+        writer.write('media/b.png', b'\x89PNG' * 10)
+        writer.write('日本語.xml', b'<x/>')
+    with zipfile.ZipFile(output) as archive:
+        assert archive.testzip() is None
+        infos = {info.filename: info for info in archive.infolist()}
+    assert infos['a.xml'].compress_type == zipfile.ZIP_DEFLATED
+    assert infos['media/b.png'].compress_type == zipfile.ZIP_STORED
+    assert infos['日本語.xml'].file_size == 4
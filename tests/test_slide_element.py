@@ -0,0 +1,75 @@
+"""Slotted SlideElement nodes, their dict conversions and attribute sharing"""
+
+import json
+from collections.abc import Mapping
+
+import pytest
+
+from benchmarks.parse_memory import legacy_elements, measure
+from conftest import GIF_DATA_URI, PATTERNS_DECK, deck_html
+from html_to_pptx.parsers.html_parser import SlideElement, SlideHTMLParser
+
+
+def _container(slide) -> SlideElement:
+    return slide['elements'][0]
+
+
+def test_to_dict_returns_plain_json_serializable_dicts():
+    tree = _container(SlideHTMLParser().parse(deck_html(1))[0]).to_dict()
+    assert type(tree) is dict
+    assert all(type(child) is dict for child in tree['children'])
+    decoded = json.loads(json.dumps(tree, ensure_ascii=False))
+    assert decoded['attributes'] == {'class': 'slide-container bg-white'}
+    logo = decoded['children'][0]
+    assert (logo['type'], logo['attributes'], logo['content']) == ('div', {'class': 'logo'}, '= SB C&S')
+
+
+def test_view_is_a_lazy_mapping_with_the_same_content():
+    element = _container(SlideHTMLParser().parse(deck_html(1))[0]).children[1]
+    view = element.view()
+    assert isinstance(view, Mapping) and not isinstance(view, dict)
+    assert set(view) == set(element.to_dict())
+    assert view['children'][0]['type'] == 'h1'
+    assert view['children'][0]['content'] == element.to_dict()['children'][0]['content']
+
+
+def test_attributes_are_shared_within_a_document():
+    slides = SlideHTMLParser().parse(deck_html(3))
+    logos = [_container(slide).children[0] for slide in slides]
+    assert logos[0].attribute_items() is logos[1].attribute_items() is logos[2].attribute_items()
+    # Writes through the public attributes fail instead of being silently lost
+    with pytest.raises(TypeError):
+        logos[0].attributes['class'] = 'changed'
+    assert logos[0].attributes == {'class': 'logo'}
+    # to_dict() gives an independent copy
+    copy = logos[0].to_dict()['attributes']
+    copy['class'] = 'changed'
+    assert logos[1].attributes == {'class': 'logo'}
+
+
+def test_attribute_table_is_scoped_to_the_parser_document():
+    parser = SlideHTMLParser()
+    first = _container(parser.parse(deck_html(1))[0]).children[0]
+    table = parser.attribute_table
+    assert first._attrs in table
+    second = _container(parser.parse(deck_html(1))[0]).children[0]
+    assert parser.attribute_table is not table
+    assert second._attrs is not first._attrs
+    # A different parser never shares with the first one
+    assert _container(SlideHTMLParser().parse(deck_html(1))[0]).children[0]._attrs is not first._attrs
+
+
+def test_long_attribute_values_are_not_kept_in_the_table():
+    long_uri = GIF_DATA_URI + 'A' * 2048
+    parser = SlideHTMLParser()
+    parser.parse(deck_html(2, body=f'<img src="{long_uri}">'))
+    assert all(len(''.join(value or '' for _, value in attrs)) <= 512 for attrs in parser.attribute_table)
+
+
+def test_slotted_tree_retains_less_memory_than_the_legacy_class():
+    with open(PATTERNS_DECK, encoding='utf-8') as f:
+        html = f.read()
+    with legacy_elements():
+        legacy, _ = measure(html)
+    slotted, _ = measure(html)
+    assert slotted < legacy * 0.7
@@ -0,0 +1,61 @@
+"""Slide-at-a-time parsing and building"""
+
+import io
+
+from conftest import deck_html, package_parts, slide_texts
+from html_to_pptx.builders.pptx_builder import PPTXBuilder
+from html_to_pptx.core.converter import HTMLtoPPTXConverter
+from html_to_pptx.parsers.html_parser import SlideHTMLParser
+
+
+class _CountingReader(io.StringIO):
+    """Text file that records how much of it has been read"""
+
+    def read(self, size=-1):
+        data = super().read(size)
+        self.consumed = self.tell()
+        return data
+
+
+def test_iter_slides_matches_parse():
+    html = deck_html(6)
+    parsed = SlideHTMLParser().parse(html)
+    parser = SlideHTMLParser()
+    streamed = list(parser.iter_slides(io.StringIO(html), chunk_size=97))
+    assert slide_texts(streamed) == slide_texts(parsed)
+    assert parser.get_metadata() == {'title': 'Title 5', 'subtitle': 'Subtitle 5', 'period': '2025年6月'}
+
+
+def test_iter_slides_yields_before_reading_the_whole_file():
+    html = deck_html(20)
+    reader = _CountingReader(html)
+    parser = SlideHTMLParser()
+    first = next(parser.iter_slides(reader, chunk_size=256))
+    assert first['metadata']['title'] == 'Title 0'
+    assert reader.consumed < len(html) / 4
+    # Yielded slides are released by the parser
+    assert len(parser.slides) <= 1
+
+
+def test_builder_consumes_a_generator_lazily():
+    html = deck_html(5)
+    pulled = []
+
+    def slides():
+        for slide in SlideHTMLParser().iter_slides(io.StringIO(html)):
+            pulled.append(slide)
+            yield slide
+
+    out = io.BytesIO()
+    PPTXBuilder(use_native=True).build_to(slides(), out, {'title': 'Deck'})
+    parts = package_parts(out.getvalue())
+    assert len(pulled) == 5
+    assert all(f'ppt/slides/slide{n}.xml' in parts for n in range(1, 6))
+
+
+def test_streaming_converter_output_matches_whole_file(tmp_path, deck_file):
+    html_file = deck_file(8)
+    whole, streamed = tmp_path / 'whole.pptx', tmp_path / 'streamed.pptx'
+    HTMLtoPPTXConverter(use_native=True, deterministic=True)._convert(html_file, str(whole))
+    HTMLtoPPTXConverter(use_native=True, deterministic=True, streaming=True)._convert(html_file, str(streamed))
+    assert whole.read_bytes() == streamed.read_bytes()
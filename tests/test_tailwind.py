@@ -0,0 +1,73 @@
+"""Precompiled Tailwind class table"""
+
+import os
+import re
+
+import pytest
+
+from conftest import PJT_DECKS, REPO_ROOT
+from html_to_pptx.parsers.html_parser import SlideHTMLParser
+from html_to_pptx.parsers.tailwind import CLASS_TABLE, resolve_classes
+
+# Font Awesome icon classes carry no layout or text style
+_ICON_CLASS = re.compile(r'fa[srb]?$|fa-')
+
+# Classes some decks use as markers without any rule defining them
+_UNSTYLED_MARKERS = {'positive', 'negative', 'example-box'}
+
+
+def _deck_classes(html: str):
+    """Return the classes used in a deck and those its <style> blocks define"""
+    used = {cls for attr in re.findall(r'class="([^"]*)"', html) for cls in attr.split()}
+    styled = {cls for block in re.findall(r'<style[^>]*>(.*?)</style>', html, re.S)
+              for cls in re.findall(r'\.([A-Za-z_][\w-]*)', block)}
+    return used, styled
+
+
+@pytest.mark.parametrize('cls, expected', [
+    ('space-y-1', {'--space-y': '0.25rem'}),
+    ('space-y-2', {'--space-y': '0.5rem'}),
+    ('w-full', {'width': '100%'}),
+    ('h-full', {'height': '100%'}),
+    ('h-1', {'height': '0.25rem'}),
+    ('rounded', {'border-radius': '0.25rem'}),
+    ('rounded-lg', {'border-radius': '0.5rem'}),
+    ('grid-cols-2', {'grid-template-columns': 'repeat(2, minmax(0, 1fr))'}),
+    ('grid-cols-3', {'grid-template-columns': 'repeat(3, minmax(0, 1fr))'}),
+    ('list-disc', {'list-style-type': 'disc'}),
+    ('border-l-4', {'border-left-width': '4px'}),
+    ('max-w-4xl', {'max-width': '56rem'}),
+    ('w-1/2', {'width': '50%'}),
+    ('opacity-50', {'opacity': '0.5'}),
+    ('from-purple-50', {'--tw-gradient-from': '#faf5ff'}),
+])
+def test_common_pjt_utilities_are_in_the_table(cls, expected):
+    assert CLASS_TABLE[cls] == expected
+
+
+@pytest.mark.parametrize('deck', PJT_DECKS, ids=lambda path: os.path.relpath(path, REPO_ROOT))
+def test_every_class_in_pjt_decks_resolves(deck):
+    with open(deck, encoding='utf-8') as f:
+        used, styled = _deck_classes(f.read())
+    unresolved = {
+        cls for cls in used
+        if cls not in CLASS_TABLE and cls not in styled and cls not in _UNSTYLED_MARKERS
+        and not _ICON_CLASS.match(cls) and ':' not in cls
+    }
+    assert not unresolved
+
+
+def test_class_strings_are_memoized():
+    first = resolve_classes('flex items-center space-y-2')
+    assert resolve_classes('flex items-center space-y-2') is first
+    assert first[0] == ('flex', 'items-center', 'space-y-2')
+    assert first[1] == {'display': 'flex', 'align-items': 'center', '--space-y': '0.5rem'}
+
+
+def test_later_classes_win_and_reach_the_parsed_style():
+    html = '<div class="slide-container"><div class="w-full rounded rounded-lg p-4 text-lg">x</div></div>'
+    element = SlideHTMLParser().parse(html)[0]['elements'][0].children[0]
+    assert element.style['width'] == '100%'
+    assert element.style['border-radius'] == '0.5rem'
+    assert element.style['padding'] == '1rem'
+    assert element.style['font-size'] == '16pt'
@@ -0,0 +1,101 @@
+"""Updating native packages in place, re-rendering only the changed slides"""
+
+import json
+import zipfile
+
+from conftest import deck_html, package_parts
+from html_to_pptx.builders.package import PackageReader
+from html_to_pptx.builders.pptx_builder import PPTXBuilder
+from html_to_pptx.core.converter import HTMLtoPPTXConverter
+from html_to_pptx.parsers.html_parser import SlideHTMLParser
+from html_to_pptx.utils.xml_templates import MANIFEST_PART
+
+
+def _slides(html):
+    return SlideHTMLParser().parse(html)
+
+
+def _update(path, html, **options):
+    builder = PPTXBuilder(use_native=True, deterministic=True, **options)
+    builder.update(_slides(html), str(path))
+    return builder
+
+
+def test_one_edit_re_renders_one_slide(tmp_path):
+    path = tmp_path / 'deck.pptx'
+    html = deck_html(30)
+    assert _update(path, html).rendered_slides == 30
+    with PackageReader(str(path)) as reader:
+        before = {n: reader.compressed(f'ppt/slides/slide{n}.xml') for n in range(1, 31)}
+
+    edited = html.replace('Title 12', 'Title 12 (revised)')
+    builder = _update(path, edited)
+    assert (builder.rendered_slides, builder.reused_slides) == (1, 29)
+    with PackageReader(str(path)) as reader:
+        after = {n: reader.compressed(f'ppt/slides/slide{n}.xml') for n in range(1, 31)}
+    assert [n for n in after if after[n] != before[n]] == [13]
+
+    fresh = tmp_path / 'fresh.pptx'
+    PPTXBuilder(use_native=True, deterministic=True).build(_slides(edited), str(fresh))
+    assert path.read_bytes() == fresh.read_bytes()
+
+
+def test_added_and_removed_slides_update_the_package_parts(tmp_path):
+    path = tmp_path / 'deck.pptx'
+    _update(path, deck_html(3))
+    builder = _update(path, deck_html(5))
+    assert (builder.rendered_slides, builder.reused_slides) == (2, 3)
+    parts = package_parts(str(path))
+    assert b'/ppt/slides/slide5.xml' in parts['[Content_Types].xml']
+    assert b'slides/slide5.xml' in parts['ppt/_rels/presentation.xml.rels']
+    assert len(json.loads(parts[MANIFEST_PART])['slides']) == 5
+
+    builder = _update(path, deck_html(2))
+    assert (builder.rendered_slides, builder.reused_slides) == (0, 2)
+    names = package_parts(str(path))
+    assert 'ppt/slides/slide3.xml' not in names
+
+
+def test_moved_slides_are_reused(tmp_path):
+    path = tmp_path / 'deck.pptx'
+    slides = _slides(deck_html(4))
+    PPTXBuilder(use_native=True).update(slides, str(path))
+    builder = PPTXBuilder(use_native=True)
+    builder.update(list(reversed(slides)), str(path))
+    assert (builder.rendered_slides, builder.reused_slides) == (0, 4)
+    assert b'Title 3' in package_parts(str(path))['ppt/slides/slide1.xml']
+
+
+def test_packages_without_a_usable_manifest_are_rebuilt(tmp_path):
+    path = tmp_path / 'deck.pptx'
+    _update(path, deck_html(3))
+    # A different compression profile cannot splice the old parts
+    assert _update(path, deck_html(3), compression='fast').rendered_slides == 3
+
+    with zipfile.ZipFile(tmp_path / 'foreign.pptx', 'w') as foreign:
+        foreign.writestr('ppt/slides/slide1.xml', '<p:sld/>')
+    assert _update(tmp_path / 'foreign.pptx', deck_html(2)).rendered_slides == 2
+    (tmp_path / 'broken.pptx').write_bytes(b'not a zip')
+    assert _update(tmp_path / 'broken.pptx', deck_html(2)).rendered_slides == 2
+
+
+def test_slides_edited_by_another_application_are_re_rendered(tmp_path):
+    path = tmp_path / 'deck.pptx'
+    _update(path, deck_html(2))
+    parts = package_parts(str(path))
+    parts['ppt/slides/slide2.xml'] = parts['ppt/slides/slide2.xml'].replace(b'Title 1', b'Edited')
+    with zipfile.ZipFile(path, 'w') as package:
+        for name, data in parts.items():
+            package.writestr(name, data)
+    builder = _update(path, deck_html(2))
+    assert (builder.rendered_slides, builder.reused_slides) == (1, 1)
+    assert b'Title 1' in package_parts(str(path))['ppt/slides/slide2.xml']
+
+
+def test_converter_update_mode(tmp_path, deck_file):
+    html_file = deck_file(4)
+    output = str(tmp_path / 'deck.pptx')
+    converter = HTMLtoPPTXConverter(use_native=True, update=True)
+    assert converter.convert_file(html_file, output)
+    assert converter.convert_file(html_file, output)
+    assert (converter.builder.rendered_slides, converter.builder.reused_slides) == (0, 4)
@@ -0,0 +1,94 @@
+"""Watch mode: change detection, debouncing and reconversion"""
+
+import json
+import os
+import signal
+import subprocess
+import sys
+import threading
+import time
+
+import pytest
+
+from conftest import REPO_ROOT, deck_html
+from html_to_pptx.core.watch import DeckWatcher
+
+
+def _save(path, slides):
+    with open(path, 'w', encoding='utf-8') as f:
+        f.write(deck_html(slides))
+
+
+def _later(delay, *actions):
+    """Run actions in a background thread after a delay, one every 20 ms"""
+    def run():
+        time.sleep(delay)
+        for action in actions:
+            action()
+            time.sleep(0.02)
+    thread = threading.Thread(target=run)
+    thread.start()
+    return thread
+
+
+@pytest.fixture(params=['inotify', 'polling'])
+def watcher(request, tmp_path):
+    for name in ('a.html', 'b.html'):
+        _save(tmp_path / name, 1)
+    watcher = DeckWatcher(str(tmp_path), debounce=0.15, poll_interval=0.05,
+                          use_inotify=request.param == 'inotify')
+    if request.param == 'inotify' and watcher.backend != 'inotify':
+        watcher.close()
+        pytest.skip('inotify is not available')
+    yield watcher
+    watcher.close()
+
+
+def test_a_burst_of_saves_is_reported_once(tmp_path, watcher):
+    deck = tmp_path / 'a.html'
+    thread = _later(0.1, *[lambda n=n: _save(deck, n) for n in range(2, 6)])
+    assert next(watcher.changes(timeout=3)) == [str(deck)]
+    thread.join()
+    # Nothing else changed afterwards
+    assert list(watcher.changes(timeout=0.5)) == []
+
+
+def test_output_files_and_unchanged_decks_are_ignored(tmp_path, watcher):
+    thread = _later(0.1, lambda: (tmp_path / 'a.pptx').write_bytes(b'output'),
+                    lambda: (tmp_path / 'c.html').write_text(deck_html(1), encoding='utf-8'))
+    assert next(watcher.changes(timeout=3)) == [str(tmp_path / 'c.html')]
+    thread.join()
+
+
+def test_decks_in_new_subdirectories_are_found(tmp_path):
+    watcher = DeckWatcher(str(tmp_path / '**' / '*.html'), debounce=0.1, poll_interval=0.05)
+    try:
+        sub = tmp_path / 'new'
+        thread = _later(0.1, sub.mkdir, lambda: _save(sub / 'd.html', 1))
+        assert next(watcher.changes(timeout=3)) == [str(sub / 'd.html')]
+        thread.join()
+    finally:
+        watcher.close()
+
+
+def test_cli_watch_reconverts_only_the_saved_deck(tmp_path):
+    for name in ('a.html', 'b.html'):
+        _save(tmp_path / name, 1)
+    process = subprocess.Popen(
+        [sys.executable, '-m', 'html_to_pptx.cli', '--batch', str(tmp_path), '--watch', '--native',
+         '--no-daemon', '--debounce', '0.1'],
+        cwd=REPO_ROOT, stdout=subprocess.PIPE, stderr=subprocess.PIPE, text=True
+    )
+    try:
+        initial = sorted(os.path.basename(json.loads(process.stdout.readline())['input']) for _ in range(2))
+        assert initial == ['a.html', 'b.html']
+        time.sleep(0.2)
+        _save(tmp_path / 'b.html', 3)
+        record = json.loads(process.stdout.readline())
+        assert os.path.basename(record['input']) == 'b.html' and record['ok']
+        assert 0 <= record['latency'] < 10
+    finally:
+        process.send_signal(signal.SIGINT)
+        _, stderr = process.communicate(timeout=10)
+    assert process.returncode == 0
+    assert 'Watching' in stderr
@@ -0,0 +1,62 @@
+"""Precompiled XML templates"""
+
+import xml.etree.ElementTree as ET
+
+import pytest
+
+from html_to_pptx.utils.xml_templates import CompiledTemplate, XMLTemplates, escape_xml
+
+_P = '{http://schemas.openxmlformats.org/presentationml/2006/main}'
+_A = '{http://schemas.openxmlformats.org/drawingml/2006/main}'
+
+
+@pytest.mark.parametrize('text, expected', [
+    ('plain 日本語', 'plain 日本語'),
+    ('', ''),
+    (None, ''),
+    ('a & b < c > d "e" \'f\'', 'a &amp; b &lt; c &gt; d &quot;e&quot; &apos;f&apos;'),
+    ('&amp;', '&amp;amp;'),
+])
+def test_escape_xml(text, expected):
+    assert escape_xml(text) == expected
+
+
+def test_compiled_template_escapes_text_and_inserts_bytes_as_is():
+    template = CompiledTemplate('<a x="{x}">{body}</a>')
+    assert template.render(x='1 < 2', body=b'<b/>') == b'<a x="1 &lt; 2"><b/></a>'
+    assert template.render(x=3, body='&') == b'<a x="3">&amp;</a>'
+
+
+def test_static_parts_are_cached_bytes():
+    for getter in ('get_theme', 'get_slide_master', 'get_slide_layout', 'get_root_relationships',
+                   'get_slide_master_relationships', 'get_slide_layout_relationships'):
+        first = getattr(XMLTemplates, getter)()
+        assert isinstance(first, bytes)
+        assert getattr(XMLTemplates, getter)() is first
+        ET.fromstring(first)
+
+
+def test_rendered_slide_is_well_formed_and_escaped():
+    xml = XMLTemplates.get_slide('R&D <2025>', 'Sub "title"', "'Q1'",
+                                 [(2, 100, 200, 300, 400, 'logo & chart')])
+    root = ET.fromstring(xml)
+    texts = [node.text for node in root.iter(_A + 't')]
+    assert texts == ['R&D <2025>', 'Sub "title"', "対象期間: 'Q1'"]
+    picture = next(root.iter(_P + 'pic'))
+    offset = next(picture.iter(_A + 'off'))
+    assert (offset.get('x'), offset.get('y')) == ('100', '200')
+    assert next(picture.iter(_P + 'cNvPr')).get('descr') == 'logo & chart'
+
+
+def test_empty_fields_are_omitted():
+    root = ET.fromstring(XMLTemplates.get_slide('Only title', '', ''))
+    assert [node.text for node in root.iter(_A + 't')] == ['Only title']
+
+
+def test_package_level_parts_are_well_formed():
+    ET.fromstring(XMLTemplates.get_content_types(3, {'png': 'image/png'}))
+    presentation = ET.fromstring(XMLTemplates.get_presentation(3))
+    assert len(list(presentation.iter(_P + 'sldId'))) == 3
+    rels = ET.fromstring(XMLTemplates.get_slide_relationships([(2, '../media/image1.png')]))
+    assert [rel.get('Id') for rel in rels] == ['rId1', 'rId2']
+    ET.fromstring(XMLTemplates.get_core_properties('A & B', 'me'))